@@ -3,7 +3,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import (
     User, CandidateProfile, Application, JobPosting, 
     EmployerProfile, SavedJob, CandidateSkill, Education, 
-    Certification, Notification, Address
+    Certification, Notification, Address, ExchangeRate, Task
 )
 from .forms import UserChangeForm, UserCreationForm
 
@@ -41,4 +41,5 @@ admin.site.register(Education)
 admin.site.register(Certification)
 admin.site.register(Notification)
 admin.site.register(Address)
-
+admin.site.register(ExchangeRate)
+admin.site.register(Task)
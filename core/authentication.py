@@ -0,0 +1,115 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .caching import ComputedCache
+from .models import CandidateProfile, EmployerProfile, User
+
+
+class TokenDenyList:
+    """
+    Revoked tokens, kept in the cache until they would have expired anyway.
+
+    Single tokens are denied by their ``jti``; ``revoke_user`` denies every
+    token of a user issued before now (password change, deactivation).
+    """
+    TOKEN_KEY = 'auth_denied:{}'
+    USER_KEY = 'auth_revoked_before:{}'
+
+    @classmethod
+    def revoke(cls, token):
+        remaining = int(token['exp'] - time.time())
+        if remaining > 0:
+            cache.set(cls.TOKEN_KEY.format(token[api_settings.JTI_CLAIM]), True, timeout=remaining)
+
+    @classmethod
+    def revoke_user(cls, user_id):
+        lifetime = max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+        # Whole seconds, like iat
+        cache.set(cls.USER_KEY.format(user_id), int(time.time()), timeout=int(lifetime.total_seconds()))
+
+    @classmethod
+    def is_revoked(cls, token, user_id):
+        token_key = cls.TOKEN_KEY.format(token.get(api_settings.JTI_CLAIM))
+        user_key = cls.USER_KEY.format(user_id)
+        denied = cache.get_many([token_key, user_key])
+        if token_key in denied:
+            return True
+        # A token issued in the same second as the revocation is accepted:
+        # it is usually the login that follows a password change
+        revoked_before = denied.get(user_key)
+        return revoked_before is not None and token.get('iat', 0) < revoked_before
+
+
+class UserIdentity:
+    """
+    The fields request handling needs from a user and their profile, cached
+    briefly so authenticated requests do not have to load the user.
+    """
+    FIELDS = ['id', 'email', 'role', 'first_name', 'last_name', 'is_active', 'is_staff', 'is_superuser']
+
+    @classmethod
+    def get(cls, user_id):
+        def load():
+            return User.objects.filter(pk=user_id).values(
+                *cls.FIELDS, candidate_id=F('candidate__id'), employer_profile_id=F('employer_profile__id'),
+            ).first()
+
+        return ComputedCache.get_or_compute(
+            f'auth_identity:{user_id}', load, timeout=settings.AUTH_IDENTITY_CACHE_TIMEOUT,
+            tags=[f'user:{user_id}'],
+        )
+
+    @classmethod
+    def build_user(cls, identity):
+        """
+        A User holding only the identity fields; the rest are deferred and
+        load on access, and saving it only writes the loaded fields. The
+        profile is attached the same way, with just its id.
+        """
+        # from_db() expects the values in the model's field order
+        fields = [f.attname for f in User._meta.concrete_fields if f.attname in cls.FIELDS]
+        user = User.from_db('default', fields, [identity[field] for field in fields])
+        for accessor, model, profile_id in (
+            ('candidate', CandidateProfile, identity['candidate_id']),
+            ('employer_profile', EmployerProfile, identity['employer_profile_id']),
+        ):
+            profile = None
+            if profile_id is not None:
+                profile = model.from_db('default', ['id', 'user_id'], [profile_id, user.id])
+                model.user.field.set_cached_value(profile, user)
+            getattr(User, accessor).related.set_cached_value(user, profile)
+        return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the token's user without a query.
+
+    Beyond the signature and expiry checks of ``JWTAuthentication``, the
+    token must not be on the deny-list; the user comes from the identity
+    cache, which is refreshed whenever the user row changes.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        if TokenDenyList.is_revoked(validated_token, user_id):
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+
+        identity = UserIdentity.get(user_id)
+        if identity is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if not identity['is_active']:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        return UserIdentity.build_user(identity)
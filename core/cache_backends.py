@@ -0,0 +1,437 @@
+import pickle
+import re
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, defaultdict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SEQUENCE_KEY = 'two_tier:sequence'
+LOG_KEY = 'two_tier:log:{}'
+CLEAR_ALL = '*'
+# Falling further behind than this is treated like lost messages
+MAX_REPLAY = 1000
+
+METRICS_KEY = 'cache_metrics:{}'
+METRICS_PROCESSES_KEY = 'cache_metrics:processes'
+# Ids and hashes in keys, so user_profile:12:body counts as user_profile:*:body
+KEY_VARIABLES = re.compile(r'[0-9a-f]{16,}|\d+')
+
+
+class TwoTierCache(BaseCache):
+    """
+    Bounded in-process LRU cache (L1) in front of a shared cache (L2).
+
+    ``LOCATION`` names the shared cache alias. Every write goes through to L2
+    and is announced with an invalidation message: an atomically incremented
+    sequence number in L2 plus a log entry under that number listing the
+    changed keys. Before reading, each process replays the messages it has
+    not seen yet and drops those keys from its L1, so a delete in one worker
+    reaches all of them. When messages are missing (expired log entries, a
+    cleared or restarted L2) the whole L1 is dropped instead. The sequence
+    starts from the clock, so a recreated one never repeats old numbers.
+
+    OPTIONS:
+        MAX_ENTRIES    L1 size, least recently used entries are evicted first
+        LOCAL_TIMEOUT  upper bound in seconds on how long L1 keeps an entry
+        SYNC_INTERVAL  seconds between checks for new messages, which bounds how
+                       long another process' write can go unseen (0: every
+                       read, at the cost of an L2 round trip per L1 hit)
+        LOG_TIMEOUT    how long invalidation messages are kept in L2
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = location or 'shared'
+        self._local_timeout = options.get('LOCAL_TIMEOUT', 60)
+        self._sync_interval = options.get('SYNC_INTERVAL', 1)
+        self._log_timeout = options.get('LOG_TIMEOUT', 300)
+
+        self._local = OrderedDict()
+        self._lock = threading.RLock()
+        self._seen_sequence = None
+        self._own_sequences = set()
+        self._next_sync = 0.0
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    # L1 helpers
+
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, pickled = entry
+            if expires_at <= time.time():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return pickled
+
+    def _local_set(self, key, value, timeout):
+        expires_at = time.time() + self._local_timeout
+        backend_timeout = self.get_backend_timeout(timeout)
+        if backend_timeout is not None:
+            expires_at = min(expires_at, backend_timeout)
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[key] = (expires_at, pickled)
+            self._local.move_to_end(key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+
+    # Invalidation messages
+
+    def _publish(self, keys):
+        """Tell the other processes to drop ``keys`` (or everything) from their L1"""
+        shared = self.shared
+        try:
+            sequence = shared.incr(SEQUENCE_KEY)
+        except ValueError:
+            shared.add(SEQUENCE_KEY, int(time.time() * 1000), timeout=None)
+            sequence = shared.incr(SEQUENCE_KEY)
+        shared.set(LOG_KEY.format(sequence), keys, timeout=self._log_timeout)
+        with self._lock:
+            self._own_sequences.add(sequence)
+        return sequence
+
+    def _start(self):
+        """Take the current sequence as the starting point before the first write"""
+        if self._seen_sequence is None:
+            self._sync()
+
+    def _sync(self):
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + self._sync_interval
+
+        shared = self.shared
+        sequence = shared.get(SEQUENCE_KEY)
+        if sequence is None:
+            # First use, or L2 was cleared or restarted
+            shared.add(SEQUENCE_KEY, int(time.time() * 1000), timeout=None)
+            sequence = shared.get(SEQUENCE_KEY)
+        with self._lock:
+            seen = self._seen_sequence
+            if sequence == seen:
+                return
+            own = self._own_sequences
+            self._own_sequences = {number for number in own if sequence and number > sequence}
+
+        if sequence is None or seen is None or not 0 < sequence - seen <= MAX_REPLAY:
+            # First sync, a new sequence, or too much was missed
+            messages = [CLEAR_ALL]
+        else:
+            numbers = [number for number in range(seen + 1, sequence + 1) if number not in own]
+            log_keys = [LOG_KEY.format(number) for number in numbers]
+            logs = shared.get_many(log_keys) if log_keys else {}
+            messages = list(logs.values()) if len(logs) == len(log_keys) else [CLEAR_ALL]
+
+        with self._lock:
+            for keys in messages:
+                if keys == CLEAR_ALL:
+                    self._local.clear()
+                    break
+                for key in keys:
+                    self._local.pop(key, None)
+            self._seen_sequence = sequence
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self._sync()
+        pickled = self._local_get(local_key)
+        if pickled is not None:
+            return pickle.loads(pickled)
+
+        missing = object()
+        value = self.shared.get(key, missing, version=version)
+        if value is missing:
+            return default
+        self._local_set(local_key, value, DEFAULT_TIMEOUT)
+        return value
+
+    def get_many(self, keys, version=None):
+        self._sync()
+        found, remote = {}, {}
+        for key in keys:
+            local_key = self.make_and_validate_key(key, version=version)
+            pickled = self._local_get(local_key)
+            if pickled is not None:
+                found[key] = pickle.loads(pickled)
+            else:
+                remote[key] = local_key
+        if remote:
+            values = self.shared.get_many(list(remote), version=version)
+            for key, value in values.items():
+                self._local_set(remote[key], value, DEFAULT_TIMEOUT)
+            found.update(values)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._start()
+        local_key = self.make_and_validate_key(key, version=version)
+        self.shared.set(key, value, timeout=timeout, version=version)
+        self._local_set(local_key, value, timeout)
+        self._publish([local_key])
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        self._start()
+        failed = self.shared.set_many(data, timeout=timeout, version=version)
+        local_keys = []
+        for key, value in data.items():
+            local_key = self.make_and_validate_key(key, version=version)
+            local_keys.append(local_key)
+            if key not in failed:
+                self._local_set(local_key, value, timeout)
+        if local_keys:
+            self._publish(local_keys)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._start()
+        local_key = self.make_and_validate_key(key, version=version)
+        if not self.shared.add(key, value, timeout=timeout, version=version):
+            return False
+        self._local_set(local_key, value, timeout)
+        self._publish([local_key])
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout=timeout, version=version)
+
+    def delete(self, key, version=None):
+        self._start()
+        local_key = self.make_and_validate_key(key, version=version)
+        deleted = self.shared.delete(key, version=version)
+        self._local_delete([local_key])
+        self._publish([local_key])
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        if not keys:
+            return
+        self._start()
+        local_keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        self.shared.delete_many(keys, version=version)
+        self._local_delete(local_keys)
+        self._publish(local_keys)
+
+    def has_key(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self._sync()
+        return self._local_get(local_key) is not None or self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._start()
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self.shared.incr(key, delta, version=version)
+        self._local_delete([local_key])
+        self._publish([local_key])
+        return value
+
+    def clear(self):
+        self.shared.clear()
+        with self._lock:
+            self._local.clear()
+            self._own_sequences.clear()
+        self._seen_sequence = self._publish(CLEAR_ALL)
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+class InstrumentedCache(BaseCache):
+    """
+    Wrapper recording what another cache alias is used for, per key pattern.
+
+    ``LOCATION`` names the wrapped alias. Keys are grouped into patterns by
+    replacing numbers and hashes with ``*``; for each pattern the wrapper
+    counts hits, misses, sets, deletes and the pickled size of stored values,
+    and sums the time spent in each kind of call. Counters live in the
+    process and are published to the metrics cache every FLUSH_INTERVAL
+    seconds as one snapshot per process; ``metrics()`` merges the snapshots
+    of every process.
+
+    OPTIONS:
+        METRICS_LOCATION  alias the snapshots are published to
+        FLUSH_INTERVAL    seconds between snapshots of this process
+        METRICS_TIMEOUT   how long the snapshot of a stopped process is kept
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._wrapped_alias = location
+        self._metrics_alias = options.get('METRICS_LOCATION', 'shared')
+        self.flush_interval = options.get('FLUSH_INTERVAL', 10)
+        self._metrics_timeout = options.get('METRICS_TIMEOUT', 60 * 60 * 24)
+
+        self._process_id = uuid.uuid4().hex
+        self._stats = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._next_flush = time.monotonic() + self.flush_interval
+
+    @property
+    def wrapped(self):
+        return caches[self._wrapped_alias]
+
+    @staticmethod
+    def key_pattern(key):
+        return KEY_VARIABLES.sub('*', key)
+
+    # Recording
+
+    def _record(self, operation, outcomes, started, sizes=None):
+        """Count one call: ``outcomes`` pairs each key with what happened to it"""
+        if not outcomes:
+            return
+        share = (time.perf_counter() - started) * 1_000_000 / len(outcomes)
+        with self._lock:
+            for index, (key, outcome) in enumerate(outcomes):
+                counters = self._stats[self.key_pattern(key)]
+                if outcome:
+                    counters[outcome] += 1
+                counters[f'{operation}_calls'] += 1
+                counters[f'{operation}_us'] += share
+                if sizes is not None:
+                    counters['set_bytes'] += sizes[index]
+        if time.monotonic() >= self._next_flush:
+            self.flush()
+
+    @staticmethod
+    def _size(value):
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+    def flush(self):
+        """Publish this process' counters"""
+        self._next_flush = time.monotonic() + self.flush_interval
+        with self._lock:
+            snapshot = {pattern: dict(counters) for pattern, counters in self._stats.items()}
+        store = caches[self._metrics_alias]
+        store.set(METRICS_KEY.format(self._process_id), snapshot, timeout=self._metrics_timeout)
+        processes = store.get(METRICS_PROCESSES_KEY, set())
+        # Not atomic: a process lost here adds itself again on its next flush
+        if self._process_id not in processes:
+            store.set(METRICS_PROCESSES_KEY, processes | {self._process_id}, timeout=None)
+
+    def metrics(self):
+        """Counters of all processes, merged per key pattern"""
+        self.flush()
+        store = caches[self._metrics_alias]
+        processes = store.get(METRICS_PROCESSES_KEY, set())
+        snapshots = store.get_many([METRICS_KEY.format(process) for process in processes])
+        if len(snapshots) < len(processes):
+            live = {process for process in processes if METRICS_KEY.format(process) in snapshots}
+            store.set(METRICS_PROCESSES_KEY, live, timeout=None)
+
+        merged = defaultdict(Counter)
+        for snapshot in snapshots.values():
+            for pattern, counters in snapshot.items():
+                merged[pattern].update(counters)
+        return dict(merged)
+
+    @staticmethod
+    def summarize(metrics):
+        """Hit ratio, mean value size and mean latency per pattern from ``metrics()``"""
+        def mean(total, count):
+            return round(total / count, 3) if count else None
+
+        rows = []
+        for pattern, counters in metrics.items():
+            hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+            rows.append({
+                'pattern': pattern,
+                'hits': hits,
+                'misses': misses,
+                'hit_ratio': mean(hits, hits + misses),
+                'sets': counters.get('sets', 0),
+                'deletes': counters.get('deletes', 0),
+                'avg_set_bytes': mean(counters.get('set_bytes', 0), counters.get('sets', 0)),
+                'avg_get_ms': mean(counters.get('get_us', 0) / 1000, counters.get('get_calls', 0)),
+                'avg_set_ms': mean(counters.get('set_us', 0) / 1000, counters.get('set_calls', 0)),
+                'avg_delete_ms': mean(counters.get('delete_us', 0) / 1000, counters.get('delete_calls', 0)),
+            })
+        return sorted(rows, key=lambda row: row['hits'] + row['misses'] + row['sets'], reverse=True)
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        missing = object()
+        started = time.perf_counter()
+        value = self.wrapped.get(key, missing, version=version)
+        self._record('get', [(key, 'misses' if value is missing else 'hits')], started)
+        return default if value is missing else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        started = time.perf_counter()
+        found = self.wrapped.get_many(keys, version=version)
+        self._record('get', [(key, 'hits' if key in found else 'misses') for key in keys], started)
+        return found
+
+    def has_key(self, key, version=None):
+        started = time.perf_counter()
+        exists = self.wrapped.has_key(key, version=version)
+        self._record('get', [(key, 'hits' if exists else 'misses')], started)
+        return exists
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        started = time.perf_counter()
+        self.wrapped.set(key, value, timeout=timeout, version=version)
+        self._record('set', [(key, 'sets')], started, sizes=[self._size(value)])
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        started = time.perf_counter()
+        failed = self.wrapped.set_many(data, timeout=timeout, version=version)
+        self._record('set', [(key, 'sets') for key in data if key not in failed], started,
+                     sizes=[self._size(value) for key, value in data.items() if key not in failed])
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        started = time.perf_counter()
+        added = self.wrapped.add(key, value, timeout=timeout, version=version)
+        self._record('set', [(key, 'sets' if added else None)], started,
+                     sizes=[self._size(value) if added else 0])
+        return added
+
+    def incr(self, key, delta=1, version=None):
+        started = time.perf_counter()
+        value = self.wrapped.incr(key, delta, version=version)
+        self._record('set', [(key, None)], started)
+        return value
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.wrapped.touch(key, timeout=timeout, version=version)
+
+    def delete(self, key, version=None):
+        started = time.perf_counter()
+        deleted = self.wrapped.delete(key, version=version)
+        self._record('delete', [(key, 'deletes')], started)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        started = time.perf_counter()
+        self.wrapped.delete_many(keys, version=version)
+        self._record('delete', [(key, 'deletes') for key in keys], started)
+
+    def clear(self):
+        self.wrapped.clear()
+
+    def close(self, **kwargs):
+        self.wrapped.close(**kwargs)
@@ -0,0 +1,250 @@
+import math
+import random
+import time
+import uuid
+
+from django.core.cache import cache, caches
+from django.db import transaction
+
+
+class CacheTags:
+    """
+    Tag-based invalidation for cached values.
+
+    Cached entries declare the tags they depend on, e.g. ``job:12`` or
+    ``employer:3``, and models declare which tags a change to one of their
+    rows touches (see ``register``). Invalidating stamps the tags with the
+    next value of a shared counter in a single ``set_many``. An entry records
+    the stamps of its tags when it is stored and is only valid while all of
+    them are unchanged; a stamp that was evicted counts as changed, so a lost
+    stamp can never revive entries. Tag stamps outlive any cached entry
+    (TAG_TIMEOUT), so nothing has to track which keys depend on a tag.
+
+    The counter lives in the shared cache, past the default cache's local
+    tier, so it is never read stale or announced to other processes.
+    """
+    shared_alias = 'shared'
+    COUNTER_KEY = 'cache_tags:counter'
+    TAG_KEY = 'cache_tag:{}'
+    TAG_TIMEOUT = 60 * 60 * 24
+
+    _registry = {}
+
+    @classmethod
+    def register(cls, model):
+        """
+        Decorator for a function returning the tags that saving or deleting
+        an instance of ``model`` invalidates.
+        """
+        def decorator(func):
+            cls._registry.setdefault(model, []).append(func)
+            return func
+        return decorator
+
+    @classmethod
+    def tags_for(cls, instance):
+        tags = set()
+        for func in cls._registry.get(type(instance), ()):
+            tags.update(func(instance))
+        return tags
+
+    @classmethod
+    def counter(cls):
+        shared = caches[cls.shared_alias]
+        value = shared.get(cls.COUNTER_KEY)
+        if value is None:
+            # Start from the clock, so a lost counter never goes back
+            shared.add(cls.COUNTER_KEY, int(time.time() * 1000), timeout=None)
+            value = shared.get(cls.COUNTER_KEY)
+        return value
+
+    @classmethod
+    def invalidate(cls, *tags):
+        """
+        Stamp ``tags`` now, and again once the current transaction commits:
+        an entry computed in between read the old rows, and the second stamp
+        drops it.
+        """
+        tags = {tag for tag in tags if tag}
+        if not tags:
+            return
+        cls._stamp(tags)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: cls._stamp(tags))
+
+    @classmethod
+    def _stamp(cls, tags):
+        shared = caches[cls.shared_alias]
+        try:
+            stamp = shared.incr(cls.COUNTER_KEY)
+        except ValueError:
+            shared.add(cls.COUNTER_KEY, int(time.time() * 1000), timeout=None)
+            stamp = shared.incr(cls.COUNTER_KEY)
+        cache.set_many({cls.TAG_KEY.format(tag): stamp for tag in tags}, timeout=cls.TAG_TIMEOUT)
+
+    @classmethod
+    def stamps(cls, tags, seed):
+        """
+        Current stamps of ``tags``. Tags without one, never invalidated or
+        evicted, get ``seed``: a counter value read before the entry was
+        computed, which only matches an older recorded stamp if nothing was
+        invalidated since.
+        """
+        keys = {cls.TAG_KEY.format(tag): tag for tag in tags}
+        stamps = cache.get_many(list(keys))
+        missing = [key for key in keys if key not in stamps]
+        if missing:
+            for key in missing:
+                cache.add(key, seed, timeout=cls.TAG_TIMEOUT)
+            stamps.update(cache.get_many(missing))
+        return {keys[key]: stamp for key, stamp in stamps.items()}
+
+    @classmethod
+    def is_valid(cls, stamps):
+        """Whether the tags still carry the ``stamps`` recorded with an entry"""
+        if not stamps:
+            return True
+        keys = {tag: cls.TAG_KEY.format(tag) for tag in stamps}
+        current = cache.get_many(list(keys.values()))
+        return all(current.get(keys[tag]) == stamp for tag, stamp in stamps.items())
+
+
+class ComputedCache:
+    """
+    Read-through caching for values that are expensive to rebuild.
+
+    ``get_or_compute`` protects hot keys from stampedes in three ways:
+
+    - single flight: on a miss only the caller that takes the key's lock
+      recomputes; the others wait briefly for its result
+    - early recomputation: each hit recomputes with a probability that grows
+      as expiry nears, scaled by how long the last computation took
+      (XFetch), so hot keys are usually refreshed before they expire
+    - stale while revalidate: entries outlive their timeout by STALE_GRACE;
+      while one caller refreshes an expired entry the others get the old one
+
+    Locks are taken in the shared cache directly: they gain nothing from the
+    default cache's local tier and would only add invalidation messages.
+
+    Entries stored with ``tags`` are dropped as soon as one of the tags is
+    invalidated or loses its stamp (see CacheTags); those are never served
+    stale.
+    """
+    shared_alias = 'shared'
+    STALE_GRACE = 60
+    LOCK_TIMEOUT = 10
+    LOCK_WAIT = 2
+    POLL_INTERVAL = 0.05
+    BETA = 1.0
+    # Returned by _compute_locked when another caller holds the lock
+    _busy = object()
+
+    @staticmethod
+    def _lock_key(key):
+        return f'{key}:lock'
+
+    @classmethod
+    def _get_entry(cls, key):
+        entry = cache.get(key)
+        # Entries in the layout without recorded stamps are rebuilt
+        if entry is not None and (len(entry) != 4 or not CacheTags.is_valid(entry[3])):
+            return None
+        return entry
+
+    @classmethod
+    def get(cls, key):
+        """Return the cached value, fresh or stale, or None"""
+        entry = cls._get_entry(key)
+        return entry[0] if entry is not None else None
+
+    @classmethod
+    def lookup(cls, key):
+        """
+        ``(value, fresh)`` for a cached value, or None on a miss. A value is
+        not fresh when it expired or is due for an early refresh, which
+        ``get_or_compute`` would start.
+        """
+        entry = cls._get_entry(key)
+        if entry is None:
+            return None
+        return entry[0], not cls._refresh_due(entry)
+
+    @classmethod
+    def _refresh_due(cls, entry):
+        expires_at, delta = entry[1:3]
+        return time.time() - delta * cls.BETA * math.log(1 - random.random()) >= expires_at
+
+    @classmethod
+    def set(cls, key, value, timeout, delta=0.0, tags=(), computed_at=None):
+        """
+        Store ``value``. ``computed_at`` is the tag counter read before it was
+        computed; when one of the tags was invalidated since, the value may
+        predate the change and is not stored.
+        """
+        if computed_at is None:
+            computed_at = CacheTags.counter()
+        tags = set(tags)
+        stamps = CacheTags.stamps(tags, computed_at)
+        if len(stamps) < len(tags) or any(stamp > computed_at for stamp in stamps.values()):
+            return
+        entry = (value, time.time() + timeout, delta, stamps)
+        cache.set(key, entry, timeout=timeout + cls.STALE_GRACE)
+
+    @classmethod
+    def get_or_compute(cls, key, compute, timeout, tags=()):
+        """
+        Return the value cached under ``key``, calling ``compute()`` to build
+        it when needed. ``tags`` lists what the value depends on, or is a
+        function of the computed value returning them. A ``None`` result is
+        returned but not cached.
+        """
+        entry = cls._get_entry(key)
+        if entry is not None:
+            value = entry[0]
+            if not cls._refresh_due(entry):
+                return value
+            # Expired or due for an early refresh: one caller recomputes, the
+            # rest keep serving the current value meanwhile
+            result = cls._compute_locked(key, compute, timeout, tags)
+            return value if result is cls._busy else result
+
+        result = cls._compute_locked(key, compute, timeout, tags)
+        if result is not cls._busy:
+            return result
+
+        # Someone else is computing: wait for their result, then give up
+        deadline = time.monotonic() + cls.LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(cls.POLL_INTERVAL)
+            entry = cls._get_entry(key)
+            if entry is not None:
+                return entry[0]
+        return cls._compute(key, compute, timeout, tags)
+
+    @classmethod
+    def _compute_locked(cls, key, compute, timeout, tags):
+        shared = caches[cls.shared_alias]
+        lock_key = cls._lock_key(key)
+        token = uuid.uuid4().hex
+        # Reading the token back also catches backends whose add() is not
+        # atomic (the file-based stand-in), where two callers can both add
+        if not shared.add(lock_key, token, timeout=cls.LOCK_TIMEOUT) or shared.get(lock_key) != token:
+            return cls._busy
+        try:
+            return cls._compute(key, compute, timeout, tags)
+        finally:
+            if shared.get(lock_key) == token:
+                shared.delete(lock_key)
+
+    @classmethod
+    def _compute(cls, key, compute, timeout, tags):
+        # Read before computing, so a change made meanwhile invalidates the result
+        computed_at = CacheTags.counter()
+        started = time.monotonic()
+        value = compute()
+        if value is not None:
+            if callable(tags):
+                tags = tags(value)
+            cls.set(key, value, timeout, delta=time.monotonic() - started,
+                    tags=tags, computed_at=computed_at)
+        return value
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.template.loader import get_template
+from django.utils.html import escape
+
+
+class JobMatchEmail:
+    """
+    The email telling candidates about a job matching their skills, rendered
+    in two stages so a job with many matches costs one template render.
+
+    Everything about the job is rendered once, from compiled templates, into
+    an HTML and a plain text body holding a tag where the recipient's
+    matching skills go. ``substitutions`` gives the small per-recipient
+    values for those tags, which SendGrid fills in per personalization.
+    Candidates mostly share a few skill combinations, so each combination is
+    built once.
+    """
+    HTML_TEMPLATE = 'core/emails/job_match.html'
+    TEXT_TEMPLATE = 'core/emails/job_match.txt'
+    SKILLS_HTML_TAG = '-matching_skills_html-'
+    SKILLS_TEXT_TAG = '-matching_skills_text-'
+
+    def __init__(self, job):
+        """``job`` should come with its employer loaded"""
+        location = job.location or ', '.join(part for part in (job.city, job.state, job.country) if part)
+        context = {
+            'job': job,
+            'company_name': job.employer.company_name,
+            'location': location,
+            'job_url': self.job_url(job),
+            'skills_html_tag': self.SKILLS_HTML_TAG,
+            'skills_text_tag': self.SKILLS_TEXT_TAG,
+        }
+        self.subject = f"New Job Match: {job.title}"
+        self.html = get_template(self.HTML_TEMPLATE).render(context)
+        self.text = get_template(self.TEXT_TEMPLATE).render(context)
+        self._substitutions = {}
+
+    @staticmethod
+    def job_url(job):
+        return f"{settings.FRONTEND_URL.rstrip('/')}/jobs/{job.id}"
+
+    def substitutions(self, skill_names):
+        """Values of the skill tags for a recipient with ``skill_names``"""
+        key = tuple(skill_names)
+        substitutions = self._substitutions.get(key)
+        if substitutions is None:
+            substitutions = self._substitutions[key] = {
+                self.SKILLS_HTML_TAG: ''.join(f'<li>{escape(name)}</li>' for name in skill_names),
+                self.SKILLS_TEXT_TAG: '\n'.join(f'- {name}' for name in skill_names),
+            }
+        return substitutions
+
+    def render(self, skill_names):
+        """Subject, HTML and text for one recipient, as SendGrid would send them"""
+        html, text = self.html, self.text
+        for tag, value in self.substitutions(skill_names).items():
+            html, text = html.replace(tag, value), text.replace(tag, value)
+        return self.subject, html, text
@@ -0,0 +1,232 @@
+import hashlib
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .geo import Gazetteer, bounding_box, haversine_km
+from .models import Category, JobPosting, JobSkill
+
+
+class JobFilter:
+    """
+    Turns ``/api/jobs/`` query parameters into queryset filters.
+
+    Every filter lands on a column covered by one of the indexes declared on
+    ``JobPosting.Meta.indexes`` (or on the indexed foreign keys of the
+    category/skill join tables), so no combination needs a full table scan:
+
+    - employment_type:  (employment_type, experience_level)
+    - job_type:         (job_type, experience_level)
+    - experience_level: (experience_level)
+    - city / country:   (city, country) / (country, city)
+    - category, skill:  join table foreign key indexes, as id subqueries
+    - salary_min/max:   (salary_max_base) / (salary_min_base), amounts in
+                        SALARY_BASE_CURRENCY
+    - posted_since:     (status, is_active, posted_at, id)
+    - near/radius_km:   (latitude, longitude) bounding box, then an exact
+                        haversine check on the rows inside it
+    """
+    choice_params = {
+        'employment_type': JobPosting.EmploymentType,
+        'job_type': JobPosting.LocationType,
+        'experience_level': JobPosting.ExperienceLevel,
+    }
+    text_params = ['city', 'country']
+    id_params = ['category', 'skill']
+    decimal_params = ['salary_min', 'salary_max']
+
+    def __init__(self, params):
+        self.filters = self.parse(params)
+
+    @classmethod
+    def parse(cls, params):
+        """Validate query parameters and return them in normalized form"""
+        filters = {}
+
+        for param, choices in cls.choice_params.items():
+            values = cls._split(params.get(param))
+            invalid = [value for value in values if value not in choices.values]
+            if invalid:
+                raise ValidationError({param: f"Invalid choice(s): {', '.join(invalid)}"})
+            if values:
+                filters[param] = values
+
+        for param in cls.text_params:
+            value = (params.get(param) or '').strip()
+            if value:
+                filters[param] = value
+
+        for param in cls.id_params:
+            try:
+                values = sorted({int(value) for value in cls._split(params.get(param))})
+            except ValueError:
+                raise ValidationError({param: 'Must be a comma-separated list of ids'})
+            if values:
+                filters[param] = values
+
+        for param in cls.decimal_params:
+            value = params.get(param)
+            if not value:
+                continue
+            try:
+                amount = Decimal(value)
+            except InvalidOperation:
+                raise ValidationError({param: 'Must be a number'})
+            if not amount.is_finite() or amount < 0:
+                raise ValidationError({param: 'Must be a positive number'})
+            filters[param] = amount
+
+        posted_since = params.get('posted_since')
+        if posted_since:
+            filters['posted_since'] = cls._parse_posted_since(posted_since)
+
+        near = (params.get('near') or '').strip()
+        if near:
+            filters['near'] = cls._parse_near(near)
+            filters['radius_km'] = cls._parse_radius(params.get('radius_km'))
+        elif params.get('radius_km'):
+            raise ValidationError({'radius_km': 'Requires near'})
+
+        return filters
+
+    def apply(self, queryset):
+        """Narrow ``queryset`` down to the jobs matching every filter"""
+        filters = self.filters
+
+        for param in self.choice_params:
+            if param in filters:
+                queryset = queryset.filter(**{f'{param}__in': filters[param]})
+
+        for param in self.text_params:
+            if param in filters:
+                queryset = queryset.filter(**{param: filters[param]})
+
+        if 'category' in filters:
+            # A top-level category also matches jobs filed under its subcategories
+            category_ids = Category.objects.filter(
+                Q(id__in=filters['category']) | Q(parent_id__in=filters['category'])
+            ).values('id')
+            job_ids = JobPosting.categories.through.objects.filter(
+                category_id__in=category_ids
+            ).values('jobposting_id')
+            queryset = queryset.filter(id__in=job_ids)
+
+        if 'skill' in filters:
+            job_ids = JobSkill.objects.filter(skill_id__in=filters['skill']).values('job_id')
+            queryset = queryset.filter(id__in=job_ids)
+
+        # Salary filters match any job whose advertised range overlaps the
+        # requested one, compared in the base currency
+        if 'salary_min' in filters:
+            queryset = queryset.filter(salary_max_base__gte=filters['salary_min'])
+        if 'salary_max' in filters:
+            queryset = queryset.filter(salary_min_base__lte=filters['salary_max'])
+
+        if 'posted_since' in filters:
+            queryset = queryset.filter(posted_at__gte=filters['posted_since'])
+
+        # Last, so the bounding box query already carries every other filter
+        if 'near' in filters:
+            queryset = queryset.filter(id__in=self._ids_within_radius(queryset))
+
+        return queryset
+
+    def _ids_within_radius(self, queryset):
+        latitude, longitude = self.filters['near']
+        radius_km = self.filters['radius_km']
+
+        min_lat, max_lat, lon_ranges = bounding_box(latitude, longitude, radius_km)
+        in_box = Q()
+        for min_lon, max_lon in lon_ranges:
+            in_box |= Q(longitude__range=(min_lon, max_lon))
+        candidates = list(
+            queryset.filter(in_box, latitude__range=(min_lat, max_lat))
+            .order_by()
+            .values_list('id', 'latitude', 'longitude')
+        )
+
+        distances = haversine_km(latitude, longitude, [(lat, lon) for _, lat, lon in candidates])
+        return [
+            job_id for (job_id, _, _), distance in zip(candidates, distances)
+            if distance <= radius_km
+        ]
+
+    def signature(self, *extra):
+        """
+        Stable hash of the normalized filters, usable as a cache key component.
+        ``extra`` adds further request state (e.g. search terms) to the hash.
+        """
+        parts = [str(item) for item in extra]
+        for param, value in sorted(self.filters.items()):
+            if isinstance(value, (list, tuple)):
+                value = ','.join(str(item) for item in value)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, Decimal):
+                value = format(value.normalize(), 'f')
+            parts.append(f'{param}={value}')
+        return hashlib.md5('&'.join(parts).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _split(value):
+        if not value:
+            return []
+        return sorted({item.strip() for item in value.split(',') if item.strip()})
+
+    @staticmethod
+    def _parse_near(value):
+        """Accept "lat,lon" or a place name known to the gazetteer"""
+        parts = [part.strip() for part in value.split(',')]
+        if len(parts) == 2:
+            try:
+                latitude, longitude = float(parts[0]), float(parts[1])
+            except ValueError:
+                pass
+            else:
+                if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                    raise ValidationError({'near': 'Coordinates out of range'})
+                return round(latitude, 6), round(longitude, 6)
+
+        # "City", "City, Country" or "City, Region, Country"
+        city = parts[0]
+        state = parts[1] if len(parts) > 2 else ''
+        country = parts[-1] if len(parts) > 1 else ''
+        coordinates = Gazetteer.geocode(city, state, country) or Gazetteer.geocode(state=city, country=country)
+        if coordinates is None:
+            raise ValidationError({'near': f'Unknown location: {value}'})
+        return coordinates
+
+    @staticmethod
+    def _parse_radius(value):
+        if not value:
+            return settings.JOB_GEO_DEFAULT_RADIUS_KM
+        try:
+            radius_km = float(value)
+        except ValueError:
+            raise ValidationError({'radius_km': 'Must be a number'})
+        if not 0 < radius_km <= settings.JOB_GEO_MAX_RADIUS_KM:
+            raise ValidationError({
+                'radius_km': f'Must be between 0 and {settings.JOB_GEO_MAX_RADIUS_KM:g} km'
+            })
+        return radius_km
+
+    @staticmethod
+    def _parse_posted_since(value):
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                date = parse_date(value)
+                if date is None:
+                    raise ValueError
+                parsed = datetime.combine(date, time.min)
+        except ValueError:
+            raise ValidationError({'posted_since': 'Must be an ISO 8601 date or datetime'})
+
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
@@ -0,0 +1,115 @@
+import csv
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'gazetteer.csv'
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Words that only qualify a place name, e.g. "Greater Accra" or "Lagos State"
+QUALIFIERS = {
+    'greater', 'metropolis', 'metropolitan', 'city', 'region', 'state',
+    'province', 'county', 'district', 'municipality',
+}
+
+
+def normalize(name):
+    """Lowercase ASCII form of a place name without qualifier words"""
+    name = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii')
+    words = re.findall(r'[a-z0-9]+', name.lower())
+    return ' '.join([word for word in words if word not in QUALIFIERS] or words)
+
+
+class Gazetteer:
+    """
+    Offline geocoder over the bundled ``core/data/gazetteer.csv``.
+
+    Each row is a city with its first-level region (``admin1``), country and
+    alternate names. Lookups match the normalized city name first, then the
+    region, preferring the most populous place within the given country.
+    """
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _load():
+        places, regions, countries = {}, {}, {}
+        with open(GAZETTEER_PATH, newline='', encoding='utf-8') as handle:
+            for row in csv.DictReader(handle):
+                place = (
+                    int(row['population'] or 0), row['country_code'],
+                    float(row['latitude']), float(row['longitude']),
+                )
+                names = [row['name'], *filter(None, row['alternate_names'].split('|'))]
+                for name in names:
+                    places.setdefault(normalize(name), []).append(place)
+                regions.setdefault(normalize(row['admin1']), []).append(place)
+                countries[normalize(row['country'])] = row['country_code']
+                countries[row['country_code'].lower()] = row['country_code']
+
+        for index in (places, regions):
+            for candidates in index.values():
+                candidates.sort(reverse=True)
+        return places, regions, countries
+
+    @classmethod
+    def geocode(cls, city='', state='', country=''):
+        """Return (latitude, longitude) for a location, or None when unknown"""
+        places, regions, countries = cls._load()
+        country_code = countries.get(normalize(country)) if country else None
+
+        for name, index in ((city, places), (state, regions), (state, places)):
+            candidates = index.get(normalize(name)) if name else None
+            if candidates and country_code:
+                candidates = [place for place in candidates if place[1] == country_code]
+            if candidates:
+                _, _, latitude, longitude = candidates[0]
+                return latitude, longitude
+        return None
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Return (min_lat, max_lat, lon_ranges) enclosing the circle around a point.
+    ``lon_ranges`` holds two ranges when the box crosses the antimeridian.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        # The circle covers a pole, so every longitude qualifies
+        return max(min_lat, -90.0), min(max_lat, 90.0), [(-180.0, 180.0)]
+
+    # Widest longitude offset of the circle, reached north/south of its centre
+    ratio = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))
+    if ratio >= 1:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+
+    delta_lon = math.degrees(math.asin(ratio))
+    min_lon, max_lon = longitude - delta_lon, longitude + delta_lon
+    if min_lon < -180:
+        return min_lat, max_lat, [(min_lon + 360, 180.0), (-180.0, max_lon)]
+    if max_lon > 180:
+        return min_lat, max_lat, [(min_lon, 180.0), (-180.0, max_lon - 360)]
+    return min_lat, max_lat, [(min_lon, max_lon)]
+
+
+def haversine_km(latitude, longitude, points):
+    """
+    Great-circle distances in km from one point to each (lat, lon) in
+    ``points``, computed as a batch with the origin terms hoisted out.
+    """
+    sin, cos, asin, sqrt, radians = math.sin, math.cos, math.asin, math.sqrt, math.radians
+    lat1, lon1 = radians(latitude), radians(longitude)
+    cos_lat1 = cos(lat1)
+    diameter = 2 * EARTH_RADIUS_KM
+
+    distances = []
+    for lat2, lon2 in points:
+        lat2 = radians(lat2)
+        half_dlat = (lat2 - lat1) / 2
+        half_dlon = (radians(lon2) - lon1) / 2
+        a = sin(half_dlat) ** 2 + cos_lat1 * cos(lat2) * sin(half_dlon) ** 2
+        distances.append(diameter * asin(min(1.0, sqrt(a))))
+    return distances
@@ -0,0 +1,126 @@
+import json
+import logging
+import random
+import threading
+import time
+
+import urllib3
+from django.conf import settings
+
+from .throttling import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class MailerError(Exception):
+    """SendGrid did not accept a message"""
+
+
+class SendGridMailer:
+    """
+    Sends email through SendGrid's v3 mail send API.
+
+    A message for many recipients goes out as one request per
+    MAX_PERSONALIZATIONS recipients, each recipient a personalization with
+    its own ``substitutions``, so a shared body can still carry per-recipient
+    parts. Each thread keeps one pooled urllib3 connection to SendGrid.
+
+    Recipients are drawn from a TokenBucket of ``EMAIL_RATE_LIMIT`` per minute
+    shared by all workers; a send waits when it runs dry. Rate limited
+    (429), server errors and connection failures are retried with backoff
+    up to MAX_ATTEMPTS times before MailerError is raised, leaving longer
+    retries to the task queue.
+    """
+    MAX_PERSONALIZATIONS = 1000
+    MAX_ATTEMPTS = 4
+    RETRY_BASE_DELAY = 0.5
+    RATE_LIMIT_KEY = 'email:send'
+
+    _local = threading.local()
+
+    @classmethod
+    def _pool(cls):
+        pool = getattr(cls._local, 'pool', None)
+        if pool is None:
+            pool = cls._local.pool = urllib3.PoolManager(
+                maxsize=1, retries=False, timeout=urllib3.Timeout(connect=5, read=30),
+            )
+        return pool
+
+    @classmethod
+    def send(cls, subject, recipients, html=None, text=None):
+        """
+        Send one message to each of ``recipients``: email addresses, or
+        ``(email, substitutions)`` pairs whose substitutions replace tags in
+        the subject and bodies. At least one of ``html`` and ``text`` is needed.
+        Returns the number of recipients sent to.
+        """
+        if html is None and text is None:
+            raise ValueError('An email needs an html or a text body')
+        recipients = [(recipient, None) if isinstance(recipient, str) else tuple(recipient)
+                      for recipient in recipients]
+        rate = settings.EMAIL_RATE_LIMIT
+        batch_size = min(cls.MAX_PERSONALIZATIONS, rate) if rate else cls.MAX_PERSONALIZATIONS
+        for start in range(0, len(recipients), batch_size):
+            batch = recipients[start:start + batch_size]
+            if rate:
+                cls._wait_for_quota(TokenBucket(cls.RATE_LIMIT_KEY, rate, 60), len(batch))
+            cls._post(subject, cls._payload(subject, batch, html, text), len(batch))
+        return len(recipients)
+
+    @staticmethod
+    def _wait_for_quota(bucket, count):
+        while wait := bucket.consume(count):
+            time.sleep(wait / 1000)
+
+    @staticmethod
+    def _payload(subject, recipients, html, text):
+        personalizations = []
+        for email, substitutions in recipients:
+            personalization = {'to': [{'email': email}]}
+            if substitutions:
+                personalization['substitutions'] = substitutions
+            personalizations.append(personalization)
+        # SendGrid wants the plain text part first
+        content = []
+        if text is not None:
+            content.append({'type': 'text/plain', 'value': text})
+        if html is not None:
+            content.append({'type': 'text/html', 'value': html})
+        return {
+            'personalizations': personalizations,
+            'from': {'email': settings.DEFAULT_FROM_EMAIL},
+            'subject': subject,
+            'content': content,
+        }
+
+    @classmethod
+    def _post(cls, subject, payload, count):
+        body = json.dumps(payload).encode()
+        headers = {
+            'Authorization': f'Bearer {settings.SENDGRID_API_KEY}',
+            'Content-Type': 'application/json',
+        }
+        for attempt in range(1, cls.MAX_ATTEMPTS + 1):
+            started = time.monotonic()
+            retry_after = None
+            try:
+                response = cls._pool().request('POST', settings.SENDGRID_API_URL, body=body, headers=headers)
+            except urllib3.exceptions.HTTPError as e:
+                error = f'{type(e).__name__}: {e}'
+            else:
+                if response.status < 300:
+                    logger.info(f'Sent "{subject}" to {count} recipients in {time.monotonic() - started:.3f}s')
+                    return
+                error = f'SendGrid answered {response.status}: {response.data[:500].decode(errors="replace")}'
+                if response.status != 429 and response.status < 500:
+                    raise MailerError(error)
+                retry_after = response.headers.get('Retry-After')
+
+            if attempt == cls.MAX_ATTEMPTS:
+                raise MailerError(error)
+            delay = cls.RETRY_BASE_DELAY * 2 ** (attempt - 1) * random.uniform(0.5, 1)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            logger.warning(f'Sending "{subject}" to {count} recipients failed, retrying in {delay:.1f}s: {error}')
+            time.sleep(delay)
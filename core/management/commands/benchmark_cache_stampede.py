@@ -0,0 +1,96 @@
+# management/commands/benchmark_cache_stampede.py
+import statistics
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from core.caching import ComputedCache
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure how many recomputations and how much latency concurrent readers '
+        'cause when a hot cache key is missing or expiring, with plain get/set '
+        'and with ComputedCache.get_or_compute. Run with CACHE_LOCAL_TIMEOUT=0 to '
+        'take the in-process tier out, otherwise it hides expiry from plain get/set'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=32)
+        parser.add_argument('--compute-ms', type=int, default=200,
+                            help='Simulated cost of rebuilding the value')
+        parser.add_argument('--duration', type=float, default=5.0,
+                            help='Seconds of sustained load per strategy')
+        parser.add_argument('--ttl', type=int, default=1,
+                            help='Cache timeout used during the sustained run')
+
+    def handle(self, *args, **options):
+        self.threads = options['threads']
+        self.compute_seconds = options['compute_ms'] / 1000
+
+        strategies = [('get/set', self._naive), ('get_or_compute', ComputedCache.get_or_compute)]
+        for name, read in strategies:
+            cold = self._run(read, ttl=60, duration=None)
+            sustained = self._run(read, ttl=options['ttl'], duration=options['duration'])
+            self.stdout.write(name)
+            self.stdout.write(f'  cold key:  {self._format(cold)}')
+            self.stdout.write(f'  sustained: {self._format(sustained)}')
+
+    @staticmethod
+    def _naive(key, compute, timeout):
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value, timeout=timeout)
+        return value
+
+    def _run(self, read, ttl, duration):
+        """
+        Start every thread at once against an empty key. Without a duration each
+        thread reads once, otherwise they keep reading until it has passed.
+        """
+        key = f'benchmark_stampede:{uuid.uuid4().hex}'
+        computations = []
+        latencies = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(self.threads)
+
+        def compute():
+            time.sleep(self.compute_seconds)
+            with lock:
+                computations.append(time.monotonic())
+            return {'computed_at': time.time()}
+
+        def worker():
+            barrier.wait()
+            deadline = time.monotonic() + (duration or 0)
+            while True:
+                started = time.perf_counter()
+                read(key, compute, ttl)
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(0.01)
+
+        workers = [threading.Thread(target=worker) for _ in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        cache.delete(key)
+        return computations, latencies
+
+    @staticmethod
+    def _format(result):
+        computations, latencies = result
+        latencies = sorted(latencies)
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        return (
+            f'{len(computations)} computations for {len(latencies)} reads, '
+            f'p50 {p50:.1f} ms, p99 {p99:.1f} ms'
+        )
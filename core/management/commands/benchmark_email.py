@@ -0,0 +1,49 @@
+# management/commands/benchmark_email.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from core.mailer import SendGridMailer
+from core.sendgrid_standin import SendGridStandIn
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure emails per minute through SendGridMailer against a local '
+        'SendGrid stand-in: batched personalizations versus one request per '
+        'recipient'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--emails', type=int, default=5000, help='Recipients to send to')
+        parser.add_argument('--latency-ms', type=float, default=50, help='Stand-in answer latency')
+        parser.add_argument('--single', type=int, default=200,
+                            help='Recipients sent one request each, for comparison')
+        parser.add_argument('--rate', type=int, default=0,
+                            help='EMAIL_RATE_LIMIT to apply; 0 measures without a limit')
+
+    def handle(self, *args, **options):
+        body = '<p>A job matching your skills: <ul>-skills-</ul></p>'
+        recipients = [(f'candidate{index}@example.com', {'-skills-': '<li>Python</li>'})
+                      for index in range(options['emails'])]
+
+        with SendGridStandIn(latency=options['latency_ms'] / 1000) as standin:
+            with override_settings(SENDGRID_API_URL=standin.url, SENDGRID_API_KEY='benchmark',
+                                   EMAIL_RATE_LIMIT=options['rate']):
+                started = time.monotonic()
+                SendGridMailer.send('Benchmark', recipients, html=body)
+                batched = time.monotonic() - started
+                batched_requests = standin.requests
+
+                single = recipients[:options['single']]
+                started = time.monotonic()
+                for recipient in single:
+                    SendGridMailer.send('Benchmark', [recipient], html=body)
+                one_by_one = time.monotonic() - started
+
+        self.stdout.write(f"Batched: {len(recipients)} emails in {batched_requests} requests, "
+                          f"{batched:.2f}s, {len(recipients) / batched * 60:,.0f} emails/min")
+        if single:
+            self.stdout.write(f"One request per email: {len(single)} emails, {one_by_one:.2f}s, "
+                              f"{len(single) / one_by_one * 60:,.0f} emails/min")
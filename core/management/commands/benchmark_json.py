@@ -0,0 +1,63 @@
+# management/commands/benchmark_json.py
+import io
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import parsers, renderers
+
+from core.models import CandidateProfile, JobPosting
+from core.parsers import JSONParser
+from core.renderers import JSONRenderer, orjson
+from core.serializer import CandidateProfileSerializer, GetJobSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare DRF\'s JSON renderer and parser with the project\'s on real '
+        'GetJobSerializer and CandidateProfileSerializer payloads'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100,
+                            help='Jobs and candidate profiles to serialize')
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        limit, repeat = options['limit'], options['repeat']
+        jobs = GetJobSerializer.setup_eager_loading(JobPosting.objects.order_by('-id'))[:limit]
+        profiles = (
+            CandidateProfile.objects
+            .select_related('user')
+            .prefetch_related('candidate_skills__skill', 'education', 'certifications')
+            .order_by('-id')[:limit]
+        )
+        payloads = {
+            'GetJobSerializer': GetJobSerializer(jobs, many=True).data,
+            'CandidateProfileSerializer': CandidateProfileSerializer(profiles, many=True).data,
+        }
+        if not any(payloads.values()):
+            raise CommandError('No jobs or candidate profiles to serialize')
+
+        self.stdout.write(f"orjson: {orjson.__version__ if orjson else 'not installed'}")
+        for name, data in payloads.items():
+            if not data:
+                continue
+            content = renderers.JSONRenderer().render(data)
+            if JSONRenderer().render(data) != content:
+                raise CommandError(f'{name}: rendered bytes differ from DRF')
+
+            render_drf = self._time(lambda: renderers.JSONRenderer().render(data), repeat)
+            render_own = self._time(lambda: JSONRenderer().render(data), repeat)
+            parse_drf = self._time(lambda: parsers.JSONParser().parse(io.BytesIO(content)), repeat)
+            parse_own = self._time(lambda: JSONParser().parse(io.BytesIO(content)), repeat)
+
+            self.stdout.write(f'{name}: {len(data)} objects, {len(content) / 1024:.1f} KiB')
+            self.stdout.write(f'  render  DRF {render_drf:.3f} ms, project {render_own:.3f} ms '
+                              f'({render_drf / render_own:.1f}x)')
+            self.stdout.write(f'  parse   DRF {parse_drf:.3f} ms, project {parse_own:.3f} ms '
+                              f'({parse_drf / parse_own:.1f}x)')
+
+    @staticmethod
+    def _time(func, repeat):
+        """Best of five runs, in milliseconds per call"""
+        return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat * 1000
@@ -0,0 +1,56 @@
+# management/commands/cache_stats.py
+import time
+from collections import Counter
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache_backends import InstrumentedCache
+
+COLUMNS = [
+    ('pattern', 'pattern'), ('hits', 'hits'), ('misses', 'misses'), ('hit_ratio', 'ratio'),
+    ('sets', 'sets'), ('deletes', 'deletes'), ('avg_set_bytes', 'set B'),
+    ('avg_get_ms', 'get ms'), ('avg_set_ms', 'set ms'), ('avg_delete_ms', 'delete ms'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Show cache hit ratio, value sizes and latency per key pattern, merged '
+        'over all workers: totals, or the traffic of the next --interval seconds'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Seconds to measure for; 0 shows the totals so far')
+        parser.add_argument('--limit', type=int, default=30, help='Patterns to show')
+
+    def handle(self, *args, **options):
+        cache = caches['default']
+        if not isinstance(cache, InstrumentedCache):
+            raise CommandError('The default cache is not an InstrumentedCache')
+
+        metrics = cache.metrics()
+        if options['interval']:
+            # Workers publish every FLUSH_INTERVAL, so wait for one more round
+            time.sleep(options['interval'] + cache.flush_interval)
+            before, metrics = metrics, cache.metrics()
+            metrics = {
+                pattern: counters - Counter(before.get(pattern, {}))
+                for pattern, counters in metrics.items()
+            }
+
+        rows = InstrumentedCache.summarize(metrics)[:options['limit']]
+        if not rows:
+            self.stdout.write('No cache traffic recorded')
+            return
+
+        cells = [[title for _, title in COLUMNS]]
+        for row in rows:
+            cells.append(['-' if row[name] is None else str(row[name]) for name, _ in COLUMNS])
+        widths = [max(len(line[index]) for line in cells) for index in range(len(COLUMNS))]
+        for line in cells:
+            self.stdout.write('  '.join(
+                cell.ljust(width) if index == 0 else cell.rjust(width)
+                for index, (cell, width) in enumerate(zip(line, widths))
+            ))
@@ -0,0 +1,45 @@
+# management/commands/geocode_locations.py
+from django.core.management.base import BaseCommand
+
+from core.models import EmployerProfile, JobPosting
+
+
+class Command(BaseCommand):
+    help = 'Geocode employer and job locations against the bundled gazetteer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # Employers first: jobs without a location inherit their coordinates
+        employers = EmployerProfile.objects.only('id', 'city', 'state', 'country')
+        employers_count, employers_located = self._geocode(employers, batch_size)
+
+        jobs = JobPosting.objects.select_related('employer').only(
+            'id', 'city', 'state', 'country', 'employer__latitude', 'employer__longitude'
+        )
+        jobs_count, jobs_located = self._geocode(jobs, batch_size)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Employers: {employers_located}/{employers_count} located\n'
+                f'Jobs: {jobs_located}/{jobs_count} located'
+            )
+        )
+
+    def _geocode(self, queryset, batch_size):
+        total = located = 0
+        batch = []
+        for instance in queryset.order_by('id').iterator(chunk_size=batch_size):
+            instance.update_coordinates()
+            total += 1
+            located += instance.latitude is not None
+            batch.append(instance)
+            if len(batch) >= batch_size:
+                queryset.model.objects.bulk_update(batch, ['latitude', 'longitude'])
+                batch = []
+        if batch:
+            queryset.model.objects.bulk_update(batch, ['latitude', 'longitude'])
+        return total, located
@@ -0,0 +1,83 @@
+# management/commands/load_exchange_rates.py
+import csv
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import ExchangeRate
+from core.services import SalaryService
+
+
+class Command(BaseCommand):
+    help = (
+        'Load exchange rates into the local rate table and recompute the normalized '
+        'salaries of jobs in every currency whose rate changed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'file', nargs='?',
+            help='CSV file with "currency,rate" rows; rate is the value of one unit in the base currency',
+        )
+        parser.add_argument(
+            '--rate', action='append', default=[], metavar='CODE=RATE',
+            help='Set a single rate, e.g. --rate EUR=1.08 (repeatable)',
+        )
+        parser.add_argument(
+            '--recompute-all', action='store_true',
+            help='Recompute every job, e.g. after changing SALARY_BASE_CURRENCY',
+        )
+
+    def handle(self, *args, **options):
+        rates = {}
+        if options['file']:
+            with open(options['file'], newline='') as handle:
+                for row in csv.reader(handle):
+                    if not row or row[0].strip().lower() in ('currency', ''):
+                        continue
+                    rates[row[0]] = row[1] if len(row) > 1 else ''
+        for item in options['rate']:
+            currency, _, rate = item.partition('=')
+            rates[currency] = rate
+
+        if not rates and not options['recompute_all']:
+            raise CommandError('Give a CSV file, --rate or --recompute-all')
+
+        current = dict(ExchangeRate.objects.values_list('currency', 'rate'))
+        created_count = updated_count = unchanged_count = 0
+
+        with transaction.atomic():
+            for currency, value in rates.items():
+                currency = currency.strip().upper()
+                try:
+                    rate = Decimal(value.strip())
+                except InvalidOperation:
+                    raise CommandError(f'Invalid rate for {currency}: {value!r}')
+                if len(currency) != 3 or not rate.is_finite() or rate <= 0:
+                    raise CommandError(f'Invalid rate for {currency}: {value!r}')
+
+                if current.get(currency) == rate:
+                    unchanged_count += 1
+                    continue
+
+                # Saving a rate recomputes the jobs in that currency (see signals)
+                _, created = ExchangeRate.objects.update_or_create(
+                    currency=currency, defaults={'rate': rate, 'is_active': True}
+                )
+                if created:
+                    created_count += 1
+                else:
+                    updated_count += 1
+                self.stdout.write(f'{currency}: {rate} {settings.SALARY_BASE_CURRENCY}')
+
+            if options['recompute_all']:
+                jobs_count = SalaryService.recompute_base_salaries()
+                self.stdout.write(f'Recomputed salaries for {jobs_count} jobs')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Rates created: {created_count}, updated: {updated_count}, unchanged: {unchanged_count}'
+            )
+        )
@@ -0,0 +1,94 @@
+# management/commands/run_worker.py
+import logging
+import multiprocessing
+import signal
+import threading
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Run queued background tasks (see core.tasks) with a pool of threads or '
+        'processes. Stops after the tasks in hand on SIGTERM or Ctrl-C'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Tasks run at the same time')
+        parser.add_argument('--pool', choices=['thread', 'process'], default='thread',
+                            help='Threads suit I/O bound tasks like email, processes CPU bound ones')
+        parser.add_argument('--batch-size', type=int, default=1,
+                            help='Tasks each worker claims at a time')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait when no task is due')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit when no task is due instead of waiting for more')
+
+    def handle(self, *args, **options):
+        process_pool = options['pool'] == 'process'
+        stop = multiprocessing.Event() if process_pool else threading.Event()
+
+        def request_stop(signum, frame):
+            self.stdout.write('Stopping after the current tasks')
+            stop.set()
+
+        previous = {signum: signal.signal(signum, request_stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+
+        arguments = (stop, options['batch_size'], options['poll_interval'], options['once'])
+        if process_pool:
+            # Children must open their own database connections
+            connections.close_all()
+            workers = [multiprocessing.Process(target=self.work, args=arguments)
+                       for _ in range(options['concurrency'])]
+        else:
+            workers = [threading.Thread(target=self.work, args=arguments)
+                       for _ in range(options['concurrency'])]
+
+        self.stdout.write(f"Running {options['concurrency']} {options['pool']} workers")
+        try:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    @staticmethod
+    def work(stop, batch_size, poll_interval, once):
+        if multiprocessing.parent_process() is not None:
+            # Under spawn and forkserver the child is a fresh interpreter
+            # that has to set Django up itself
+            if not apps.ready:
+                django.setup()
+            # Ctrl-C reaches the whole process group and is left to the
+            # parent; SIGTERM finishes the tasks in hand
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        # Importing models needs the app registry
+        from core.tasks import TaskQueue
+
+        try:
+            while not stop.is_set():
+                try:
+                    tasks = TaskQueue.claim(batch_size)
+                    for task in tasks:
+                        TaskQueue.run(task)
+                except DatabaseError:
+                    # Lost connection, lock timeout, deadlock: a task whose
+                    # outcome went unrecorded runs again once its claim expires
+                    logger.exception('Could not claim or record tasks')
+                    connections.close_all()
+                    stop.wait(poll_interval)
+                    continue
+                if not tasks:
+                    if once:
+                        return
+                    stop.wait(poll_interval)
+        finally:
+            connections.close_all()
@@ -0,0 +1,30 @@
+# management/commands/sendgrid_standin.py
+from django.core.management.base import BaseCommand
+
+from core.sendgrid_standin import SendGridStandIn
+
+
+class Command(BaseCommand):
+    help = (
+        'Run a local server answering like SendGrid\'s mail send API, for load '
+        'tests of the email path. Point SENDGRID_API_URL at the printed URL'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8025)
+        parser.add_argument('--latency-ms', type=float, default=50,
+                            help='Added to every answer, roughly what the real API takes')
+        parser.add_argument('--fail-every', type=int, default=0,
+                            help='Answer every n-th request with a 503')
+
+    def handle(self, *args, **options):
+        standin = SendGridStandIn(port=options['port'], latency=options['latency_ms'] / 1000,
+                                  fail_every=options['fail_every'])
+        self.stdout.write(f'Listening on {standin.url}')
+        try:
+            standin.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            standin.stop()
+            self.stdout.write(f'{standin.requests} requests, {len(standin.recipients)} recipients accepted')
@@ -0,0 +1,86 @@
+# management/commands/warm_caches.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Count
+
+from core.filters import JobFilter
+from core.models import Category, JobPosting
+from core.services import JobDetailService, JobFacetService
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the cache after a deploy: details of the most applied-to active jobs, '
+        'and facet counts for the job list and each top-level category. Entries '
+        'that are already cached are left alone, so it can run alongside traffic'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=500, help='Job details to warm')
+        parser.add_argument('--batch-size', type=int, default=50, help='Jobs loaded per query')
+        parser.add_argument('--workers', type=int, default=4, help='Batches warmed in parallel')
+        parser.add_argument('--budget', type=float, default=60,
+                            help='Seconds after which remaining batches are skipped')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        self.deadline = started + options['budget']
+
+        active = JobPosting.objects.filter(status=JobPosting.Status.ACTIVE, is_active=True)
+        # Jobs people apply to are the ones they look at; newest first otherwise
+        job_ids = list(
+            active.annotate(application_count=Count('applications'))
+            .order_by('-application_count', '-posted_at', '-id')
+            .values_list('id', flat=True)[:options['jobs']]
+        )
+        batch_size = options['batch_size']
+        tasks = [
+            ('facets', self._warm_facets, {})
+        ] + [
+            ('facets', self._warm_facets, {'category': str(category_id)})
+            for category_id in Category.objects.filter(parent__isnull=True).values_list('id', flat=True)
+        ] + [
+            ('details', JobDetailService.warm, job_ids[index:index + batch_size])
+            for index in range(0, len(job_ids), batch_size)
+        ]
+
+        if options['workers'] > 1:
+            with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+                results = list(executor.map(lambda task: self._run(*task[1:], close=True), tasks))
+        else:
+            results = [self._run(*task[1:]) for task in tasks]
+
+        warmed = {'facets': 0, 'details': 0}
+        for (kind, _, _), result in zip(tasks, results):
+            warmed[kind] += result or 0
+        self.stdout.write(
+            f"Warmed {warmed['details']} of {len(job_ids)} job details and {warmed['facets']} facet sets "
+            f'in {time.monotonic() - started:.1f}s'
+        )
+        skipped = results.count(None)
+        if skipped:
+            self.stdout.write(self.style.WARNING(f'{skipped} of {len(tasks)} tasks skipped, over the time budget'))
+
+    def _run(self, func, argument, close=False):
+        """Run one task unless the budget is spent; None when skipped"""
+        if time.monotonic() >= self.deadline:
+            return None
+        try:
+            return func(argument)
+        finally:
+            if close:
+                # Each pool thread opened its own connection
+                connections.close_all()
+
+    @staticmethod
+    def _warm_facets(params):
+        # Same queryset and key as the facets endpoint for these parameters
+        job_filter = JobFilter(params)
+        queryset = job_filter.apply(
+            JobPosting.objects.filter(status=JobPosting.Status.ACTIVE, is_active=True)
+        )
+        JobFacetService.get_facets(queryset, job_filter.signature())
+        return 1
@@ -0,0 +1,123 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import CandidateSkill
+
+SEQUENCE_KEY = 'skill_index:sequence'
+LOG_KEY = 'skill_index:log:{}'
+# Falling further behind than this is treated like lost changes
+MAX_REPLAY = 1000
+
+
+class SkillIndex:
+    """
+    In-process inverted index from skill id to the ids of the candidates
+    who have it, for matching jobs to candidates without a query per
+    candidate.
+
+    Each skill keeps a sorted ``array`` of candidate ids. The index is built
+    on first use with one query, then kept current from CandidateSkill saves
+    and deletes: every committed change gets the next number of a sequence
+    in the shared cache plus a log entry under that number, and before each
+    match a process replays the entries it has not seen (the same scheme as
+    TwoTierCache's invalidation messages). When entries are missing the
+    index is rebuilt instead.
+    """
+    LOG_TIMEOUT = 60 * 60
+    cache_alias = 'shared'
+
+    _postings = None
+    _seen_sequence = None
+    _lock = threading.RLock()
+
+    @classmethod
+    def _cache(cls):
+        return caches[cls.cache_alias]
+
+    @classmethod
+    def match(cls, skill_ids):
+        """
+        Candidates having any of ``skill_ids``, each mapped to the list of
+        those skills they have, in the order of ``skill_ids``.
+        """
+        cls.sync()
+        matches = {}
+        with cls._lock:
+            for skill_id in dict.fromkeys(skill_ids):
+                for candidate_id in cls._postings.get(skill_id, ()):
+                    matches.setdefault(candidate_id, []).append(skill_id)
+        return matches
+
+    @classmethod
+    def sync(cls):
+        """Catch up with the changes made since the last call, in any process"""
+        shared = cls._cache()
+        sequence = shared.get(SEQUENCE_KEY)
+        if sequence is None:
+            shared.add(SEQUENCE_KEY, int(time.time() * 1000), timeout=None)
+            sequence = shared.get(SEQUENCE_KEY)
+
+        with cls._lock:
+            seen = cls._seen_sequence
+            if cls._postings is not None and sequence == seen:
+                return
+            if cls._postings is None or seen is None or not 0 < sequence - seen <= MAX_REPLAY:
+                cls.rebuild(sequence)
+                return
+
+            log_keys = [LOG_KEY.format(number) for number in range(seen + 1, sequence + 1)]
+            logs = shared.get_many(log_keys)
+            if len(logs) < len(log_keys):
+                cls.rebuild(sequence)
+                return
+            for key in log_keys:
+                for added, skill_id, candidate_id in logs[key]:
+                    cls._apply(added, skill_id, candidate_id)
+            cls._seen_sequence = sequence
+
+    @classmethod
+    def rebuild(cls, sequence):
+        """
+        Load the index from the database. ``sequence`` must be read before
+        the query: later changes are replayed on top, which is harmless for
+        the ones the query already saw.
+        """
+        postings = {}
+        rows = CandidateSkill.objects.order_by('skill_id', 'candidate_id').values_list('skill_id', 'candidate_id')
+        for skill_id, candidate_id in rows.iterator(chunk_size=10000):
+            postings.setdefault(skill_id, array('q')).append(candidate_id)
+        with cls._lock:
+            cls._postings = postings
+            cls._seen_sequence = sequence
+
+    @classmethod
+    def _apply(cls, added, skill_id, candidate_id):
+        candidates = cls._postings.setdefault(skill_id, array('q'))
+        position = bisect_left(candidates, candidate_id)
+        present = position < len(candidates) and candidates[position] == candidate_id
+        if added and not present:
+            candidates.insert(position, candidate_id)
+        elif not added and present:
+            del candidates[position]
+
+    @classmethod
+    def record(cls, changes):
+        """
+        Publish ``(added, skill_id, candidate_id)`` changes once the current
+        transaction commits, so rolled back changes never reach the index.
+        """
+        def publish():
+            shared = cls._cache()
+            try:
+                sequence = shared.incr(SEQUENCE_KEY)
+            except ValueError:
+                shared.add(SEQUENCE_KEY, int(time.time() * 1000), timeout=None)
+                sequence = shared.incr(SEQUENCE_KEY)
+            shared.set(LOG_KEY.format(sequence), list(changes), timeout=cls.LOG_TIMEOUT)
+
+        transaction.on_commit(publish)
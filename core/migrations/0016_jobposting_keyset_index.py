@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_alter_address_user'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='jobposting',
+            name='core_jobpos_status_c95cf7_idx',
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'is_active', 'posted_at', 'id'], name='core_jobpos_status_498400_idx'),
+        ),
+    ]
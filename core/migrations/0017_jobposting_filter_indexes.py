@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_jobposting_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['employment_type', 'experience_level'], name='core_jobpos_employm_6faa94_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['experience_level'], name='core_jobpos_experie_6b4ac4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['country', 'city'], name='core_jobpos_country_4d5ee9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['salary_min'], name='core_jobpos_salary__749283_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['salary_max'], name='core_jobpos_salary__0a8dee_idx'),
+        ),
+    ]
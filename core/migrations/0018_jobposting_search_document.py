@@ -0,0 +1,69 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:06
+
+from django.db import migrations, models
+
+FTS_TABLE = 'core_jobposting_fts'
+
+
+def build_search_document(job):
+    parts = [job.title, job.description]
+    for value in (job.requirements, job.responsibilities):
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(item) for item in value)
+        elif value:
+            parts.append(str(value))
+    return '\n'.join(part for part in parts if part)
+
+
+def create_search_index(apps, schema_editor):
+    JobPosting = apps.get_model('core', 'JobPosting')
+    connection = schema_editor.connection
+
+    # Backfill the document for existing postings
+    for job in JobPosting.objects.only(
+        'id', 'title', 'description', 'requirements', 'responsibilities'
+    ).iterator(chunk_size=500):
+        JobPosting.objects.filter(pk=job.pk).update(search_document=build_search_document(job))
+
+    if connection.vendor == 'mysql':
+        schema_editor.execute(
+            'ALTER TABLE core_jobposting '
+            'ADD FULLTEXT INDEX core_jobpos_title_ft (title), '
+            'ADD FULLTEXT INDEX core_jobpos_search_ft (search_document)'
+        )
+    elif connection.vendor == 'sqlite':
+        # FTS5 stands in for FULLTEXT locally; JobPosting signals keep it in sync
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, document, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, document) '
+            f'SELECT id, title, search_document FROM core_jobposting'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'mysql':
+        schema_editor.execute(
+            'ALTER TABLE core_jobposting '
+            'DROP INDEX core_jobpos_title_ft, DROP INDEX core_jobpos_search_ft'
+        )
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_jobposting_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_jobposting_search_document'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'is_active', 'updated_at'], name='core_jobpos_status_e75257_idx'),
+        ),
+    ]
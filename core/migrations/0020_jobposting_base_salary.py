@@ -0,0 +1,66 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:16
+
+import django.core.validators
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_base_salaries(apps, schema_editor):
+    # No rates are loaded yet, so only jobs already in the base currency can
+    # be normalized; load_exchange_rates fills in the rest
+    JobPosting = apps.get_model('core', 'JobPosting')
+    JobPosting.objects.filter(currency=settings.SALARY_BASE_CURRENCY).update(
+        salary_min_base=models.F('salary_min'),
+        salary_max_base=models.F('salary_max'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_jobposting_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('currency', models.CharField(max_length=3, unique=True)),
+                ('rate', models.DecimalField(decimal_places=8, max_digits=18, validators=[django.core.validators.MinValueValidator(0)])),
+            ],
+            options={
+                'ordering': ['currency'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='jobposting',
+            name='core_jobpos_salary__749283_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='jobposting',
+            name='core_jobpos_salary__0a8dee_idx',
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_max_base',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_min_base',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['salary_min_base'], name='core_jobpos_salary__bfb078_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['salary_max_base'], name='core_jobpos_salary__550c61_idx'),
+        ),
+        migrations.RunPython(backfill_base_salaries, migrations.RunPython.noop),
+    ]
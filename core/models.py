@@ -1,10 +1,14 @@
 from cryptography.hazmat.primitives.ciphers.algorithms import Camellia
+from decimal import ROUND_HALF_UP, Decimal
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator, ValidationError
+from django.utils import timezone
 from django.utils.text import slugify
 from .static_backend import PublicMediaStorage, PrivateMediaStorage
+from .geo import Gazetteer
 
 class UserManager(BaseUserManager):
     use_in_migrations = True
@@ -204,13 +208,20 @@ class Skill(BaseModel):
 
 class CandidateSkill(BaseModel):
     candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name='candidate_skills')
-    skill = models.ManyToManyField(Skill, related_name='candidate_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='candidate_skills')
 
     class Meta:
         verbose_name = _('Candidate Skill')
         verbose_name_plural = _('Candidate Skills')
         unique_together = ('candidate', 'skill')
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded pair so signals can tell when it changes
+        instance._loaded_pair = (instance.__dict__.get('skill_id'), instance.__dict__.get('candidate_id'))
+        return instance
+
     def __str__(self):
         return f"{self.candidate.user.get_full_name()} - {self.skill.name}"
 
@@ -263,14 +274,35 @@ class EmployerProfile(BaseModel):
     postal_code = models.CharField(max_length=20, blank=True)
     phone = models.CharField(max_length=20, blank=True)
     contact_email = models.EmailField(blank=True)
+    # Geocoded from city/state/country against the bundled gazetteer
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     
     # Verification``
     is_verified = models.BooleanField(default=False)
     verified_at = models.DateTimeField(null=True, blank=True)
 
+    LOCATION_FIELDS = ['city', 'state', 'country']
+
     class Meta:
         verbose_name = 'Employer Profile'
         verbose_name_plural = 'Employer Profiles'
+        indexes = [
+            models.Index(fields=['latitude', 'longitude']),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.LOCATION_FIELDS):
+            self.update_coordinates()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'latitude', 'longitude'}
+        super().save(*args, **kwargs)
+
+    def update_coordinates(self):
+        """Geocode the company location against the bundled gazetteer"""
+        coordinates = Gazetteer.geocode(self.city, self.state, self.country)
+        self.latitude, self.longitude = coordinates or (None, None)
 
     def verified(self):
         return self.is_verified
@@ -341,6 +373,36 @@ class Category(BaseModel):
         return self.name
 
 
+class ExchangeRate(BaseModel):
+    """
+    Locally loaded exchange rates used to normalize job salaries.
+    ``rate`` is the value of one unit of ``currency`` in SALARY_BASE_CURRENCY.
+    """
+    currency = models.CharField(max_length=3, unique=True)
+    rate = models.DecimalField(max_digits=18, decimal_places=8, validators=[MinValueValidator(0)])
+
+    class Meta:
+        ordering = ['currency']
+
+    def __str__(self):
+        return f"{self.currency} = {self.rate} {settings.SALARY_BASE_CURRENCY}"
+
+    @classmethod
+    def get_rate(cls, currency):
+        """Return the rate for ``currency``, or None when it is not loaded"""
+        currency = (currency or '').upper()
+        if currency == settings.SALARY_BASE_CURRENCY:
+            return Decimal(1)
+        return cls.objects.filter(currency=currency, is_active=True).values_list('rate', flat=True).first()
+
+    @staticmethod
+    def convert(amount, rate):
+        if amount is None or rate is None:
+            return None
+        # Half up, like SQL's ROUND() in SalaryService.recompute_base_salaries
+        return (amount * rate).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
 class JobPosting(BaseModel):
     class EmploymentType(models.TextChoices):
         FULL_TIME = 'FULL_TIME', _('Full-time')
@@ -404,12 +466,19 @@ class JobPosting(BaseModel):
     )
     currency = models.CharField(max_length=3, default='USD')
     is_salary_disclosed = models.BooleanField(default=False)
+    # Salary range in SALARY_BASE_CURRENCY, kept in sync on save and when
+    # exchange rates change; salary range filters use these columns
+    salary_min_base = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    salary_max_base = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
     
     # Location
     location = models.CharField(max_length=200, blank=True)
     city = models.CharField(max_length=100, blank=True)
     state = models.CharField(max_length=100, blank=True)
     country = models.CharField(max_length=100, blank=True)
+    # Geocoded from city/state/country against the bundled gazetteer
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     
     # Categories
     categories = models.ManyToManyField(Category, related_name='jobs', blank=True)
@@ -417,6 +486,7 @@ class JobPosting(BaseModel):
     # Skills
     required_skills = models.ManyToManyField(
         Skill,
+        through='JobSkill',
         related_name='required_for_jobs'
     )
     
@@ -431,14 +501,29 @@ class JobPosting(BaseModel):
     posted_at = models.DateTimeField(null=True, blank=True)
     expires_at = models.DateTimeField(null=True, blank=True)
 
+    # Denormalized text of the searchable fields, backing the full-text index
+    search_document = models.TextField(blank=True, editable=False)
+
+    SEARCH_FIELDS = ['title', 'description', 'requirements', 'responsibilities']
+    SALARY_FIELDS = ['salary_min', 'salary_max', 'currency']
+    LOCATION_FIELDS = ['city', 'state', 'country']
+
     class Meta:
         verbose_name = 'Job Posting'
         verbose_name_plural = 'Job Postings'
         ordering = ['-posted_at']
         indexes = [
-            models.Index(fields=['status', 'is_active']),
+            # Also serves the (-posted_at, -id) keyset ordering of the job list
+            models.Index(fields=['status', 'is_active', 'posted_at', 'id']),
+            models.Index(fields=['status', 'is_active', 'updated_at']),
             models.Index(fields=['job_type', 'experience_level']),
+            models.Index(fields=['employment_type', 'experience_level']),
+            models.Index(fields=['experience_level']),
             models.Index(fields=['city', 'country']),
+            models.Index(fields=['country', 'city']),
+            models.Index(fields=['latitude', 'longitude']),
+            models.Index(fields=['salary_min_base']),
+            models.Index(fields=['salary_max_base']),
         ]
 
 
@@ -447,6 +532,65 @@ class JobPosting(BaseModel):
             if self.salary_max < self.salary_min:
                 raise ValidationError("Maximum salary cannot be less than minimum salary.")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded status so signals can tell when it changes
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            # Partial saves (e.g. applications_count) still change what the
+            # API shows, so they must move the updated_at validator too
+            update_fields = {*update_fields, 'updated_at'}
+
+        # Keep the derived columns in step with the fields they come from
+        for sources, refresh, derived in (
+            (self.SEARCH_FIELDS, self.update_search_document, ['search_document']),
+            (self.SALARY_FIELDS, self.update_base_salary, ['salary_min_base', 'salary_max_base']),
+            (self.LOCATION_FIELDS, self.update_coordinates, ['latitude', 'longitude']),
+        ):
+            if update_fields is None or update_fields & set(sources):
+                refresh()
+                if update_fields is not None:
+                    update_fields |= set(derived)
+
+        if update_fields is not None:
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
+    def update_search_document(self):
+        self.search_document = self.get_search_document()
+
+    def update_base_salary(self):
+        """Convert the salary range into SALARY_BASE_CURRENCY"""
+        rate = ExchangeRate.get_rate(self.currency)
+        self.salary_min_base = ExchangeRate.convert(self.salary_min, rate)
+        self.salary_max_base = ExchangeRate.convert(self.salary_max, rate)
+
+    def update_coordinates(self):
+        """Geocode the job's location; a job without one inherits its employer's"""
+        if self.city or self.state or self.country:
+            coordinates = Gazetteer.geocode(self.city, self.state, self.country)
+        elif self.employer_id:
+            coordinates = (self.employer.latitude, self.employer.longitude)
+        else:
+            coordinates = None
+        self.latitude, self.longitude = coordinates or (None, None)
+
+    def get_search_document(self):
+        """Flatten the searchable fields, including the JSON lists, into plain text"""
+        parts = [self.title, self.description]
+        for field in ('requirements', 'responsibilities'):
+            value = getattr(self, field) or []
+            if isinstance(value, (list, tuple)):
+                parts.extend(str(item) for item in value)
+            else:
+                parts.append(str(value))
+        return '\n'.join(part for part in parts if part)
+
     def __str__(self):
         return f"{self.title} - {self.employer.company_name}"
 
@@ -584,6 +728,18 @@ class JobAlert(BaseModel):
     def __str__(self):
         return f"{self.candidate.user.get_full_name()} - {self.alert_name}"
 
+    @classmethod
+    def matching_salary(cls, job):
+        """
+        Active alerts whose ``salary_min`` (in SALARY_BASE_CURRENCY) the job's
+        normalized range reaches. Jobs without a known salary only match
+        alerts that set no minimum.
+        """
+        condition = models.Q(salary_min__isnull=True)
+        if job.salary_max_base is not None:
+            condition |= models.Q(salary_min__lte=job.salary_max_base)
+        return cls.objects.filter(condition, is_active=True)
+
 class JobNotification(BaseModel):
     """Track which job postings have been sent to which candidates"""
     candidate = models.ForeignKey(
@@ -668,4 +824,41 @@ class Notification(BaseModel):
         if not self.is_read:
             self.is_read = True
             self.read_at = models.functions.Now()
-            self.save(update_fields=['is_read', 'read_at'])
\ No newline at end of file
+            self.save(update_fields=['is_read', 'read_at'])
+
+class Task(BaseModel):
+    """
+    Background work queued in the database and run by the run_worker command.
+    ``name`` is a function registered with ``core.tasks.task``, called with
+    ``payload`` as keyword arguments.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', _('Pending')
+        RUNNING = 'RUNNING', _('Running')
+        DONE = 'DONE', _('Done')
+        FAILED = 'FAILED', _('Failed')
+
+    name = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    # Not run before this; moved forward on each retry
+    run_at = models.DateTimeField(default=timezone.now)
+    # While running, the worker's claim expires at this time and the task
+    # can be claimed again (the worker is assumed dead)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = 'Task'
+        verbose_name_plural = 'Tasks'
+        indexes = [
+            # Claiming: due pending tasks, and running ones whose claim expired
+            models.Index(fields=['status', 'run_at']),
+            models.Index(fields=['status', 'locked_until']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
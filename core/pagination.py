@@ -0,0 +1,180 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class JobCursorPagination(BasePagination):
+    """
+    Keyset pagination for job listings ordered by (-posted_at, -id).
+
+    Pages are fetched by seeking past the last row of the previous page
+    instead of using OFFSET, so deep pages cost the same as the first one
+    and jobs published while a client is paging never shift the results.
+    Cursors are opaque base64 tokens; clients should only echo them back.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor and 'offset' in self.cursor:
+            raise NotFound(self.invalid_cursor_message)
+
+        reverse = bool(self.cursor and self.cursor['reverse'])
+        if reverse:
+            ordering = [F('posted_at').asc(nulls_first=True), F('id').asc()]
+        else:
+            ordering = [F('posted_at').desc(nulls_last=True), F('id').desc()]
+        queryset = queryset.order_by(*ordering)
+
+        if self.cursor:
+            queryset = queryset.filter(
+                self._seek_filter(self.cursor['posted_at'], self.cursor['id'], reverse)
+            )
+
+        # Fetch one extra row to find out whether another page follows
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = results
+        self.offset = None
+        return results
+
+    def paginate_ranked_ids(self, ranked_ids, request):
+        """
+        Paginate an already ranked list of job ids, such as search results.
+        The list is bounded by JOB_SEARCH_MAX_RESULTS, so here the cursor
+        simply carries an offset into it.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor and 'offset' not in self.cursor:
+            raise NotFound(self.invalid_cursor_message)
+
+        self.offset = self.cursor['offset'] if self.cursor else 0
+        self.page = ranked_ids[self.offset:self.offset + self.page_size]
+        self.has_next = self.offset + self.page_size < len(ranked_ids)
+        self.has_previous = self.offset > 0
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_page_size(self, request):
+        """Return the requested page size, capped at JOB_LIST_MAX_PAGE_SIZE"""
+        page_size = settings.JOB_LIST_PAGE_SIZE
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+        if requested > 0:
+            page_size = requested
+        return min(page_size, settings.JOB_LIST_MAX_PAGE_SIZE)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        if self.offset is not None:
+            return self.encode_payload({'o': self.offset + self.page_size})
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        if self.offset is not None:
+            return self.encode_payload({'o': max(self.offset - self.page_size, 0)})
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, item, reverse):
+        """Build the URL pointing at the page after (or before) ``item``"""
+        posted_at = self._get_position(item, 'posted_at')
+        return self.encode_payload({
+            'p': posted_at.isoformat() if posted_at else None,
+            'i': self._get_position(item, 'id'),
+            'r': int(reverse),
+        })
+
+    def encode_payload(self, payload):
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode('ascii')
+        ).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        """Return the decoded cursor from the request, or None for the first page"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            if 'o' in payload:
+                offset = int(payload['o'])
+                if offset < 0:
+                    raise ValueError
+                return {'offset': offset}
+            posted_at = parse_datetime(payload['p']) if payload['p'] else None
+            if payload['p'] and posted_at is None:
+                raise ValueError
+            cursor = {
+                'posted_at': posted_at,
+                'id': int(payload['i']),
+                'reverse': bool(payload.get('r')),
+            }
+        except (TypeError, KeyError, ValueError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        return cursor
+
+    @staticmethod
+    def _get_position(item, field):
+        if isinstance(item, dict):
+            return item[field]
+        return getattr(item, field)
+
+    @staticmethod
+    def _seek_filter(posted_at, job_id, reverse):
+        """
+        Rows strictly after (posted_at, id) in the current ordering.
+        Jobs without posted_at sort last, matching NULL ordering on MySQL.
+        """
+        if reverse:
+            if posted_at is None:
+                return Q(posted_at__isnull=True, id__gt=job_id) | Q(posted_at__isnull=False)
+            return Q(posted_at__gt=posted_at) | Q(posted_at=posted_at, id__gt=job_id)
+
+        if posted_at is None:
+            return Q(posted_at__isnull=True, id__lt=job_id)
+        return (
+            Q(posted_at__lt=posted_at)
+            | Q(posted_at=posted_at, id__lt=job_id)
+            | Q(posted_at__isnull=True)
+        )
@@ -0,0 +1,29 @@
+import codecs
+import io
+
+from django.conf import settings
+from rest_framework import parsers
+
+from .renderers import JSONRenderer, orjson
+
+
+class JSONParser(parsers.JSONParser):
+    """
+    DRF's JSONParser, decoding UTF-8 bodies with orjson when it is installed.
+
+    orjson is at least as strict as the stdlib parser (no NaN or Infinity,
+    64-bit integers), so anything it rejects is parsed again by DRF's
+    parser, which returns the same data or the same ParseError as before.
+    """
+    renderer_class = JSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        content = stream.read()
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(content), media_type, parser_context)
@@ -0,0 +1,59 @@
+import re
+
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - the stdlib renderer takes over
+    orjson = None
+
+# orjson writes some floats differently from repr() (1e-7 vs 1e-07,
+# 0.00001 vs 1e-05); any output that may hold one is rendered again by json.
+# FLOAT_FORMATS matches those number tokens, but scanning every payload with
+# it costs as much as rendering, so cheaper checks that start with a literal
+# go first.
+FLOAT_FORMATS = re.compile(rb'(?:^|[:,\[])-?(?:\d+(?:\.\d+)?e|0\.0000)')
+EXPONENTS = re.compile(rb'e[-\d]')
+
+
+def may_differ_from_repr(content):
+    if b'0.0000' in content:
+        return bool(FLOAT_FORMATS.search(content))
+    for match in EXPONENTS.finditer(content):
+        if content[match.start() - 1:match.start()].isdigit():
+            return bool(FLOAT_FORMATS.search(content))
+    return False
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    DRF's JSONRenderer, encoding with orjson when it is installed.
+
+    The output is byte for byte what DRF's renderer produces: datetimes,
+    dates and times go through DRF's encoder, as do Decimals, lazy strings
+    and everything else orjson does not know. Whenever orjson cannot match
+    it (an indent, non-compact or ASCII-only settings, non-str keys, huge
+    integers, floats in exponent notation) the stdlib renderer is used. One
+    difference remains: NaN and infinity become null instead of raising.
+    """
+    options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if orjson is not None else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact or \
+                self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            content = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if may_differ_from_repr(content):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict JavaScript subset, like DRF does
+        if b'\xe2\x80' in content:
+            content = content.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return content
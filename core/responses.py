@@ -0,0 +1,76 @@
+import gzip
+import json
+import re
+
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+accepts_gzip = re.compile(r'\bgzip\b')
+
+
+class PrerenderedResponse(Response):
+    """
+    Response for a body encoded ahead of time, typically taken from the cache.
+
+    ``encode()`` renders data once with the project's JSON renderer and keeps
+    a gzipped copy of larger bodies. When the negotiated renderer is that
+    same JSON renderer without an ``indent`` the stored bytes are sent as
+    they are, gzipped if the client accepts it; any other renderer (e.g. the
+    browsable API) gets the decoded data and renders it as usual.
+    """
+    GZIP_MIN_LENGTH = 1024
+
+    @staticmethod
+    def renderer_class():
+        for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES:
+            if renderer_class.format == 'json':
+                return renderer_class
+        return JSONRenderer
+
+    @classmethod
+    def encode(cls, data):
+        """Encoded body for ``data``, or None for None"""
+        if data is None:
+            return None
+        content = cls.renderer_class()().render(data)
+        gzipped = None
+        if len(content) >= cls.GZIP_MIN_LENGTH:
+            gzipped = gzip.compress(content, compresslevel=6, mtime=0)
+        return {'content': content, 'gzip': gzipped}
+
+    def __init__(self, body, status=None, headers=None):
+        super().__init__(status=status, headers=headers)
+        self.body = body
+
+    @property
+    def data(self):
+        if self._data is None and getattr(self, 'body', None) is not None:
+            self._data = json.loads(self.body['content'])
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def rendered_content(self):
+        renderer = getattr(self, 'accepted_renderer', None)
+        if type(renderer) is not self.renderer_class() or \
+                renderer.get_indent(self.accepted_media_type, self.renderer_context) is not None:
+            return super().rendered_content
+
+        self['Content-Type'] = renderer.media_type
+        if self.body['gzip'] is None:
+            return self.body['content']
+
+        patch_vary_headers(self, ('Accept-Encoding',))
+        request = self.renderer_context.get('request')
+        if request is None or not accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            return self.body['content']
+        self['Content-Encoding'] = 'gzip'
+        # The gzipped body is a different representation of the same resource
+        if self.has_header('ETag') and not self['ETag'].startswith('W/'):
+            self['ETag'] = 'W/' + self['ETag']
+        return self.body['gzip']
@@ -0,0 +1,192 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+FTS_TABLE = 'core_jobposting_fts'
+MAX_QUERY_TERMS = 10
+
+# Whether each SQLite database has the FTS5 table, by (alias, name). It comes
+# with a migration, so one catalog query per database and process will do
+_fts_tables = {}
+
+
+class JobSearch:
+    """
+    Full-text search over job postings.
+
+    MySQL answers queries from the FULLTEXT indexes on ``title`` and
+    ``search_document``; SQLite (local development) uses an FTS5 table kept
+    in sync by the JobPosting signals. Other databases fall back to a plain
+    substring match. Results are ranked by text relevance blended with an
+    exponential recency decay on ``posted_at``.
+    """
+
+    @staticmethod
+    def terms(query):
+        """Split a free-text query into plain word tokens"""
+        return re.findall(r'\w+', query.lower())[:MAX_QUERY_TERMS]
+
+    @classmethod
+    def ranked_ids(cls, queryset, query):
+        """Return ids from ``queryset`` matching ``query``, best match first"""
+        terms = cls.terms(query)
+        if not terms:
+            return []
+
+        if connection.vendor == 'mysql':
+            rows = cls._mysql_matches(queryset, terms)
+        elif connection.vendor == 'sqlite' and cls.fts_enabled():
+            rows = cls._sqlite_matches(queryset, terms)
+        else:
+            rows = cls._fallback_matches(queryset, terms)
+
+        return [job_id for job_id, _ in cls.rank(rows)]
+
+    @classmethod
+    def filter(cls, queryset, query):
+        """
+        Restrict ``queryset`` to every job matching ``query``, unranked and
+        without the JOB_SEARCH_MAX_RESULTS cap, e.g. for counting matches
+        """
+        terms = cls.terms(query)
+        if not terms:
+            return queryset.none()
+
+        if connection.vendor == 'mysql':
+            return queryset.alias(
+                document_relevance=RawSQL(
+                    'MATCH (search_document) AGAINST (%s IN NATURAL LANGUAGE MODE)', (' '.join(terms),)
+                ),
+            ).filter(document_relevance__gt=0)
+        if connection.vendor == 'sqlite' and cls.fts_enabled():
+            return queryset.filter(id__in=RawSQL(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (cls._fts_match(terms),)
+            ))
+        return queryset.filter(cls._fallback_condition(terms))
+
+    @staticmethod
+    def rank(rows):
+        """
+        Blend relevance with recency. ``rows`` holds (id, posted_at, relevance)
+        tuples; relevance is normalized to the best match so the blend does
+        not depend on the backend's scoring scale.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+
+        now = timezone.now()
+        weight = settings.JOB_SEARCH_RECENCY_WEIGHT
+        half_life = settings.JOB_SEARCH_RECENCY_HALF_LIFE_DAYS
+        best = max(relevance for _, _, relevance in rows) or 1
+
+        scored = []
+        for job_id, posted_at, relevance in rows:
+            recency = 0.0
+            if posted_at:
+                age_days = max((now - posted_at).total_seconds(), 0) / 86400
+                recency = 0.5 ** (age_days / half_life)
+            score = (1 - weight) * (relevance / best) + weight * recency
+            scored.append((job_id, score))
+
+        scored.sort(key=lambda row: (-row[1], -row[0]))
+        return scored
+
+    @staticmethod
+    def _mysql_matches(queryset, terms):
+        query = ' '.join(terms)
+        matches = (
+            queryset
+            .annotate(
+                document_relevance=RawSQL(
+                    'MATCH (search_document) AGAINST (%s IN NATURAL LANGUAGE MODE)', (query,)
+                ),
+                title_relevance=RawSQL(
+                    'MATCH (title) AGAINST (%s IN NATURAL LANGUAGE MODE)', (query,)
+                ),
+            )
+            .filter(document_relevance__gt=0)
+            .order_by('-document_relevance')
+            .values_list('id', 'posted_at', 'document_relevance', 'title_relevance')
+        )
+        # Title matches weigh twice as much as body matches
+        return [
+            (job_id, posted_at, document_relevance + 2 * title_relevance)
+            for job_id, posted_at, document_relevance, title_relevance
+            in matches[:settings.JOB_SEARCH_MAX_RESULTS]
+        ]
+
+    @staticmethod
+    def _fts_match(terms):
+        return ' OR '.join(f'"{term}"*' for term in terms)
+
+    @classmethod
+    def _sqlite_matches(cls, queryset, terms):
+        # The FTS table holds every job; only the queryset's may take up the
+        # JOB_SEARCH_MAX_RESULTS slots
+        ids_sql, ids_params = queryset.order_by().values('id').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                # Title matches weigh twice as much as body matches
+                f'SELECT rowid, bm25({FTS_TABLE}, 2.0, 1.0) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid IN ({ids_sql}) '
+                f'ORDER BY bm25({FTS_TABLE}, 2.0, 1.0) LIMIT %s',
+                [cls._fts_match(terms), *ids_params, settings.JOB_SEARCH_MAX_RESULTS],
+            )
+            # bm25() is negative, lower meaning more relevant
+            relevance = {job_id: -score for job_id, score in cursor.fetchall()}
+
+        return [
+            (job_id, posted_at, relevance[job_id])
+            for job_id, posted_at in queryset.filter(id__in=relevance).values_list('id', 'posted_at')
+        ]
+
+    @staticmethod
+    def _fallback_condition(terms):
+        condition = Q()
+        for term in terms:
+            condition |= Q(title__icontains=term) | Q(search_document__icontains=term)
+        return condition
+
+    @classmethod
+    def _fallback_matches(cls, queryset, terms):
+        rows = []
+        matches = queryset.filter(cls._fallback_condition(terms)).values_list('id', 'posted_at', 'title', 'search_document')
+        for job_id, posted_at, title, document in matches[:settings.JOB_SEARCH_MAX_RESULTS]:
+            title, document = title.lower(), document.lower()
+            relevance = sum(2 * (term in title) + (term in document) for term in terms)
+            rows.append((job_id, posted_at, relevance))
+        return rows
+
+    # Index maintenance (only needed for the SQLite FTS5 table)
+
+    @staticmethod
+    def fts_enabled():
+        if connection.vendor != 'sqlite':
+            return False
+        database = (connection.alias, connection.settings_dict['NAME'])
+        if database not in _fts_tables:
+            _fts_tables[database] = FTS_TABLE in connection.introspection.table_names()
+        return _fts_tables[database]
+
+    @classmethod
+    def index_job(cls, job):
+        if not cls.fts_enabled():
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job.id])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, document) VALUES (%s, %s, %s)',
+                [job.id, job.title, job.search_document],
+            )
+
+    @classmethod
+    def remove_job(cls, job_id):
+        if not cls.fts_enabled():
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job_id])
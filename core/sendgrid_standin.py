@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class SendGridStandIn:
+    """
+    Local HTTP server answering like SendGrid's mail send endpoint, for tests
+    and benchmarks. Point ``SENDGRID_API_URL`` at ``url``.
+
+    Accepted payloads are kept in ``messages``. ``latency`` adds seconds to
+    every answer and ``fail_every`` makes every n-th request a 503, to
+    exercise retries.
+
+        with SendGridStandIn(latency=0.05) as standin:
+            with override_settings(SENDGRID_API_URL=standin.url):
+                ...
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, fail_every=0):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.messages = []
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/v3/mail/send'
+
+    @property
+    def recipients(self):
+        with self._lock:
+            return [
+                personalization['to'][0]['email']
+                for message in self.messages
+                for personalization in message['personalizations']
+            ]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _receive(self, headers, body):
+        """Status and body of the answer to one request"""
+        with self._lock:
+            self.requests += 1
+            number = self.requests
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_every and number % self.fail_every == 0:
+            return 503, {'errors': [{'message': 'Service unavailable'}]}
+        if not headers.get('Authorization', '').startswith('Bearer '):
+            return 401, {'errors': [{'message': 'Authorization required'}]}
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400, {'errors': [{'message': 'Invalid JSON'}]}
+        personalizations = payload.get('personalizations') or []
+        if not 0 < len(personalizations) <= 1000:
+            return 400, {'errors': [{'message': 'Between 1 and 1000 personalizations are allowed'}]}
+        if not payload.get('content') or not payload.get('subject'):
+            return 400, {'errors': [{'message': 'Subject and content are required'}]}
+        with self._lock:
+            self.messages.append(payload)
+        return 202, None
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, like the real API, so pooled connections get reused
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                status, answer = standin._receive(self.headers, body)
+                data = json.dumps(answer).encode() if answer is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -2,12 +2,14 @@ from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.db import transaction
+from django.db.models import Prefetch
 from .models import (
     User, Application, JobPosting, CandidateProfile, 
     EmployerProfile, CandidateSkill, Education, 
     Certification, Address, Skill, Notification, 
     CompanyReview, JobSkill, Category
 )
+from .services import JobCardService
 import os
 from django.utils import timezone
 
@@ -146,6 +148,7 @@ class JobSkillSerializer(serializers.ModelSerializer):
     """Serializer for job skills"""
     skill = SkillSerializer(read_only=True)
     skill_id = serializers.IntegerField(write_only=True)
+    minimum_experience = serializers.IntegerField(source='minimum_years', required=False, allow_null=True)
     
     class Meta:
         model = JobSkill
@@ -199,6 +202,14 @@ class JobPostingSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['applications_count', 'posted_at', 'created_at', 'updated_at']
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load everything the read fields touch in a fixed number of queries"""
+        return queryset.select_related('employer').prefetch_related(
+            Prefetch('categories', queryset=Category.objects.select_related('parent')),
+            Prefetch('required_skills', queryset=Skill.objects.only('id')),
+        )
+
     def get_employer_logo(self, obj):
         """Get employer logo URL"""
         if obj.employer and obj.employer.logo:
@@ -314,7 +325,7 @@ class GetJobSerializer(serializers.ModelSerializer):
     
     # Nested fields
     categories = CategorySerializer(many=True, read_only=True)
-    required_skills = JobSkillSerializer(many=True, read_only=True, source='jobskill_set')
+    required_skills = JobSkillSerializer(many=True, read_only=True, source='job_skills')
     
     # Location display
     location_display = serializers.SerializerMethodField()
@@ -339,6 +350,14 @@ class GetJobSerializer(serializers.ModelSerializer):
             'posted_at', 'expires_at', 'created_at', 'updated_at'
         ]
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load the employer, categories and skills alongside the job"""
+        return queryset.select_related('employer').prefetch_related(
+            Prefetch('categories', queryset=Category.objects.select_related('parent')),
+            Prefetch('job_skills', queryset=JobSkill.objects.select_related('skill')),
+        )
+
     def get_employer(self, obj):
         """Get employer information"""
         return {
@@ -351,30 +370,13 @@ class GetJobSerializer(serializers.ModelSerializer):
     
     def get_location_display(self, obj):
         """Get formatted location string"""
-        location_parts = []
-        if obj.city:
-            location_parts.append(obj.city)
-        if obj.state:
-            location_parts.append(obj.state)
-        if obj.country:
-            location_parts.append(obj.country)
-        
-        if location_parts:
-            return ', '.join(location_parts)
-        return obj.location or 'Remote'
+        return JobCardService.format_location(obj.city, obj.state, obj.country, obj.location)
     
     def get_salary_range(self, obj):
         """Get formatted salary range"""
-        if not obj.is_salary_disclosed:
-            return None
-        
-        if obj.salary_min and obj.salary_max:
-            return f"{obj.currency} {obj.salary_min:,.0f} - {obj.salary_max:,.0f}"
-        elif obj.salary_min:
-            return f"{obj.currency} {obj.salary_min:,.0f}+"
-        elif obj.salary_max:
-            return f"Up to {obj.currency} {obj.salary_max:,.0f}"
-        return None
+        return JobCardService.format_salary_range(
+            obj.salary_min, obj.salary_max, obj.currency, obj.is_salary_disclosed
+        )
 
 
 class CandidateSkillSerializer(serializers.ModelSerializer):
@@ -475,6 +477,7 @@ class CandidateProfileSerializer(serializers.ModelSerializer):
         fields = [
             # Read-only display fields
             'picture', 'name', 'email', 'social_links', 'resume_url',
+            'profile_completion', 'is_profile_complete',
             # Writable fields
             'phone', 'gender', 'date_of_birth', 'headline', 'about',
             'linkedin', 'github', 'twitter', 'website',
@@ -490,13 +493,13 @@ class CandidateProfileSerializer(serializers.ModelSerializer):
             'about': {'required': False},
         }
 
-    def get_profile_completion_percentage(self, obj):
+    def get_profile_completion(self, obj):
         """Return the profile completion precentage"""
         return obj.get_profile_completion_percentage()
 
-    def is_profile_complete(self, obj):
+    def get_is_profile_complete(self, obj):
         """Return True if the profile is completed or False otherwise"""
-        return obj.is_profile_complete()
+        return obj.is_profile_complete
 
     def get_picture(self, obj):
         """Gets picture"""
@@ -609,6 +612,7 @@ class EmployerProfileSerializer(serializers.ModelSerializer):
         fields = [
             # Read-only fields
             'id', 'name', 'email', 'company_logo_url', 'is_verified',
+            'profile_completion', 'is_profile_complete',
             # Writable fields
             'company_name', 'logo', 'industry', 'city', 'country', 
             'description', 'website_url', 'linkedin_url'
@@ -633,9 +637,9 @@ class EmployerProfileSerializer(serializers.ModelSerializer):
         """Return profile complete percentage"""
         return obj.get_profile_completion_percentage()
 
-    def is_complete(self, obj):
+    def get_is_profile_complete(self, obj):
         """Return True if profile is complete or False if otherwise"""
-        return obj.is_profile_complete()
+        return obj.is_profile_complete
 
     def validate_logo(self, value):
         """Validate company logo"""
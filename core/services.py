@@ -1,7 +1,16 @@
+import time
+from decimal import Decimal
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+from django.db.models.functions import Coalesce, Now, Round
 from rest_framework.exceptions import NotFound
+from .caching import CacheTags, ComputedCache
+from .responses import PrerenderedResponse
 from .models import (
     Application, Notification, SavedJob, 
-    CandidateProfile, EmployerProfile, CompanyReview
+    CandidateProfile, EmployerProfile, CompanyReview,
+    JobPosting, Category, ExchangeRate
 )
 
 
@@ -64,6 +73,73 @@ class ApplicationService:
             for app in qs
         ]
 
+    @staticmethod
+    def get_application_tags(user):
+        """Cache tags of everything the user's application list shows"""
+        tags = [f'applications:{user.id}']
+        if user.is_candidate:
+            rows = Application.objects.filter(candidate__user=user, is_active=True) \
+                .values_list('job_id', 'job__employer_id')
+            for job_id, employer_id in rows:
+                tags += [f'job:{job_id}', f'employer:{employer_id}']
+        elif user.is_employer:
+            rows = Application.objects.filter(job__employer__user=user, is_active=True) \
+                .values_list('job_id', 'candidate_id', 'candidate__user_id')
+            for job_id, candidate_id, candidate_user_id in rows:
+                tags += [f'job:{job_id}', f'candidate:{candidate_id}', f'user:{candidate_user_id}']
+        return tags
+
+
+class JobCardService:
+    """Service for building lightweight job cards straight from .values() rows"""
+
+    FIELDS = [
+        'id', 'title', 'employer__company_name', 'employer__logo',
+        'location', 'city', 'state', 'country',
+        'salary_min', 'salary_max', 'currency', 'is_salary_disclosed',
+        'posted_at',
+    ]
+
+    @staticmethod
+    def get_cards(rows):
+        logo_storage = EmployerProfile._meta.get_field('logo').storage
+        return [
+            {
+                'id': row['id'],
+                'title': row['title'],
+                'company_name': row['employer__company_name'],
+                'company_logo': logo_storage.url(row['employer__logo']) if row['employer__logo'] else None,
+                'location_display': JobCardService.format_location(
+                    row['city'], row['state'], row['country'], row['location']
+                ),
+                'salary_range': JobCardService.format_salary_range(
+                    row['salary_min'], row['salary_max'], row['currency'], row['is_salary_disclosed']
+                ),
+                'posted_at': row['posted_at'],
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def format_location(city, state, country, location):
+        location_parts = [part for part in (city, state, country) if part]
+        if location_parts:
+            return ', '.join(location_parts)
+        return location or 'Remote'
+
+    @staticmethod
+    def format_salary_range(salary_min, salary_max, currency, is_salary_disclosed):
+        if not is_salary_disclosed:
+            return None
+
+        if salary_min and salary_max:
+            return f"{currency} {salary_min:,.0f} - {salary_max:,.0f}"
+        elif salary_min:
+            return f"{currency} {salary_min:,.0f}+"
+        elif salary_max:
+            return f"Up to {currency} {salary_max:,.0f}"
+        return None
+
 
 class SavedJobsService:
     """Service for retrieving saved jobs efficiently"""
@@ -137,4 +213,195 @@ class ReviewService:
             'rating',
             'review_text', 
             'created_at'
-        ))
\ No newline at end of file
+        ))
+
+
+class JobDetailService:
+    """Service for the cached, pre-encoded job detail bodies"""
+
+    CACHE_KEY = 'job_{}:body'
+
+    @staticmethod
+    def get_queryset():
+        # serializer imports this module, so import it only when needed
+        from .serializer import GetJobSerializer
+        return GetJobSerializer.setup_eager_loading(JobPosting.objects.all())
+
+    @staticmethod
+    def build(job):
+        """Cached entry for ``job``: its encoded body and the validators read with it"""
+        from .serializer import GetJobSerializer
+        return {
+            'body': PrerenderedResponse.encode(GetJobSerializer(job).data),
+            'updated_at': job.updated_at,
+            'employer_id': job.employer_id,
+        }
+
+    @staticmethod
+    def tags(entry, job_id):
+        return [f'job:{job_id}', f"employer:{entry['employer_id']}"]
+
+    @classmethod
+    def peek(cls, job_id):
+        """The cached entry if there is one, without building it"""
+        return ComputedCache.get(cls.CACHE_KEY.format(job_id))
+
+    @classmethod
+    def lookup(cls, job_id):
+        """``(entry, fresh)`` if the job is cached (see ComputedCache.lookup), else None"""
+        return ComputedCache.lookup(cls.CACHE_KEY.format(job_id))
+
+    @classmethod
+    def get(cls, job_id):
+        """Cached entry for the job, built on a miss; None if the job does not exist"""
+        def build():
+            job = cls.get_queryset().filter(pk=job_id).first()
+            return cls.build(job) if job is not None else None
+
+        return ComputedCache.get_or_compute(
+            cls.CACHE_KEY.format(job_id), build, timeout=settings.JOB_DETAIL_CACHE_TIMEOUT,
+            tags=lambda entry: cls.tags(entry, job_id),
+        )
+
+    @classmethod
+    def warm(cls, job_ids):
+        """
+        Build the entries of ``job_ids`` that are not cached, with one query
+        for the batch. Returns how many were stored.
+        """
+        missing = [job_id for job_id in job_ids if cls.peek(job_id) is None]
+        if not missing:
+            return 0
+        # Read before the query, so an edit made meanwhile invalidates the entries
+        computed_at = CacheTags.counter()
+        started = time.monotonic()
+        jobs = list(cls.get_queryset().filter(pk__in=missing))
+        if not jobs:
+            return 0
+        entries = {job.id: cls.build(job) for job in jobs}
+        delta = (time.monotonic() - started) / len(jobs)
+        for job_id, entry in entries.items():
+            ComputedCache.set(
+                cls.CACHE_KEY.format(job_id), entry, settings.JOB_DETAIL_CACHE_TIMEOUT,
+                delta=delta, tags=cls.tags(entry, job_id), computed_at=computed_at,
+            )
+        return len(entries)
+
+
+class JobFacetService:
+    """Service for computing facet counts over a filtered job queryset"""
+
+    CACHE_TIMEOUT = 60 * 5
+    VERSION_KEY = 'job_facets_version'
+
+    choice_facets = {
+        'employment_type': JobPosting.EmploymentType,
+        'job_type': JobPosting.LocationType,
+        'experience_level': JobPosting.ExperienceLevel,
+    }
+
+    @classmethod
+    def get_facets(cls, queryset, signature):
+        """Return cached facet counts for ``queryset``, identified by ``signature``"""
+        cache_key = f"job_facets:{cls.get_version()}:{signature}"
+        return ComputedCache.get_or_compute(
+            cache_key, lambda: cls.compute_facets(queryset), timeout=cls.CACHE_TIMEOUT
+        )
+
+    @classmethod
+    def compute_facets(cls, queryset):
+        # Drop the default ordering so it does not leak into the GROUP BY
+        queryset = queryset.order_by()
+        data = {}
+
+        for field, choices in cls.choice_facets.items():
+            counts = dict(
+                queryset.values_list(field).annotate(count=Count('id')).values_list(field, 'count')
+            )
+            data[field] = [
+                {'value': value, 'label': str(label), 'count': counts.get(value, 0)}
+                for value, label in choices.choices
+            ]
+
+        countries = (
+            queryset.exclude(country='')
+            .values('country')
+            .annotate(count=Count('id'))
+            .order_by('-count', 'country')
+        )
+        data['country'] = [{'value': row['country'], 'count': row['count']} for row in countries]
+
+        # Jobs filed under a subcategory count towards its top-level parent
+        category_counts = (
+            queryset.filter(categories__isnull=False)
+            .annotate(top_category=Coalesce('categories__parent_id', 'categories__id'))
+            .values('top_category')
+            .annotate(count=Count('id', distinct=True))
+            .values_list('top_category', 'count')
+        )
+        category_counts = dict(category_counts)
+        categories = Category.objects.filter(id__in=category_counts).values('id', 'name', 'slug')
+        data['category'] = sorted(
+            (
+                {
+                    'value': category['id'],
+                    'label': category['name'],
+                    'slug': category['slug'],
+                    'count': category_counts[category['id']],
+                }
+                for category in categories
+            ),
+            key=lambda item: (-item['count'], item['label']),
+        )
+
+        data['total'] = queryset.count()
+        return data
+
+    @classmethod
+    def get_version(cls):
+        # Seed from the clock so an evicted version never resurrects old entries
+        return cache.get_or_set(cls.VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+    @classmethod
+    def invalidate(cls):
+        """Make every cached facet set unreachable at once"""
+        try:
+            cache.incr(cls.VERSION_KEY)
+        except ValueError:
+            cache.set(cls.VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+class SalaryService:
+    """Keeps the normalized salary columns in step with the exchange rates"""
+
+    @staticmethod
+    def recompute_base_salaries(currencies=None):
+        """
+        Recompute ``salary_min_base``/``salary_max_base`` with one UPDATE per
+        currency. Limited to ``currencies`` when given; jobs in a currency
+        without a loaded rate get no normalized salary.
+        """
+        rates = dict(ExchangeRate.objects.filter(is_active=True).values_list('currency', 'rate'))
+        rates[settings.SALARY_BASE_CURRENCY] = Decimal(1)
+
+        jobs = JobPosting.objects.order_by()
+        if currencies is not None:
+            # Jobs keep the currency as entered; rates are looked up upper-cased
+            condition = Q()
+            for currency in currencies:
+                condition |= Q(currency__iexact=currency)
+            jobs = jobs.filter(condition) if currencies else jobs.none()
+
+        updated = 0
+        for currency in jobs.values_list('currency', flat=True).distinct():
+            rate = rates.get(currency.upper())
+            changes = {'salary_min_base': None, 'salary_max_base': None}
+            if rate is not None:
+                # Rounded like ExchangeRate.convert
+                changes = {
+                    'salary_min_base': Round(F('salary_min') * rate, 2),
+                    'salary_max_base': Round(F('salary_max') * rate, 2),
+                }
+            # Bulk updates skip auto_now; salary filter results change with the rate
+            updated += JobPosting.objects.filter(currency=currency).update(updated_at=Now(), **changes)
+        return updated
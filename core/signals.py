@@ -1,13 +1,20 @@
-from django.db.models.signals import post_save
+from django.db.models import Q
+from django.utils import timezone
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
 from .models import (
     CandidateProfile, EmployerProfile, Address, 
-    Notification, Application, JobPosting, JobNotification
+    Notification, Application, JobPosting,
+    JobSkill, Category, ExchangeRate, CandidateSkill, Education, Certification
 )
 from django.contrib.auth import get_user_model
-from .utils import send_email
+from .search import JobSearch
+from .authentication import TokenDenyList
+from .caching import CacheTags
+from .matching import SkillIndex
+from .services import JobFacetService, SalaryService
+from .tasks import TaskQueue, deliver_email, notify_matching_candidates
 import logging
-from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +30,13 @@ def create_candidate_or_employer_profile(sender, instance, created, **kwargs):
         Address.objects.create(user=instance)
 
 
+@receiver(post_save, sender=User)
+def revoke_tokens_on_password_change(sender, instance, created, **kwargs):
+    # set_password() keeps the raw password until save() has finished
+    if not created and instance._password is not None:
+        TokenDenyList.revoke_user(instance.pk)
+
+
 @receiver(post_save, sender=Application)
 def send_employer_application_notification(sender, instance, created, **kwargs):
     if created:
@@ -32,7 +46,6 @@ def send_employer_application_notification(sender, instance, created, **kwargs):
             notification_type=Notification.NotificationType.APPLICATION,
             content=f"{instance.candidate.user.get_full_name()} has applied for the position of {instance.job.title}.",
         )
-        cache.delete(f'user_notifications:{instance.job.id}')
 
 @receiver(post_save, sender=Application)
 def send_candidate_application_notification(sender, instance, created, **kwargs):
@@ -43,7 +56,6 @@ def send_candidate_application_notification(sender, instance, created, **kwargs)
             notification_type=Notification.NotificationType.APPLICATION,
             content=f"You have successfully applied for the position of {instance.job.title} at {instance.job.employer.company_name}.",
         )
-        cache.delete(f'user_notifications:{instance.candidate.user.id}')
 
 
 @receiver(post_save, sender=Application)
@@ -55,19 +67,194 @@ def send_candidate_application_status_update_notification(sender, instance, crea
             notification_type=Notification.NotificationType.APPLICATION_STATUS,
             content=f"Your application for the position of {instance.job.title} at {instance.job.employer.company_name} has been updated.",
         )
-        cache.delete(f'user_notifications:{instance.candidate.user.id}')
-        send_email(
-            to=instance.candidate.user.email,
+        TaskQueue.enqueue(
+            deliver_email,
+            email_address=instance.candidate.user.email,
             subject=f"Application for {instance.job.title} has been updated",
-            message=f"Your application for the position of {instance.job.title} at {instance.job.employer.company_name} has been updated.",
+            body=f"Your application for the position of {instance.job.title} at {instance.job.employer.company_name} has been updated.",
+            html=False,
         )
 
 
+# Cache tags touched by each model; cached views declare the tags they read
+
+@CacheTags.register(User)
+def user_tags(user):
+    return [f'user:{user.pk}']
+
+
+@CacheTags.register(Address)
+def address_tags(address):
+    return [f'user:{address.user_id}']
+
+
+@CacheTags.register(CandidateProfile)
+def candidate_tags(candidate):
+    return [f'candidate:{candidate.pk}']
+
+
+@CacheTags.register(CandidateSkill)
+@CacheTags.register(Education)
+@CacheTags.register(Certification)
+def candidate_detail_tags(instance):
+    return [f'candidate:{instance.candidate_id}']
+
+
+@CacheTags.register(EmployerProfile)
+def employer_tags(employer):
+    return [f'employer:{employer.pk}']
+
+
+@CacheTags.register(JobPosting)
+def job_tags(job):
+    return [f'job:{job.pk}']
+
+
+@CacheTags.register(Application)
+def application_tags(application):
+    """Applications show up in both the candidate's and the employer's collections"""
+    employer_user_id = JobPosting.objects.filter(pk=application.job_id).values_list(
+        'employer__user_id', flat=True
+    ).first()
+    candidate_user_id = CandidateProfile.objects.filter(pk=application.candidate_id).values_list(
+        'user_id', flat=True
+    ).first()
+    return [
+        f'application:{application.pk}',
+        f'applications:{candidate_user_id}',
+        f'applications:{employer_user_id}',
+    ]
+
+
+@CacheTags.register(Notification)
+def notification_tags(notification):
+    return [f'notifications:{notification.user_id}']
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cache_tags(sender, instance, **kwargs):
+    tags = CacheTags.tags_for(instance)
+    if tags:
+        CacheTags.invalidate(*tags)
+
+
+@receiver(post_save, sender=JobPosting)
+def update_job_search_index(sender, instance, update_fields=None, **kwargs):
+    """Keep the local FTS5 search table in step with the job (MySQL indexes itself)"""
+    if update_fields is None or 'search_document' in update_fields:
+        JobSearch.index_job(instance)
+
+
+@receiver(post_delete, sender=JobPosting)
+def remove_job_from_search_index(sender, instance, **kwargs):
+    JobSearch.remove_job(instance.id)
+
+
+@receiver(post_save, sender=JobPosting)
+def invalidate_job_facets_on_status_change(sender, instance, created, **kwargs):
+    """Facet counts only cover active jobs, so they go stale when a status changes"""
+    if created:
+        changed = instance.status == JobPosting.Status.ACTIVE
+    else:
+        changed = instance.status != getattr(instance, '_loaded_status', None)
+    instance._loaded_status = instance.status
+    if changed:
+        JobFacetService.invalidate()
+
+
+@receiver(post_delete, sender=JobPosting)
+def invalidate_job_facets_on_delete(sender, instance, **kwargs):
+    if instance.status == JobPosting.Status.ACTIVE:
+        JobFacetService.invalidate()
+
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def recompute_salaries_on_rate_change(sender, instance, **kwargs):
+    SalaryService.recompute_base_salaries([instance.currency])
+
+
+def touch_jobs(job_ids):
+    """
+    A job's API representation embeds its skills, categories and employer;
+    move updated_at when those change so ETag/Last-Modified validators do too.
+    The update sends no signals, so the jobs' cache tags are invalidated here.
+    """
+    job_ids = list(job_ids)
+    if job_ids:
+        JobPosting.objects.filter(id__in=job_ids).update(updated_at=timezone.now())
+        CacheTags.invalidate(*[f'job:{job_id}' for job_id in job_ids])
+
+
+@receiver(post_save, sender=JobSkill)
+@receiver(post_delete, sender=JobSkill)
+def invalidate_job_detail_on_skill_change(sender, instance, **kwargs):
+    touch_jobs([instance.job_id])
+
+
+@receiver(m2m_changed, sender=JobPosting.categories.through)
+def invalidate_job_detail_on_categories_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # category.jobs.clear() does not pass the removed job ids
+        touch_jobs(list(JobPosting.categories.through.objects.filter(
+            category=instance
+        ).values_list('jobposting_id', flat=True)))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            touch_jobs([instance.id])
+        elif pk_set:
+            touch_jobs(pk_set)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def invalidate_job_detail_on_category_change(sender, instance, **kwargs):
+    # Job details embed category names and their parent's name
+    job_ids = JobPosting.categories.through.objects.filter(
+        Q(category=instance) | Q(category__parent=instance)
+    ).values_list('jobposting_id', flat=True)
+    touch_jobs(set(job_ids))
+
+
+@receiver(post_save, sender=CandidateSkill)
+def update_skill_index_on_save(sender, instance, created, **kwargs):
+    pair = (instance.skill_id, instance.candidate_id)
+    loaded = getattr(instance, '_loaded_pair', None)
+    instance._loaded_pair = pair
+    if loaded == pair and not created:
+        return
+    changes = [(True, *pair)]
+    if loaded is not None and loaded != pair:
+        changes.insert(0, (False, *loaded))
+    SkillIndex.record(changes)
+
+
+@receiver(post_delete, sender=CandidateSkill)
+def update_skill_index_on_delete(sender, instance, **kwargs):
+    SkillIndex.record([(False, instance.skill_id, instance.candidate_id)])
+
+
+@receiver(post_save, sender=EmployerProfile)
+def sync_job_coordinates_with_employer(sender, instance, created, **kwargs):
+    """Jobs that give no location of their own are placed at their employer"""
+    if not created:
+        instance.job_postings.filter(city='', state='', country='').update(
+            latitude=instance.latitude, longitude=instance.longitude
+        )
+
+
+@receiver(post_save, sender=EmployerProfile)
+def invalidate_job_detail_on_employer_change(sender, instance, created, **kwargs):
+    if not created:
+        touch_jobs(instance.job_postings.values_list('id', flat=True))
+
+
 @receiver(post_save, sender=JobPosting)
 def send_automatic_job_notifications(sender, instance, created, **kwargs):
     """
-    Automatically send job notifications to matching candidates when a new job is posted.
-    Matches candidates based on their skills (skill-based matching).
+    Queue job notifications to matching candidates when a new job is posted;
+    the matching and the emails run in the background (see core.tasks).
     """
     if not created:
         return  # Only send notifications for new job postings
@@ -76,109 +263,5 @@ def send_automatic_job_notifications(sender, instance, created, **kwargs):
     if instance.status != JobPosting.Status.ACTIVE:
         logger.info(f"Job {instance.title} is not active, skipping automatic notifications")
         return
-    
-    # Get all required skills for this job
-    required_skill_ids = instance.job_skills.filter(
-        is_required=True
-    ).values_list('skill_id', flat=True)
-    
-    if not required_skill_ids:
-        logger.info(f"No required skills for job {instance.title}, skipping skill-based matching")
-        return
-    
-    # Find candidates who have at least one of the required skills
-    matching_candidates = CandidateProfile.objects.filter(
-        candidate_skills__skill_id__in=required_skill_ids,
-        user__is_active=True  # Only send to active users
-    ).distinct()
-    
-    logger.info(f"Found {matching_candidates.count()} skill-matching candidates for {instance.title}")
-    
-    for candidate in matching_candidates:
-        # Create job notification record
-        notification, notification_created = JobNotification.objects.get_or_create(
-            candidate=candidate,
-            job_posting=instance,
-            defaults={'source': 'SKILL_MATCH'}
-        )
-        
-        if not notification_created:
-            logger.info(f"Notification already exists for {candidate.user.email}")
-            continue
-        
-        # Get matching skills for personalization
-        candidate_skill_ids = candidate.candidate_skills.values_list('skill_id', flat=True)
-        matching_skills = instance.job_skills.filter(
-            skill_id__in=candidate_skill_ids
-        ).select_related('skill')
-        
-        matching_skill_names = [js.skill.name for js in matching_skills]
-        
-        # Prepare email content
-        subject = f"New Job Match: {instance.title}"
-        
-        body = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #4CAF50; color: white; padding: 20px; text-align: center; }}
-                .content {{ padding: 20px; background-color: #f9f9f9; }}
-                .skills {{ background-color: #e8f5e9; padding: 10px; margin: 10px 0; border-radius: 5px; }}
-                .button {{ 
-                    display: inline-block; 
-                    padding: 12px 24px; 
-                    background-color: #4CAF50; 
-                    color: white; 
-                    text-decoration: none; 
-                    border-radius: 5px; 
-                    margin-top: 15px;
-                }}
-                .footer {{ text-align: center; padding: 20px; font-size: 12px; color: #666; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>New Job Match!</h1>
-                </div>
-                <div class="content">
-                    <h2>{instance.title}</h2>
-                    <p><strong>Company:</strong> {instance.company.name if hasattr(instance, 'company') else 'N/A'}</p>
-                    <p><strong>Location:</strong> {instance.location if hasattr(instance, 'location') else 'N/A'}</p>
-                    
-                    <div class="skills">
-                        <strong>Your Matching Skills:</strong>
-                        <ul>
-                            {"".join([f"<li>{skill}</li>" for skill in matching_skill_names])}
-                        </ul>
-                    </div>
-                    
-                    <p>{instance.description[:200] if hasattr(instance, 'description') else ''}...</p>
-                    
-                    <a href="{instance.get_absolute_url()}" class="button">View Job Details</a>
-                </div>
-                <div class="footer">
-                    <p>You're receiving this because your skills match this job.</p>
-                    <p>To stop receiving alerts, update your preferences.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Send email
-        email_sent = send_email(
-            email_address=candidate.user.email,
-            subject=subject,
-            body=body,
-            html=True
-        )
-        
-        if email_sent:
-            logger.info(f"Alert sent to {candidate.user.email} for job {instance.title}")
-        else:
-            logger.error(f"Failed to send alert to {candidate.user.email} for job {instance.title}")
 
+    TaskQueue.enqueue(notify_matching_candidates, job_id=instance.id)
@@ -0,0 +1,227 @@
+import logging
+import random
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .emails import JobMatchEmail
+from .mailer import SendGridMailer
+from .matching import SkillIndex
+from .models import CandidateProfile, JobNotification, JobPosting, Task
+
+logger = logging.getLogger(__name__)
+
+
+class TaskQueue:
+    """
+    Durable background tasks stored in the ``Task`` table.
+
+    Functions registered with ``register`` are queued with ``enqueue`` and run
+    by ``manage.py run_worker``. Workers claim due tasks with
+    ``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of them can share
+    the table without a broker. A run holds its task's row lock until it
+    finishes, so a task is never handed to a second worker while it runs,
+    however long that takes. A claim expires after CLAIM_TIMEOUT; a task
+    whose worker died (and with it the lock) is then claimed again, so tasks
+    run at least once and must tolerate running twice. Failed tasks are
+    retried with exponential backoff until ``max_attempts`` is used up.
+    """
+    CLAIM_TIMEOUT = 60 * 5
+    RETRY_BASE_DELAY = 30
+    RETRY_MAX_DELAY = 60 * 60
+
+    _registry = {}
+
+    @staticmethod
+    def name_of(func):
+        return f'{func.__module__}.{func.__qualname__}'
+
+    @classmethod
+    def register(cls, max_attempts=5):
+        """Decorator making a function available as a task"""
+        def decorator(func):
+            cls._registry[cls.name_of(func)] = (func, max_attempts)
+            return func
+        return decorator
+
+    @classmethod
+    def enqueue(cls, func, delay=0, **payload):
+        """
+        Queue ``func(**payload)``; the payload must be JSON serializable. The
+        row is written in the caller's transaction, so the task only exists
+        once the change that queued it is committed.
+        """
+        task = cls._task(func, payload, delay)
+        task.save()
+        return task
+
+    @classmethod
+    def enqueue_many(cls, func, payloads, delay=0):
+        """Queue ``func(**payload)`` for each of ``payloads`` with one insert"""
+        return Task.objects.bulk_create([cls._task(func, payload, delay) for payload in payloads])
+
+    @classmethod
+    def _task(cls, func, payload, delay):
+        name = cls.name_of(func)
+        if name not in cls._registry:
+            raise ValueError(f'{name} is not registered as a task')
+        return Task(
+            name=name,
+            payload=payload,
+            max_attempts=cls._registry[name][1],
+            run_at=timezone.now() + timedelta(seconds=delay),
+        )
+
+    @classmethod
+    def claim(cls, limit=1):
+        """Lock up to ``limit`` due tasks for this worker and return them"""
+        now = timezone.now()
+        with transaction.atomic():
+            tasks = list(
+                Task.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=Task.Status.PENDING, run_at__lte=now)
+                    | Q(status=Task.Status.RUNNING, locked_until__lt=now)
+                )
+                .order_by('run_at')[:limit]
+            )
+            if not tasks:
+                return []
+            locked_until = now + timedelta(seconds=cls.CLAIM_TIMEOUT)
+            Task.objects.filter(pk__in=[task.pk for task in tasks]).update(
+                status=Task.Status.RUNNING, locked_until=locked_until, attempts=F('attempts') + 1,
+            )
+        for task in tasks:
+            task.status, task.locked_until = Task.Status.RUNNING, locked_until
+            task.attempts += 1
+        return tasks
+
+    @classmethod
+    def run(cls, task):
+        """
+        Run a claimed task and record the outcome. Its database writes commit
+        together with the task being marked done. Returns whether it succeeded.
+        """
+        # The outcome is only recorded while the claim is still ours: a worker
+        # that reclaimed the task has incremented attempts
+        claimed = Task.objects.filter(pk=task.pk, attempts=task.attempts)
+        func, _ = cls._registry.get(task.name, (None, None))
+        try:
+            if func is None:
+                raise LookupError(f'{task.name} is not registered as a task')
+            if task.attempts > task.max_attempts:
+                raise RuntimeError('Claim expired on the last attempt')
+            with transaction.atomic():
+                # claim() skips locked rows, so holding this lock keeps an
+                # expired claim from being taken over while the task runs
+                if not claimed.select_for_update().values_list('pk', flat=True):
+                    logger.warning(f"Task {task.pk} {task.name} was claimed by another worker, not running it")
+                    return False
+                func(**task.payload)
+                claimed.update(status=Task.Status.DONE, finished_at=timezone.now(), locked_until=None)
+        except Exception:
+            error = traceback.format_exc()
+            if func is None or task.attempts >= task.max_attempts:
+                logger.error(f"Task {task.pk} {task.name} failed for good: {error}")
+                claimed.update(status=Task.Status.FAILED, finished_at=timezone.now(),
+                               locked_until=None, last_error=error)
+            else:
+                delay = cls.retry_delay(task.attempts)
+                logger.warning(f"Task {task.pk} {task.name} failed, retrying in {delay:.0f}s: {error}")
+                claimed.update(status=Task.Status.PENDING, run_at=timezone.now() + timedelta(seconds=delay),
+                               locked_until=None, last_error=error)
+            return False
+        return True
+
+    @classmethod
+    def retry_delay(cls, attempts):
+        """Exponential backoff with jitter, so failures do not retry in lockstep"""
+        delay = min(cls.RETRY_MAX_DELAY, cls.RETRY_BASE_DELAY * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1)
+
+
+@TaskQueue.register(max_attempts=5)
+def deliver_email(email_address, subject, body, html=True):
+    if html:
+        SendGridMailer.send(subject, [email_address], html=body)
+    else:
+        SendGridMailer.send(subject, [email_address], text=body)
+
+
+@TaskQueue.register(max_attempts=5)
+def deliver_email_batch(subject, recipients, html=None, text=None):
+    """
+    One message to many recipients, given as ``[email, substitutions]``
+    pairs. Batches of up to SendGridMailer.MAX_PERSONALIZATIONS recipients
+    are a single API call, so a retry resends to all of them.
+    """
+    SendGridMailer.send(subject, recipients, html=html, text=text)
+
+
+def active_candidate_batches(candidate_ids, batch_size=1000):
+    """Profiles of the active users among ``candidate_ids``, a batch at a time"""
+    candidate_ids = sorted(candidate_ids)
+    for start in range(0, len(candidate_ids), batch_size):
+        batch = list(CandidateProfile.objects.filter(
+            id__in=candidate_ids[start:start + batch_size],
+            user__is_active=True  # Only send to active users
+        ).select_related('user').order_by('id'))
+        if batch:
+            yield batch
+
+
+@TaskQueue.register(max_attempts=3)
+def notify_matching_candidates(job_id):
+    """
+    Send job notifications to the candidates whose skills match a new job.
+    Matches candidates based on their skills (skill-based matching).
+    """
+    instance = JobPosting.objects.select_related('employer').filter(pk=job_id).first()
+    if instance is None or instance.status != JobPosting.Status.ACTIVE:
+        return
+
+    # Names of the job's skills, and which of them are required
+    job_skills = dict(instance.job_skills.values_list('skill_id', 'skill__name'))
+    required_skill_ids = set(instance.job_skills.filter(
+        is_required=True
+    ).values_list('skill_id', flat=True))
+
+    if not required_skill_ids:
+        logger.info(f"No required skills for job {instance.title}, skipping skill-based matching")
+        return
+
+    # Candidates who have at least one of the required skills, with every
+    # skill of the job they have, from the in-memory index
+    matches = {
+        candidate_id: skill_ids
+        for candidate_id, skill_ids in SkillIndex.match(job_skills).items()
+        if required_skill_ids.intersection(skill_ids)
+    }
+    # Everyone notified before, e.g. by an earlier attempt of this task. Its
+    # runs never overlap (see TaskQueue.run), so this includes all they wrote
+    notified = set(JobNotification.objects.filter(job_posting=instance).values_list('candidate_id', flat=True))
+    pending = [candidate_id for candidate_id in matches if candidate_id not in notified]
+
+    logger.info(f"Found {len(matches)} skill-matching candidates for {instance.title}, "
+                f"{len(matches) - len(pending)} already notified")
+
+    email = JobMatchEmail(instance)
+    for number, batch in enumerate(active_candidate_batches(pending), 1):
+        started = time.monotonic()
+        # Rows written meanwhile by other code paths are skipped, not an error
+        JobNotification.objects.bulk_create(
+            [JobNotification(candidate=candidate, job_posting=instance) for candidate in batch],
+            ignore_conflicts=True,
+        )
+        # One email task per batch, sent as a single API call; only the
+        # matching skills differ between recipients
+        TaskQueue.enqueue(deliver_email_batch, subject=email.subject, html=email.html, text=email.text, recipients=[
+            [candidate.user.email, email.substitutions([job_skills[skill_id] for skill_id in matches[candidate.id]])]
+            for candidate in batch
+        ])
+        logger.info(f"Job {instance.id} batch {number}: notified {len(batch)} candidates "
+                    f"in {time.monotonic() - started:.3f}s")
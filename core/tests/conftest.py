@@ -0,0 +1,25 @@
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+
+
+@pytest.fixture(scope='session', autouse=True)
+def shared_cache():
+    """
+    Tests get an in-memory shared cache of their own, so clearing it never
+    touches the one of a local server (the cache directory, or Redis)
+    """
+    shared = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tests',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    }
+    with override_settings(CACHES={**settings.CACHES, 'shared': shared}):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(shared_cache):
+    """The shared cache outlives a test, so start each test empty"""
+    cache.clear()
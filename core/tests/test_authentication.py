@@ -0,0 +1,79 @@
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    return client
+
+
+@pytest.fixture
+def employer():
+    return User.objects.create_user(
+        email='employer@example.com', password='secret', first_name='Emma', last_name='Employer',
+        role='EMPLOYER',
+    )
+
+
+@pytest.mark.django_db
+def test_cached_identity_authenticates_without_queries(employer, django_assert_num_queries):
+    client = client_for(employer)
+    assert client.get(reverse('auth-me')).status_code == 200
+
+    with django_assert_num_queries(0):
+        response = client.get(reverse('auth-me'))
+    assert response.status_code == 200
+    assert response.data['user']['email'] == employer.email
+
+
+@pytest.mark.django_db
+def test_request_user_carries_role_and_profile(employer):
+    from core.authentication import UserIdentity
+
+    user = UserIdentity.build_user(UserIdentity.get(employer.id))
+    assert user.is_employer and user.is_authenticated
+    assert user.employer_profile.pk == employer.employer_profile.pk
+    assert not hasattr(user, 'candidate')
+
+
+@pytest.mark.django_db
+def test_deactivated_user_is_rejected(employer):
+    client = client_for(employer)
+    assert client.get(reverse('auth-me')).status_code == 200
+
+    employer.is_active = False
+    employer.save()
+    assert client.get(reverse('auth-me')).status_code == 401
+
+
+@pytest.mark.django_db
+def test_logout_revokes_token(employer):
+    client = client_for(employer)
+    assert client.post(reverse('auth-logout')).status_code == 204
+
+    response = client.get(reverse('auth-me'))
+    assert response.status_code == 401
+    assert response.data['code'] == 'token_revoked'
+
+
+@pytest.mark.django_db
+def test_password_change_revokes_issued_tokens(employer):
+    token = AccessToken.for_user(employer)
+    token['iat'] = int(time.time()) - 1
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    assert client.get(reverse('auth-me')).status_code == 200
+
+    employer.set_password('changed')
+    employer.save()
+    assert client.get(reverse('auth-me')).status_code == 401
+    # Logging in again right away works, even within the same second
+    assert client_for(employer).get(reverse('auth-me')).status_code == 200
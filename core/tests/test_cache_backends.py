@@ -0,0 +1,135 @@
+import pytest
+
+from core.cache_backends import LOG_KEY, InstrumentedCache, TwoTierCache
+
+
+@pytest.fixture
+def shared_alias(settings, tmp_path):
+    settings.CACHES = {
+        **settings.CACHES,
+        'test_shared': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        },
+    }
+    return 'test_shared'
+
+
+def _worker(alias, **options):
+    """One process' view of the cache: its own L1 over the common L2, checking every read"""
+    return TwoTierCache(alias, {'OPTIONS': {'MAX_ENTRIES': 100, 'SYNC_INTERVAL': 0, **options}})
+
+
+def test_writes_in_one_worker_invalidate_the_others(shared_alias):
+    first, second = _worker(shared_alias), _worker(shared_alias)
+
+    first.set('user_profile:1', {'name': 'Old'})
+    assert second.get('user_profile:1') == {'name': 'Old'}
+
+    first.set('user_profile:1', {'name': 'New'})
+    assert second.get('user_profile:1') == {'name': 'New'}
+
+    first.delete('user_profile:1')
+    assert second.get('user_profile:1') is None
+
+    second.set_many({'a': 1, 'b': 2})
+    assert first.get_many(['a', 'b']) == {'a': 1, 'b': 2}
+    second.delete_many(['a', 'b'])
+    assert first.get_many(['a', 'b']) == {}
+
+
+def test_reads_are_served_from_the_local_tier(shared_alias):
+    worker = _worker(shared_alias)
+    worker.set('key', [1, 2])
+
+    # Bypass the worker: L2 changes it was not told about stay invisible
+    worker.shared.set('key', 'changed behind its back')
+    value = worker.get('key')
+    assert value == [1, 2]
+
+    # Callers get a copy and cannot corrupt the cached value
+    value.append(3)
+    assert worker.get('key') == [1, 2]
+
+
+def test_local_tier_evicts_least_recently_used(shared_alias):
+    worker = _worker(shared_alias, MAX_ENTRIES=2)
+    worker.set('a', 1)
+    worker.set('b', 2)
+    worker.get('a')
+    worker.set('c', 3)
+
+    assert len(worker._local) == 2
+    assert worker._local_get(worker.make_key('b')) is None
+    # Evicted keys are still served from L2
+    assert worker.get('b') == 2
+
+
+def test_lost_messages_drop_the_whole_local_tier(shared_alias):
+    first, second = _worker(shared_alias), _worker(shared_alias)
+    first.set('key', 'old')
+    second.get('key')
+
+    first.shared.set('key', 'new')
+    first.set('other', 1)
+    # The message for 'other' expired before the second worker read it
+    first.shared.delete(LOG_KEY.format(first.shared.get('two_tier:sequence')))
+
+    assert second.get('key') == 'new'
+
+
+def test_clear_reaches_every_worker(shared_alias):
+    first, second = _worker(shared_alias), _worker(shared_alias)
+    first.set('key', 'value')
+    assert second.get('key') == 'value'
+
+    first.clear()
+    assert second.get('key') is None
+
+
+@pytest.mark.parametrize('interval, expected', [(0, 'new'), (60, 'old')])
+def test_sync_interval_bounds_staleness(shared_alias, interval, expected):
+    first, second = _worker(shared_alias), _worker(shared_alias, SYNC_INTERVAL=interval)
+    first.set('key', 'old')
+    second.get('key')
+
+    first.set('key', 'new')
+    assert second.get('key') == expected
+
+
+def _instrumented(alias, shared_alias):
+    return InstrumentedCache(alias, {'OPTIONS': {'METRICS_LOCATION': shared_alias, 'FLUSH_INTERVAL': 60}})
+
+
+def test_instrumented_cache_counts_per_key_pattern(shared_alias):
+    first, second = _instrumented(shared_alias, shared_alias), _instrumented(shared_alias, shared_alias)
+
+    first.set('user_profile:1:body', {'name': 'Ann'})
+    assert first.get('user_profile:1:body') == {'name': 'Ann'}
+    assert first.get('user_profile:2:body', 'default') == 'default'
+    second.get_many(['application:3:user:1:body', 'user_profile:1:body'])
+    second.delete('user_profile:1:body')
+    second.flush()
+
+    # Merged with the snapshot the other process published
+    metrics = first.metrics()
+    profile = metrics['user_profile:*:body']
+    assert (profile['hits'], profile['misses'], profile['sets'], profile['deletes']) == (2, 1, 1, 1)
+    assert profile['set_bytes'] > 0
+    assert metrics['application:*:user:*:body']['misses'] == 1
+
+    row = next(row for row in InstrumentedCache.summarize(metrics) if row['pattern'] == 'user_profile:*:body')
+    assert row['hit_ratio'] == round(2 / 3, 3)
+    assert row['avg_get_ms'] is not None
+
+
+def test_cache_stats_command(shared_alias):
+    from io import StringIO
+
+    from django.core.cache import cache
+    from django.core.management import call_command
+
+    cache.get('user_login_data:7')
+    out = StringIO()
+    call_command('cache_stats', stdout=out)
+    assert 'user_login_data:*' in out.getvalue()
@@ -0,0 +1,193 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.caching import CacheTags, ComputedCache
+from core.models import Application, EmployerProfile, JobPosting, Notification, User
+from core.views import ApplicationView, NotificationView
+
+
+def _call(view_class, action, user):
+    request = APIRequestFactory().get('/')
+    force_authenticate(request, user=user)
+    return view_class.as_view({'get': action})(request)
+
+
+def test_invalidating_a_tag_drops_only_entries_that_declare_it():
+    ComputedCache.set('job_detail', 'cached', timeout=60, tags=['job:1', 'employer:1'])
+    ComputedCache.set('other_job', 'cached', timeout=60, tags=['job:2'])
+
+    CacheTags.invalidate('employer:1')
+
+    assert ComputedCache.get('job_detail') is None
+    assert ComputedCache.get('other_job') == 'cached'
+
+
+def test_change_while_computing_is_not_cached_over():
+    def compute():
+        CacheTags.invalidate('job:1')
+        return 'computed before the change landed'
+
+    ComputedCache.get_or_compute('job_detail', compute, timeout=60, tags=['job:1'])
+    assert ComputedCache.get('job_detail') is None
+
+
+def test_entry_is_dropped_when_a_tag_stamp_is_evicted():
+    CacheTags.invalidate('job:1')
+    ComputedCache.set('job_detail', 'cached', timeout=60, tags=['job:1', 'employer:1'])
+    assert ComputedCache.get('job_detail') == 'cached'
+
+    cache.delete(CacheTags.TAG_KEY.format('employer:1'))
+    assert ComputedCache.get('job_detail') is None
+
+
+@pytest.mark.django_db
+def test_entry_computed_before_commit_is_dropped_on_commit(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            CacheTags.invalidate('job:1')
+            # A reader that still sees the old rows
+            ComputedCache.set('job_detail', 'old rows', timeout=60, tags=['job:1'])
+            assert ComputedCache.get('job_detail') == 'old rows'
+    assert ComputedCache.get('job_detail') is None
+
+
+@pytest.mark.django_db
+def test_new_notification_shows_up_despite_cached_list():
+    user = User.objects.create_user(email='notify@example.com', password='pw', role='CANDIDATE')
+    Notification.objects.create(user=user, title='First', content='...')
+
+    assert len(_call(NotificationView, 'notifications', user).data['notifications']) == 1
+
+    Notification.objects.create(user=user, title='Second', content='...')
+    assert len(_call(NotificationView, 'notifications', user).data['notifications']) == 2
+
+
+@pytest.mark.django_db
+def test_application_change_refreshes_both_sides():
+    employer = User.objects.create_user(email='hire@example.com', password='pw', role='EMPLOYER')
+    candidate = User.objects.create_user(email='apply@example.com', password='pw', role='CANDIDATE')
+    job = JobPosting.objects.create(employer=employer.employer_profile, title='Job', description='Desc')
+    # bulk_create skips the application signals, which send email
+    application, = Application.objects.bulk_create([Application(candidate=candidate.candidate, job=job)])
+
+    assert _call(ApplicationView, 'applications', employer).data[0]['status'] == application.status
+    _call(ApplicationView, 'applications', candidate)
+
+    application.status = Application.Status.REVIEWED
+    application.save()
+
+    assert _call(ApplicationView, 'applications', employer).data[0]['status'] == 'REVIEWED'
+    assert _call(ApplicationView, 'applications', candidate).data[0]['status'] == 'REVIEWED'
+
+
+@pytest.mark.django_db
+def test_employer_change_refreshes_candidate_application_list():
+    employer = User.objects.create_user(email='hire@example.com', password='pw', role='EMPLOYER')
+    candidate = User.objects.create_user(email='apply@example.com', password='pw', role='CANDIDATE')
+    job = JobPosting.objects.create(employer=employer.employer_profile, title='Job', description='Desc')
+    Application.objects.bulk_create([Application(candidate=candidate.candidate, job=job)])
+
+    assert _call(ApplicationView, 'applications', candidate).data[0]['company_name'] == ''
+
+    profile = EmployerProfile.objects.get(user=employer)
+    profile.company_name = 'Acme'
+    profile.save()
+
+    assert _call(ApplicationView, 'applications', candidate).data[0]['company_name'] == 'Acme'
+
+
+class _Counter:
+    def __init__(self, value='fresh', delay=0.0):
+        self.calls = 0
+        self.value = value
+        self.delay = delay
+
+    def __call__(self):
+        time.sleep(self.delay)
+        self.calls += 1
+        return self.value
+
+
+def test_get_or_compute_runs_one_computation_per_miss():
+    compute = _Counter(delay=0.2)
+    results = []
+
+    def read():
+        results.append(ComputedCache.get_or_compute('hot_key', compute, timeout=60))
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert compute.calls == 1
+    assert results == ['fresh'] * 8
+
+
+def test_expired_entry_is_served_while_another_caller_refreshes():
+    ComputedCache.set('hot_key', 'stale', timeout=0)
+    compute = _Counter()
+
+    cache.add('hot_key:lock', 'someone-else')
+    assert ComputedCache.get_or_compute('hot_key', compute, timeout=60) == 'stale'
+    assert compute.calls == 0
+
+    cache.delete('hot_key:lock')
+    assert ComputedCache.get_or_compute('hot_key', compute, timeout=60) == 'fresh'
+    assert ComputedCache.get_or_compute('hot_key', compute, timeout=60) == 'fresh'
+    assert compute.calls == 1
+
+
+def test_slow_computations_are_refreshed_early():
+    compute = _Counter()
+    ComputedCache.set('cheap', 'cached', timeout=60, delta=0.0)
+    ComputedCache.set('slow', 'cached', timeout=60, delta=1e6)
+
+    assert ComputedCache.get_or_compute('cheap', compute, timeout=60) == 'cached'
+    assert ComputedCache.get_or_compute('slow', compute, timeout=60) == 'fresh'
+
+
+def test_none_results_are_not_cached():
+    compute = _Counter(value=None)
+    ComputedCache.get_or_compute('missing', compute, timeout=60)
+    ComputedCache.get_or_compute('missing', compute, timeout=60)
+    assert compute.calls == 2
+
+
+@pytest.mark.django_db
+def test_warm_caches_fills_job_details_and_facets(django_assert_num_queries):
+    from io import StringIO
+
+    from django.core.management import call_command
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from core.services import JobDetailService
+
+    employer = User.objects.create_user(email='hire@example.com', password='pw', role='EMPLOYER')
+    jobs = [
+        JobPosting.objects.create(employer=employer.employer_profile, title=f'Job {index}',
+                                  description='Desc', status=JobPosting.Status.ACTIVE)
+        for index in range(3)
+    ]
+    draft = JobPosting.objects.create(employer=employer.employer_profile, title='Draft', description='Desc')
+
+    out = StringIO()
+    call_command('warm_caches', workers=1, batch_size=2, stdout=out)
+    assert 'Warmed 3 of 3 job details and 1 facet sets' in out.getvalue()
+    assert all(JobDetailService.peek(job.id) is not None for job in jobs)
+    assert JobDetailService.peek(draft.id) is None
+
+    with django_assert_num_queries(0):
+        response = APIClient().get(reverse('jobs-detail', args=[jobs[0].id]))
+    assert response.status_code == 200
+
+    # Already warm: nothing is rebuilt
+    call_command('warm_caches', workers=1, stdout=out)
+    assert 'Warmed 0 of 3 job details' in out.getvalue()
@@ -0,0 +1,82 @@
+import pytest
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from core.filters import JobFilter
+from core.geo import Gazetteer, bounding_box, haversine_km
+from core.models import JobPosting, User
+
+ACCRA = (5.6037, -0.1870)
+
+
+@pytest.fixture
+def employer():
+    user = User.objects.create_user(email='geo@example.com', password='pw', role='EMPLOYER')
+    return user.employer_profile
+
+
+def _make_job(employer, **fields):
+    defaults = {
+        'title': 'Job', 'description': 'Desc', 'status': JobPosting.Status.ACTIVE,
+        'employment_type': 'FULL_TIME', 'job_type': 'ON_SITE', 'experience_level': 'SENIOR',
+    }
+    defaults.update(fields)
+    return JobPosting.objects.create(employer=employer, **defaults)
+
+
+@pytest.mark.parametrize('location', [
+    {'city': 'Accra'},
+    {'city': 'Greater Accra'},
+    {'city': 'accra metropolis', 'country': 'GH'},
+    {'state': 'Greater Accra Region', 'country': 'Ghana'},
+])
+def test_gazetteer_matches_name_variants(location):
+    assert Gazetteer.geocode(**location) == ACCRA
+
+
+def test_gazetteer_prefers_the_given_country():
+    assert Gazetteer.geocode('Benin City') == Gazetteer.geocode('Benin', country='Nigeria')
+    assert Gazetteer.geocode('Atlantis') is None
+
+
+def test_haversine_and_bounding_box():
+    kumasi = Gazetteer.geocode('Kumasi')
+    assert haversine_km(*ACCRA, [ACCRA, kumasi]) == [0.0, pytest.approx(200, abs=5)]
+
+    # A box around Auckland wraps past the antimeridian
+    _, _, lon_ranges = bounding_box(-36.85, 179.9, 50)
+    assert len(lon_ranges) == 2
+
+
+def test_near_accepts_places_and_validates_radius():
+    assert JobFilter({'near': 'Accra, Ghana'}).filters['near'] == ACCRA
+    for params in ({'near': '95,0'}, {'near': 'Atlantis'}, {'near': 'Accra', 'radius_km': '0'},
+                   {'radius_km': '10'}):
+        with pytest.raises(ValidationError):
+            JobFilter(params)
+
+
+@pytest.mark.django_db
+def test_near_filter_uses_exact_distance(employer):
+    accra = _make_job(employer, city='Accra', country='Ghana')
+    tema = _make_job(employer, city='Tema', country='Ghana')
+    _make_job(employer, city='Kumasi', country='Ghana')
+    _make_job(employer, city='Atlantis')
+
+    response = APIClient().get(reverse('jobs-list'), {'near': '5.6037,-0.1870', 'radius_km': 50})
+
+    assert response.status_code == 200
+    assert {job['id'] for job in response.data['results']} == {accra.id, tema.id}
+
+
+@pytest.mark.django_db
+def test_jobs_without_location_follow_their_employer(employer):
+    job = _make_job(employer)
+    assert job.latitude is None
+
+    employer.city = 'Lagos'
+    employer.save()
+
+    job.refresh_from_db()
+    assert (job.latitude, job.longitude) == Gazetteer.geocode('Lagos')
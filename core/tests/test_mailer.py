@@ -0,0 +1,69 @@
+import time
+
+import pytest
+from django.core.cache import caches
+
+from core.mailer import MailerError, SendGridMailer
+from core.sendgrid_standin import SendGridStandIn
+from core.utils import send_email
+
+
+@pytest.fixture
+def standin(settings):
+    with SendGridStandIn() as standin:
+        settings.SENDGRID_API_URL = standin.url
+        settings.SENDGRID_API_KEY = 'test-key'
+        settings.EMAIL_RATE_LIMIT = 0
+        yield standin
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time: sleeping advances it instead of waiting"""
+    now = [1_000_000.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    monkeypatch.setattr(time, 'sleep', sleep)
+    return sleeps
+
+
+def test_recipients_are_sent_in_batches_with_their_substitutions(standin):
+    recipients = [(f'c{index}@example.com', {'-name-': f'C{index}'}) for index in range(2500)]
+    assert SendGridMailer.send('Hello -name-', recipients, html='<p>Hi -name-</p>', text='Hi -name-') == 2500
+
+    assert [len(message['personalizations']) for message in standin.messages] == [1000, 1000, 500]
+    assert sorted(standin.recipients) == sorted(email for email, _ in recipients)
+    message = standin.messages[0]
+    assert message['personalizations'][0] == {'to': [{'email': 'c0@example.com'}], 'substitutions': {'-name-': 'C0'}}
+    assert [part['type'] for part in message['content']] == ['text/plain', 'text/html']
+
+
+def test_server_errors_are_retried_then_raised(standin, clock):
+    standin.fail_every = 2
+    SendGridMailer.send('Hello', ['a@example.com'], text='Hi')
+    SendGridMailer.send('Hello', ['b@example.com'], text='Hi')
+    assert standin.requests == 3
+    assert standin.recipients == ['a@example.com', 'b@example.com']
+    assert len(clock) == 1
+
+    standin.fail_every = 1
+    with pytest.raises(MailerError, match='503'):
+        SendGridMailer.send('Hello', ['c@example.com'], text='Hi')
+    assert standin.requests == 3 + SendGridMailer.MAX_ATTEMPTS
+    assert send_email('d@example.com', 'Hello', 'Hi', html=False) is False
+
+
+def test_send_rate_is_limited(standin, clock, settings):
+    settings.EMAIL_RATE_LIMIT = 2
+    caches['shared'].delete(SendGridMailer.RATE_LIMIT_KEY)
+
+    SendGridMailer.send('Hello', ['a@example.com', 'b@example.com', 'c@example.com'], text='Hi')
+
+    assert [len(message['personalizations']) for message in standin.messages] == [2, 1]
+    # Two a minute: the third recipient waits half a minute
+    assert clock == [30]
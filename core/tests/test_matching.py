@@ -0,0 +1,69 @@
+import pytest
+
+from core.matching import LOG_KEY, SkillIndex
+from core.models import CandidateSkill, Skill, User
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    SkillIndex._postings = SkillIndex._seen_sequence = None
+    yield
+    SkillIndex._postings = SkillIndex._seen_sequence = None
+
+
+@pytest.fixture
+def skills():
+    return [Skill.objects.create(name=name) for name in ('Python', 'Django', 'Go')]
+
+
+def candidate(email):
+    return User.objects.create_user(email=email, password='pw', role='CANDIDATE').candidate
+
+
+@pytest.mark.django_db
+def test_match_returns_overlapping_skills_per_candidate(skills, django_assert_num_queries):
+    python, django, go = skills
+    ann, bob = candidate('ann@example.com'), candidate('bob@example.com')
+    for profile, skill in [(ann, python), (ann, django), (bob, go)]:
+        CandidateSkill.objects.create(candidate=profile, skill=skill)
+
+    SkillIndex.match([])
+    with django_assert_num_queries(0):
+        matches = SkillIndex.match([django.id, python.id, go.id])
+    assert matches == {ann.id: [django.id, python.id], bob.id: [go.id]}
+
+
+@pytest.mark.django_db
+def test_changes_are_applied_incrementally(skills, django_assert_num_queries, django_capture_on_commit_callbacks):
+    python, django, go = skills
+    ann = candidate('ann@example.com')
+    SkillIndex.match([])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        row = CandidateSkill.objects.create(candidate=ann, skill=python)
+    with django_assert_num_queries(0):
+        assert SkillIndex.match([python.id]) == {ann.id: [python.id]}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        row = CandidateSkill.objects.get(pk=row.pk)
+        row.skill = go
+        row.save()
+    assert SkillIndex.match([python.id, go.id]) == {ann.id: [go.id]}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        row.delete()
+    with django_assert_num_queries(0):
+        assert SkillIndex.match([python.id, go.id]) == {}
+
+
+@pytest.mark.django_db
+def test_missing_changes_rebuild_the_index(skills, django_capture_on_commit_callbacks):
+    python = skills[0]
+    ann = candidate('ann@example.com')
+    SkillIndex.match([])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        CandidateSkill.objects.create(candidate=ann, skill=python)
+    SkillIndex._cache().delete(LOG_KEY.format(SkillIndex._seen_sequence + 1))
+
+    assert SkillIndex.match([python.id]) == {ann.id: [python.id]}
@@ -0,0 +1,104 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from core import renderers as core_renderers
+from core.models import CandidateProfile, Category, JobPosting, Skill, JobSkill, User
+from core.parsers import JSONParser
+from core.renderers import JSONRenderer
+from core.serializer import CandidateProfileSerializer, GetJobSerializer
+
+UTC = datetime.timezone.utc
+
+PAYLOADS = [
+    {'salary_min': Decimal('5000.00'), 'salary_max': Decimal('1E+3'), 'rate': Decimal('0.00000012')},
+    {
+        'utc': datetime.datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=UTC),
+        'zoneinfo_utc': datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=ZoneInfo('UTC')),
+        'london_winter': datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=ZoneInfo('Europe/London')),
+        'accra': datetime.datetime(2026, 7, 1, tzinfo=ZoneInfo('Africa/Lagos')),
+        'naive': datetime.datetime(2026, 1, 2, 3, 4, 5),
+        'date': datetime.date(2026, 1, 2),
+        'time': datetime.time(3, 4, 5, 6),
+        'duration': datetime.timedelta(days=1, seconds=5),
+    },
+    {'id': uuid.UUID('12345678-1234-5678-1234-567812345678'), 'label': gettext_lazy('Full Time')},
+    ReturnDict({'nested': ReturnList([{'a': 1}, (2, 3)], serializer=None)}, serializer=None),
+    {'text': 'Caf\u00e9 \u2028 line \u2029 para \x00 \x1f \x7f "quoted" \\ / \U0001f600'},
+    {'floats': [0.1, 1.5, 100.0, -0.0, 1e-05, 2.5e-7, 1e16, 1.5e300, 5.6037, -0.187]},
+    {'ints': [0, -1, 2 ** 63 - 1, 2 ** 64, -(2 ** 70)], 'bools': [True, False, None]},
+    {1: 'int key', 2.5: 'float key'},
+    {'set': {1}, 'bytes': b'raw', 'frozenset': frozenset()},
+    [],
+    {},
+]
+
+
+def _drf(data, media_type=None):
+    return renderers.JSONRenderer().render(data, media_type)
+
+
+@pytest.mark.parametrize('data', PAYLOADS)
+def test_renders_the_same_bytes_as_drf(data):
+    assert JSONRenderer().render(data) == _drf(data)
+    assert JSONRenderer().render(data, 'application/json; indent=4') == _drf(data, 'application/json; indent=4')
+
+
+def test_renders_the_same_bytes_without_orjson(monkeypatch):
+    monkeypatch.setattr(core_renderers, 'orjson', None)
+    for data in PAYLOADS:
+        assert JSONRenderer().render(data) == _drf(data)
+
+
+def test_unserializable_data_fails_the_same_way():
+    with pytest.raises(TypeError):
+        JSONRenderer().render({'value': object()})
+    with pytest.raises(ValueError):
+        JSONRenderer().render({'aware_time': datetime.time(1, tzinfo=UTC)})
+
+
+@pytest.mark.django_db
+def test_serializer_payloads_render_the_same_bytes():
+    employer = User.objects.create_user(email='render@example.com', password='pw', role='EMPLOYER')
+    job = JobPosting.objects.create(
+        employer=employer.employer_profile, title='Ingénieur – Backend', description='Desc',
+        salary_min=Decimal('1500.50'), salary_max=Decimal('3000'), currency='GHS',
+    )
+    job.categories.add(Category.objects.create(name='Engineering'))
+    JobSkill.objects.create(job=job, skill=Skill.objects.create(name='Python'), is_required=True)
+
+    candidate = User.objects.create_user(
+        email='candidate@example.com', password='pw', role='CANDIDATE', first_name='Ama', last_name='Mensah',
+    )
+    profile = CandidateProfile.objects.get(user=candidate)
+
+    for data in (GetJobSerializer(job).data, CandidateProfileSerializer(profile).data):
+        assert JSONRenderer().render(data) == _drf(data)
+
+
+@pytest.mark.parametrize('body', [
+    b'{"title": "Caf\\u00e9", "salary": 5000.50, "tags": [1, 2, null, true]}',
+    '{"title": "Café  "}'.encode(),
+    b'{"huge": 123456789012345678901234567890, "tiny": 1e-400, "big": 1e400}',
+    b'{"dup": 1, "dup": 2}',
+    b'[]',
+])
+def test_parses_the_same_data_as_drf(body):
+    expected = parsers.JSONParser().parse(io.BytesIO(body))
+    assert JSONParser().parse(io.BytesIO(body)) == expected
+
+
+@pytest.mark.parametrize('body', [b'{"salary": NaN}', b'{"a": }', b'\xef\xbb\xbf{}', b'{"a": "\xff"}'])
+def test_rejects_what_drf_rejects(body):
+    with pytest.raises(ParseError):
+        parsers.JSONParser().parse(io.BytesIO(body))
+    with pytest.raises(ParseError):
+        JSONParser().parse(io.BytesIO(body))
@@ -0,0 +1,62 @@
+import gzip
+
+import pytest
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from core.renderers import JSONRenderer
+from core.responses import PrerenderedResponse
+
+PAYLOAD = {'title': 'Backend Engineer', 'skills': ['Python', 'Django'] * 200, 'salary': '5000.00'}
+BODY = PrerenderedResponse.encode(PAYLOAD)
+
+
+class PayloadView(APIView):
+    renderer_classes = [JSONRenderer, BrowsableAPIRenderer]
+    prerendered = True
+
+    def get(self, request):
+        if self.prerendered:
+            return PrerenderedResponse(BODY)
+        return Response(PAYLOAD)
+
+
+def _get(prerendered=True, **headers):
+    request = APIRequestFactory().get('/', **headers)
+    return PayloadView.as_view(prerendered=prerendered)(request).render()
+
+
+def test_sends_the_same_bytes_without_rendering_again(monkeypatch):
+    expected = _get(prerendered=False)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('rendered again')
+
+    monkeypatch.setattr(JSONRenderer, 'render', fail)
+    response = _get()
+
+    assert response.content == expected.content
+    assert response['Content-Type'] == expected['Content-Type']
+    assert response.data == PAYLOAD
+
+
+def test_gzip_variant_for_clients_that_accept_it():
+    response = _get(HTTP_ACCEPT_ENCODING='gzip, deflate')
+    assert response['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response['Vary']
+    assert gzip.decompress(response.content) == _get(prerendered=False).content
+
+    small = PrerenderedResponse.encode({'title': 'Backend Engineer'})
+    assert small['gzip'] is None
+
+
+@pytest.mark.parametrize('accept, expected', [
+    ('application/json; indent=2', b'\n  "title": "Backend Engineer"'),
+    ('text/html', b'Backend Engineer'),
+])
+def test_other_renderers_render_the_data(accept, expected):
+    response = _get(HTTP_ACCEPT=accept, HTTP_ACCEPT_ENCODING='gzip')
+    assert 'Content-Encoding' not in response
+    assert expected in response.content
@@ -0,0 +1,96 @@
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import ExchangeRate, JobAlert, JobPosting, User
+
+
+@pytest.fixture
+def employer():
+    user = User.objects.create_user(email='salary@example.com', password='pw', role='EMPLOYER')
+    return user.employer_profile
+
+
+def _make_job(employer, **fields):
+    defaults = {
+        'title': 'Job', 'description': 'Desc', 'status': JobPosting.Status.ACTIVE,
+        'employment_type': 'FULL_TIME', 'job_type': 'REMOTE', 'experience_level': 'SENIOR',
+    }
+    defaults.update(fields)
+    return JobPosting.objects.create(employer=employer, **defaults)
+
+
+@pytest.mark.django_db
+def test_salary_is_normalized_on_save(employer):
+    ExchangeRate.objects.create(currency='EUR', rate=Decimal('1.10'))
+
+    job = _make_job(employer, salary_min=50000, salary_max=80000, currency='EUR')
+    assert (job.salary_min_base, job.salary_max_base) == (Decimal('55000.00'), Decimal('88000.00'))
+
+    job.currency = 'GBP'
+    job.save(update_fields=['currency'])
+    job.refresh_from_db()
+    assert job.salary_min_base is None and job.salary_max_base is None
+
+
+@pytest.mark.django_db
+def test_loading_rates_recomputes_jobs_in_bulk(employer, tmp_path):
+    usd = _make_job(employer, salary_min=1000, salary_max=2000)
+    ghs = _make_job(employer, salary_min=10000, salary_max=20000, currency='GHS')
+    assert ghs.salary_max_base is None
+
+    rates = tmp_path / 'rates.csv'
+    rates.write_text('currency,rate\nghs,0.08\n')
+    call_command('load_exchange_rates', str(rates), stdout=StringIO())
+
+    ghs.refresh_from_db()
+    assert (ghs.salary_min_base, ghs.salary_max_base) == (Decimal('800.00'), Decimal('1600.00'))
+
+    call_command('load_exchange_rates', rate=['GHS=0.1'], stdout=StringIO())
+    ghs.refresh_from_db()
+    usd.refresh_from_db()
+    assert ghs.salary_max_base == Decimal('2000.00')
+    assert usd.salary_max_base == Decimal('2000.00')
+
+
+@pytest.mark.django_db
+def test_rate_change_recomputes_jobs_in_any_case_with_rounding(employer):
+    rate = ExchangeRate.objects.create(currency='EUR', rate=Decimal('1.10'))
+    job = _make_job(employer, salary_min=50001, salary_max=80001, currency='eur')
+
+    rate.rate = Decimal('1.123455')
+    rate.save()
+
+    job.refresh_from_db()
+    assert (job.salary_min_base, job.salary_max_base) == (
+        ExchangeRate.convert(job.salary_min, rate.rate), ExchangeRate.convert(job.salary_max, rate.rate),
+    )
+    assert job.salary_min_base == Decimal('56173.87')
+
+
+@pytest.mark.django_db
+def test_salary_filters_compare_in_base_currency(employer):
+    ExchangeRate.objects.create(currency='EUR', rate=Decimal('1.10'))
+    eur = _make_job(employer, salary_min=70000, salary_max=75000, currency='EUR')
+    _make_job(employer, salary_min=70000, salary_max=75000)
+
+    response = APIClient().get(reverse('jobs-list'), {'salary_min': 80000})
+
+    assert [job['id'] for job in response.data['results']] == [eur.id]
+
+
+@pytest.mark.django_db
+def test_job_alerts_match_on_normalized_salary(employer):
+    candidate = User.objects.create_user(email='alerts@example.com', password='pw', role='CANDIDATE').candidate
+    ExchangeRate.objects.create(currency='EUR', rate=Decimal('1.10'))
+    job = _make_job(employer, salary_min=70000, salary_max=75000, currency='EUR')
+
+    reachable = JobAlert.objects.create(candidate=candidate, alert_name='80k', salary_min=80000)
+    any_salary = JobAlert.objects.create(candidate=candidate, alert_name='Any')
+    JobAlert.objects.create(candidate=candidate, alert_name='90k', salary_min=90000)
+
+    assert set(JobAlert.matching_salary(job)) == {reachable, any_salary}
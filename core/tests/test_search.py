@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import JobPosting, User
+from core.search import JobSearch
+
+
+@pytest.fixture
+def employer():
+    user = User.objects.create_user(email='search@example.com', password='pw', role='EMPLOYER')
+    return user.employer_profile
+
+
+def _make_job(employer, title, description='Desc', age_days=0, **fields):
+    defaults = {
+        'status': JobPosting.Status.ACTIVE, 'posted_at': timezone.now() - timedelta(days=age_days),
+        'employment_type': 'FULL_TIME', 'job_type': 'REMOTE', 'experience_level': 'SENIOR',
+    }
+    defaults.update(fields)
+    return JobPosting.objects.create(employer=employer, title=title, description=description, **defaults)
+
+
+def _search(query, **params):
+    response = APIClient().get(reverse('jobs-list'), {'q': query, **params})
+    assert response.status_code == 200
+    return response
+
+
+def test_search_document_flattens_json_lists():
+    job = JobPosting(
+        title='Backend Engineer', description='Build APIs',
+        requirements=['Django', 'MySQL'], responsibilities=['Code review'],
+    )
+    assert job.get_search_document() == 'Backend Engineer\nBuild APIs\nDjango\nMySQL\nCode review'
+
+
+def test_rank_blends_relevance_with_recency(settings):
+    settings.JOB_SEARCH_RECENCY_WEIGHT = 0.5
+    now = timezone.now()
+    ranked = JobSearch.rank([
+        (1, now - timedelta(days=365), 10.0),
+        (2, now, 8.0),
+    ])
+    assert [job_id for job_id, _ in ranked] == [2, 1]
+
+
+@pytest.mark.django_db
+def test_search_matches_title_description_and_requirements(employer):
+    by_title = _make_job(employer, 'Django Developer')
+    by_requirement = _make_job(employer, 'Backend Engineer', requirements=['Django', 'REST'])
+    _make_job(employer, 'Accountant', description='Spreadsheets')
+
+    ids = [job['id'] for job in _search('django').data['results']]
+
+    assert ids == [by_title.id, by_requirement.id]
+
+
+@pytest.mark.django_db
+def test_search_index_follows_saves_and_deletes(employer):
+    job = _make_job(employer, 'Python Developer')
+
+    job.title = 'Golang Developer'
+    job.save()
+    assert _search('python').data['results'] == []
+    assert [item['id'] for item in _search('golang').data['results']] == [job.id]
+
+    job.delete()
+    assert _search('golang').data['results'] == []
+
+
+@pytest.mark.django_db
+def test_fts_table_is_looked_up_once(employer, monkeypatch):
+    _make_job(employer, 'Python Developer')
+
+    monkeypatch.setattr(connection.introspection, 'table_names',
+                        lambda *args, **kwargs: pytest.fail('catalog queried again'))
+    job = _make_job(employer, 'Golang Developer')
+    assert [item['id'] for item in _search('golang').data['results']] == [job.id]
+
+
+@pytest.mark.django_db
+def test_search_respects_filters_and_pages(employer):
+    for index in range(3):
+        _make_job(employer, f'Data Engineer {index}', age_days=index)
+    _make_job(employer, 'Data Engineer contract', employment_type='CONTRACT')
+
+    first = _search('data', employment_type='FULL_TIME', page_size=2).data
+    second = APIClient().get(first['next']).data
+
+    ids = [job['id'] for job in first['results'] + second['results']]
+    assert len(ids) == len(set(ids)) == 3
+    assert second['next'] is None
+
+
+@pytest.mark.django_db
+def test_closed_matches_do_not_crowd_out_active_ones(employer, settings):
+    settings.JOB_SEARCH_MAX_RESULTS = 2
+    # Closed jobs that are better matches than the active one
+    for index in range(3):
+        _make_job(employer, f'Python Developer {index}', description='Python, Python and Python',
+                  status=JobPosting.Status.CLOSED)
+    active = _make_job(employer, 'Senior Backend Developer', description='Python among many other things')
+
+    assert [job['id'] for job in _search('python').data['results']] == [active.id]
+
+
+@pytest.mark.django_db
+def test_facets_count_every_match_beyond_the_ranking_cap(employer, settings):
+    settings.JOB_SEARCH_MAX_RESULTS = 2
+    for index in range(3):
+        _make_job(employer, f'Python Developer {index}')
+    _make_job(employer, 'Accountant')
+
+    data = APIClient().get(reverse('jobs-facets'), {'q': 'python'}).data
+    assert data['total'] == 3
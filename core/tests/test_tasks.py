@@ -0,0 +1,196 @@
+import multiprocessing
+
+import pytest
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from core.emails import JobMatchEmail
+from core.management.commands import run_worker
+from core.models import Application, JobPosting, Task, User
+from core.tasks import TaskQueue, deliver_email, notify_matching_candidates
+
+calls = []
+
+
+@TaskQueue.register(max_attempts=2)
+def record(value, fail=False):
+    calls.append(value)
+    if fail:
+        raise ValueError('failed on purpose')
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def run_due():
+    for task in TaskQueue.claim(limit=10):
+        TaskQueue.run(task)
+
+
+@pytest.mark.django_db
+def test_enqueued_task_runs_once():
+    task = TaskQueue.enqueue(record, value='a')
+    run_due()
+    run_due()
+
+    task.refresh_from_db()
+    assert calls == ['a']
+    assert (task.status, task.attempts) == (Task.Status.DONE, 1)
+
+
+@pytest.mark.django_db
+def test_failures_back_off_then_fail_for_good():
+    task = TaskQueue.enqueue(record, value='b', fail=True)
+    run_due()
+
+    task.refresh_from_db()
+    assert task.status == Task.Status.PENDING
+    assert task.run_at > timezone.now()
+    assert 'failed on purpose' in task.last_error
+
+    Task.objects.filter(pk=task.pk).update(run_at=timezone.now())
+    run_due()
+    task.refresh_from_db()
+    assert task.status == Task.Status.FAILED
+    assert calls == ['b', 'b']
+
+
+@pytest.mark.django_db
+def test_expired_claim_is_claimed_again():
+    task = TaskQueue.enqueue(record, value='c')
+    claimed, = TaskQueue.claim()
+    assert TaskQueue.claim() == []
+
+    # The worker holding it died
+    Task.objects.filter(pk=task.pk).update(locked_until=timezone.now())
+    reclaimed, = TaskQueue.claim()
+    assert reclaimed.attempts == 2
+
+    # The first worker, coming back late, neither runs it nor records an
+    # outcome over the new claim
+    assert TaskQueue.run(claimed) is False
+    assert Task.objects.get(pk=task.pk).status == Task.Status.RUNNING
+    TaskQueue.run(reclaimed)
+    assert Task.objects.get(pk=task.pk).status == Task.Status.DONE
+    assert calls == ['c']
+
+
+@pytest.mark.django_db
+def test_running_task_holds_its_row_lock(monkeypatch):
+    """
+    claim() skips locked rows, so a run that outlives its claim is not taken
+    over. SQLite has no row locks, so this checks that the lock is asked for.
+    """
+    locked = []
+    select_for_update = QuerySet.select_for_update
+
+    def spy(queryset, *args, **kwargs):
+        locked.append((queryset.model, kwargs))
+        return select_for_update(queryset, *args, **kwargs)
+
+    TaskQueue.enqueue(record, value='d')
+    claimed, = TaskQueue.claim()
+    monkeypatch.setattr(QuerySet, 'select_for_update', spy)
+    assert TaskQueue.run(claimed)
+    assert locked == [(Task, {})]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_worker_drains_the_queue():
+    for value in range(5):
+        TaskQueue.enqueue(record, value=value)
+
+    # One worker: SQLite locks whole tables under concurrent writers
+    call_command('run_worker', concurrency=1, once=True, poll_interval=0)
+    assert sorted(calls) == list(range(5))
+    assert not Task.objects.exclude(status=Task.Status.DONE).exists()
+
+
+def test_process_workers_set_up_django_under_spawn():
+    context = multiprocessing.get_context('spawn')
+    stop = context.Event()
+    stop.set()
+    worker = context.Process(target=run_worker.Command.work, args=(stop, 1, 0, True))
+    worker.start()
+    worker.join(timeout=60)
+    assert worker.exitcode == 0
+
+
+@pytest.mark.django_db
+def test_signals_only_enqueue():
+    employer = User.objects.create_user(email='hire@example.com', password='pw', role='EMPLOYER')
+    candidate = User.objects.create_user(email='apply@example.com', password='pw', role='CANDIDATE')
+    job = JobPosting.objects.create(employer=employer.employer_profile, title='Job', description='Desc',
+                                    status=JobPosting.Status.ACTIVE)
+    Application.objects.create(candidate=candidate.candidate, job=job)
+
+    assert sorted(Task.objects.values_list('name', flat=True)) == sorted([
+        TaskQueue.name_of(notify_matching_candidates), TaskQueue.name_of(deliver_email),
+    ])
+
+
+@pytest.mark.django_db
+def test_match_fan_out_writes_in_batches(monkeypatch, django_assert_max_num_queries):
+    from core.matching import SkillIndex
+    from core.models import CandidateSkill, JobNotification, JobSkill, Skill
+    from core import tasks
+
+    monkeypatch.setattr(SkillIndex, '_postings', None)
+    python, go = Skill.objects.create(name='Python'), Skill.objects.create(name='Go')
+    employer = User.objects.create_user(email='hire@example.com', password='pw', role='EMPLOYER')
+    job = JobPosting.objects.create(employer=employer.employer_profile, title='Job', description='Desc',
+                                    status=JobPosting.Status.ACTIVE)
+    JobSkill.objects.create(job=job, skill=python, is_required=True)
+    JobSkill.objects.create(job=job, skill=go, is_required=False)
+
+    candidates = [
+        User.objects.create_user(email=f'c{index}@example.com', password='pw', role='CANDIDATE').candidate
+        for index in range(5)
+    ]
+    for profile in candidates[:4]:
+        CandidateSkill.objects.create(candidate=profile, skill=python)
+    CandidateSkill.objects.create(candidate=candidates[0], skill=go)
+    # Only optional skills: no match
+    CandidateSkill.objects.create(candidate=candidates[4], skill=go)
+    JobNotification.objects.create(candidate=candidates[3], job_posting=job)
+    Task.objects.all().delete()
+
+    with django_assert_max_num_queries(8):
+        tasks.notify_matching_candidates(job.id)
+
+    assert set(JobNotification.objects.values_list('candidate_id', flat=True)) == {c.id for c in candidates[:4]}
+    # One email task for the batch, the skills are per recipient
+    task = Task.objects.get()
+    assert task.name == TaskQueue.name_of(tasks.deliver_email_batch)
+    assert JobMatchEmail.SKILLS_HTML_TAG in task.payload['html']
+    assert JobMatchEmail.SKILLS_TEXT_TAG in task.payload['text']
+    assert {email: substitutions[JobMatchEmail.SKILLS_TEXT_TAG] for email, substitutions in task.payload['recipients']} == {
+        'c0@example.com': '- Python\n- Go',
+        'c1@example.com': '- Python',
+        'c2@example.com': '- Python',
+    }
+
+
+@pytest.mark.django_db
+def test_job_match_email_renders_the_job_once(settings):
+    settings.FRONTEND_URL = 'https://jobs.example.com/'
+    employer = User.objects.create_user(email='hire@example.com', password='pw', role='EMPLOYER')
+    employer.employer_profile.company_name = 'Acme & Sons'
+    employer.employer_profile.save()
+    job = JobPosting.objects.create(employer=employer.employer_profile, title='Dev <Ops>', description='x' * 300,
+                                    city='Berlin', country='Germany')
+
+    email = JobMatchEmail(job)
+    assert email.substitutions(['C++', 'Go']) is email.substitutions(['C++', 'Go'])
+
+    subject, html, text = email.render(['C++', '<script>'])
+    assert subject == 'New Job Match: Dev <Ops>'
+    assert 'Dev &lt;Ops&gt;' in html and 'Acme &amp; Sons' in html and 'Berlin, Germany' in html
+    assert '<li>C++</li><li>&lt;script&gt;</li>' in html
+    assert f'href="https://jobs.example.com/jobs/{job.id}"' in html
+    assert 'x' * 200 not in html
+    assert 'Dev <Ops>\nCompany: Acme & Sons\n' in text
+    assert '- C++\n- <script>\n' in text
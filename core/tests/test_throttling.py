@@ -0,0 +1,47 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import throttling
+from core.throttling import TokenBucketThrottle
+
+
+@pytest.fixture
+def rates(monkeypatch):
+    monkeypatch.setattr(TokenBucketThrottle, 'THROTTLE_RATES', {'login': '3/min'})
+
+
+def login(ip):
+    return APIClient().post(reverse('auth-login'), {'email': 'nobody@example.com', 'password': 'wrong'},
+                            REMOTE_ADDR=ip)
+
+
+@pytest.mark.django_db
+def test_login_burst_is_throttled_with_retry_after(rates):
+    for _ in range(3):
+        assert login('10.0.0.1').status_code == 400
+
+    response = login('10.0.0.1')
+    assert response.status_code == 429
+    assert 0 < int(response['Retry-After']) <= 20
+
+    # Buckets are per client
+    assert login('10.0.0.2').status_code == 400
+
+
+def test_bucket_refills_at_the_rate(rates, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(throttling.time, 'time', lambda: now[0])
+    bucket = throttling.TokenBucket('throttle:login:test-refill', 3, 60)
+    bucket.cache.delete(bucket.key)
+
+    assert [bucket.consume() for _ in range(4)] == [0, 0, 0, 20_000]
+
+    now[0] += 20
+    assert bucket.consume() == 0
+    assert bucket.consume() == 20_000
+
+    # Taking several tokens at once needs room for all of them
+    now[0] += 40
+    assert bucket.consume(3) == 20_000
+    assert bucket.consume(2) == 0
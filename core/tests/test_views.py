@@ -1,8 +1,13 @@
 import pytest
+from datetime import timedelta
+from django.utils import timezone
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
-from core.models import Application, JobPosting
+from core.caching import ComputedCache
+from core.services import JobDetailService
+from core.models import Application, Category, JobPosting, JobSkill, Skill
 
 User = get_user_model()
 
@@ -81,4 +86,298 @@ def test_me_endpoint_unauthenticated():
     url = reverse('auth-me')
     response = client.get(url)
     
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+def _create_active_jobs(count, employer_email='jobs@example.com'):
+    employer_user = User.objects.create_user(email=employer_email, password='password', role='EMPLOYER')
+    employer_profile = employer_user.employer_profile
+    employer_profile.company_name = 'Co'
+    employer_profile.save()
+
+    posted_at = timezone.now()
+    return [
+        JobPosting.objects.create(
+            employer=employer_profile, title=f'Job {i}', description='Desc',
+            status=JobPosting.Status.ACTIVE, posted_at=posted_at - timedelta(minutes=i // 2),
+            employment_type='FULL_TIME', job_type='REMOTE', experience_level='SENIOR',
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_job_list_cursor_pagination_walks_every_job_once():
+    jobs = _create_active_jobs(7)
+    client = APIClient()
+
+    seen = []
+    url = reverse('jobs-list') + '?page_size=3'
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.data['results']) <= 3
+        seen.extend(job['id'] for job in response.data['results'])
+        url = response.data['next']
+
+    # Newest first, ties on posted_at broken by descending id
+    expected = sorted(jobs, key=lambda job: (job.posted_at, job.id), reverse=True)
+    assert seen == [job.id for job in expected]
+
+
+@pytest.mark.django_db
+def test_job_list_cursor_is_stable_when_jobs_are_inserted():
+    jobs = _create_active_jobs(4)
+    client = APIClient()
+
+    first_page = client.get(reverse('jobs-list') + '?page_size=2').data
+    JobPosting.objects.create(
+        employer=jobs[0].employer, title='Newer', description='Desc',
+        status=JobPosting.Status.ACTIVE, posted_at=timezone.now() + timedelta(hours=1),
+        employment_type='FULL_TIME', job_type='REMOTE', experience_level='SENIOR',
+    )
+    second_page = client.get(first_page['next']).data
+
+    first_ids = [job['id'] for job in first_page['results']]
+    second_ids = [job['id'] for job in second_page['results']]
+    assert not set(first_ids) & set(second_ids)
+    assert len(first_ids + second_ids) == 4
+
+    previous_page = client.get(second_page['previous']).data
+    assert [job['id'] for job in previous_page['results']] == first_ids
+
+
+@pytest.mark.django_db
+def test_job_list_page_size_is_capped(settings):
+    settings.JOB_LIST_MAX_PAGE_SIZE = 2
+    _create_active_jobs(3)
+
+    response = APIClient().get(reverse('jobs-list') + '?page_size=50')
+
+    assert len(response.data['results']) == 2
+    assert response.data['next'] is not None
+
+
+@pytest.mark.django_db
+def test_job_list_rejects_invalid_cursor():
+    response = APIClient().get(reverse('jobs-list') + '?cursor=not-a-cursor')
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_job_facets_count_active_jobs_for_current_filters():
+    cache.clear()
+    jobs = _create_active_jobs(3)
+    parent = Category.objects.create(name='Technology')
+    child = Category.objects.create(name='Web Development', parent=parent)
+    jobs[0].categories.add(parent, child)
+    jobs[1].categories.add(child)
+    JobPosting.objects.filter(pk=jobs[2].pk).update(employment_type='CONTRACT', country='Ghana')
+
+    data = APIClient().get(reverse('jobs-facets')).data
+
+    employment = {item['value']: item['count'] for item in data['employment_type']}
+    assert employment['FULL_TIME'] == 2
+    assert employment['CONTRACT'] == 1
+    assert employment['INTERNSHIP'] == 0
+    assert data['country'] == [{'value': 'Ghana', 'count': 1}]
+    assert [(item['label'], item['count']) for item in data['category']] == [('Technology', 2)]
+    assert data['total'] == 3
+
+    filtered = APIClient().get(reverse('jobs-facets'), {'employment_type': 'CONTRACT'}).data
+    assert filtered['total'] == 1
+
+
+@pytest.mark.django_db
+def test_job_facets_cache_is_invalidated_on_status_change():
+    cache.clear()
+    jobs = _create_active_jobs(2)
+    client = APIClient()
+    assert client.get(reverse('jobs-facets')).data['total'] == 2
+
+    job = JobPosting.objects.get(pk=jobs[0].pk)
+    job.status = JobPosting.Status.CLOSED
+    job.save()
+
+    assert client.get(reverse('jobs-facets')).data['total'] == 1
+
+
+# ETag validators + jobs page + categories (with parents) + required skills
+JOB_LIST_QUERY_BUDGET = 4
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('job_count', [1, 20])
+def test_job_list_query_count_does_not_grow_with_page_size(job_count, django_assert_num_queries):
+    jobs = _create_active_jobs(job_count)
+    parent = Category.objects.create(name='Technology')
+    child = Category.objects.create(name='Web Development', parent=parent)
+    skill = Skill.objects.create(name='Python')
+    for job in jobs:
+        job.categories.add(parent, child)
+        JobSkill.objects.create(job=job, skill=skill)
+
+    client = APIClient()
+    with django_assert_num_queries(JOB_LIST_QUERY_BUDGET):
+        response = client.get(reverse('jobs-list'), {'page_size': job_count})
+
+    assert len(response.data['results']) == job_count
+    assert response.data['results'][0]['categories'][1]['parent_name'] == 'Technology'
+    assert response.data['results'][0]['required_skills'] == [skill.id]
+
+
+@pytest.mark.django_db
+def test_job_detail_is_read_through_cached(django_assert_num_queries, monkeypatch):
+    cache.clear()
+    job = _create_active_jobs(1)[0]
+    client = APIClient()
+    url = reverse('jobs-detail', args=[job.id])
+
+    first = client.get(url)
+    # A fresh entry is served as looked up, without reading it again
+    monkeypatch.setattr(JobDetailService, 'get', lambda job_id: pytest.fail('entry read twice'))
+    with django_assert_num_queries(0):
+        second = client.get(url)
+
+    assert first.status_code == second.status_code == 200
+    assert second.data == first.data
+    assert ComputedCache.get(f'job_{job.id}:body')['body']['content'] == second.content
+
+
+@pytest.mark.django_db
+def test_job_detail_cache_follows_related_changes():
+    cache.clear()
+    job = _create_active_jobs(1)[0]
+    category = Category.objects.create(name='Engineering')
+    job.categories.add(category)
+    client = APIClient()
+    url = reverse('jobs-detail', args=[job.id])
+    client.get(url)
+
+    skill = Skill.objects.create(name='Go')
+    JobSkill.objects.create(job=job, skill=skill)
+    assert client.get(url).data['required_skills'][0]['skill']['name'] == 'Go'
+
+    category.name = 'Software Engineering'
+    category.save()
+    assert client.get(url).data['categories'][0]['name'] == 'Software Engineering'
+
+    employer = job.employer
+    employer.company_name = 'Renamed Co'
+    employer.save()
+    assert client.get(url).data['employer']['company_name'] == 'Renamed Co'
+
+
+@pytest.mark.django_db
+def test_job_list_card_view_returns_projection(django_assert_num_queries):
+    jobs = _create_active_jobs(2)
+    JobPosting.objects.filter(pk=jobs[0].pk).update(
+        city='Accra', country='Ghana', salary_min=1000, salary_max=2500, is_salary_disclosed=True,
+    )
+
+    client = APIClient()
+    # ETag validators + the card projection
+    with django_assert_num_queries(2):
+        response = client.get(reverse('jobs-list'), {'view': 'card'})
+
+    cards = {card['id']: card for card in response.data['results']}
+    card = cards[jobs[0].id]
+    assert set(card) == {
+        'id', 'title', 'company_name', 'company_logo', 'location_display', 'salary_range', 'posted_at',
+    }
+    assert card['company_name'] == 'Co'
+    assert card['location_display'] == 'Accra, Ghana'
+    assert card['salary_range'] == 'USD 1,000 - 2,500'
+    assert cards[jobs[1].id]['location_display'] == 'Remote'
+
+
+@pytest.mark.django_db
+def test_job_list_answers_conditional_get_before_serializing(django_assert_num_queries):
+    jobs = _create_active_jobs(2)
+    client = APIClient()
+    url = reverse('jobs-list')
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first['ETag'] and first['Last-Modified']
+
+    with django_assert_num_queries(1):
+        cached = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+    assert cached.status_code == 304
+    assert cached['ETag'] == first['ETag']
+
+    # Different filters are a different representation
+    assert client.get(url, {'job_type': 'REMOTE'})['ETag'] != first['ETag']
+
+    jobs[0].title = 'Renamed'
+    jobs[0].save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code == 200
+
+    second = client.get(url)
+    jobs[1].delete()
+    assert client.get(url, HTTP_IF_NONE_MATCH=second['ETag']).status_code == 200
+
+
+@pytest.mark.django_db
+def test_job_detail_etag_follows_related_changes(django_assert_num_queries):
+    cache.clear()
+    job = _create_active_jobs(1)[0]
+    client = APIClient()
+    url = reverse('jobs-detail', args=[job.id])
+
+    first = client.get(url)
+    with django_assert_num_queries(0):
+        assert client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code == 304
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified']).status_code == 304
+
+    JobSkill.objects.create(job=job, skill=Skill.objects.create(name='Rust'))
+    second = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+    assert second.status_code == 200
+    assert second['ETag'] != first['ETag']
+
+    # Cold cache: the validator query alone answers the 304
+    cache.clear()
+    with django_assert_num_queries(1):
+        assert client.get(url, HTTP_IF_NONE_MATCH=second['ETag']).status_code == 304
+
+
+@pytest.mark.django_db
+def test_partial_job_save_moves_updated_at():
+    job = _create_active_jobs(1)[0]
+    before = job.updated_at
+
+    job.applications_count = 5
+    job.save(update_fields=['applications_count'])
+
+    job.refresh_from_db()
+    assert job.updated_at > before
+
+
+@pytest.mark.django_db
+def test_profile_answers_conditional_get():
+    user = User.objects.create_user(email='etag@example.com', password='pw', role='EMPLOYER')
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = reverse('auth-profile')
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code == 304
+
+    profile = user.employer_profile
+    profile.company_name = 'New Name'
+    profile.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code == 200
+
+
+@pytest.mark.django_db
+def test_cache_metrics_endpoint_is_staff_only():
+    user = User.objects.create_user(email='ops@example.com', password='secret', role='ADMIN')
+    client = APIClient()
+    client.force_authenticate(user=user)
+    assert client.get(reverse('cache-metrics-list')).status_code == 403
+
+    user.is_staff = True
+    cache.get('user_login_data:1')
+    response = client.get(reverse('cache-metrics-list'))
+    assert response.status_code == 200
+    assert 'user_login_data:*' in [row['pattern'] for row in response.data['patterns']]
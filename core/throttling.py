@@ -0,0 +1,118 @@
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import SimpleRateThrottle
+
+# GCRA in one round trip: the key holds the bucket's theoretical arrival time
+# (TAT) in milliseconds of Redis' own clock, so workers never disagree on now.
+# Returns 0 when the tokens are taken, otherwise the milliseconds to wait.
+GCRA_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local tokens = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval * tokens
+local allow_at = new_tat - burst
+if now < allow_at then return allow_at - now end
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return 0
+"""
+
+
+class TokenBucket:
+    """
+    Token bucket kept in the shared cache, so every worker draws from the
+    same bucket.
+
+    ``TokenBucket(key, 10, 60)`` holds 10 tokens refilled at one token every
+    6 seconds: bursts up to the bucket size go through, after that takers are
+    spaced out at the refill rate. The bucket is tracked the GCRA way, as the
+    single timestamp at which it would be full again, so taking tokens is one
+    Lua script call on Redis. Other backends read and write that timestamp
+    without atomicity, which is good enough for local runs.
+    """
+    cache_alias = 'shared'
+
+    _script = None
+
+    def __init__(self, key, rate, period):
+        self.cache = caches[self.cache_alias]
+        self.key = key
+        self.interval = period * 1000 // rate
+        self.burst = period * 1000
+
+    def consume(self, tokens=1):
+        """Take ``tokens``; returns 0, or the milliseconds until they are available"""
+        if isinstance(self.cache, RedisCache):
+            return self._consume_redis(tokens)
+        return self._consume(tokens)
+
+    def _consume_redis(self, tokens):
+        key = self.cache.make_and_validate_key(self.key)
+        client = self.cache._cache.get_client(key, write=True)
+        if TokenBucket._script is None:
+            TokenBucket._script = client.register_script(GCRA_SCRIPT)
+        return TokenBucket._script(keys=[key], args=[self.interval, self.burst, tokens], client=client)
+
+    def _consume(self, tokens):
+        now = int(time.time() * 1000)
+        tat = max(self.cache.get(self.key, now), now)
+        new_tat = tat + self.interval * tokens
+        allow_at = new_tat - self.burst
+        if now < allow_at:
+            return allow_at - now
+        self.cache.set(self.key, new_tat, timeout=(new_tat - now) / 1000)
+        return 0
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Throttle drawing from a ``TokenBucket`` per scope and per client: the user
+    for authenticated requests, the client IP otherwise. A rate of ``10/min``
+    is a bucket of 10 tokens refilled at one token every 6 seconds. Rates
+    come from ``DEFAULT_THROTTLE_RATES``.
+    """
+    cache_format = 'throttle:{scope}:{ident}'
+
+    def __init__(self):
+        super().__init__()
+        self.wait_seconds = None
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return self.cache_format.format(scope=self.scope, ident=ident)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        wait = TokenBucket(key, self.num_requests, self.duration).consume()
+        if wait:
+            self.wait_seconds = wait / 1000
+            return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class LoginRateThrottle(TokenBucketThrottle):
+    scope = 'login'
+
+
+class RegisterRateThrottle(TokenBucketThrottle):
+    scope = 'register'
+
+
+class ApplyRateThrottle(TokenBucketThrottle):
+    scope = 'apply'
@@ -1,12 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AuthViewSet, JobView
+from .views import AuthViewSet, CacheMetricsView, JobView
 
 
 # Create a router and register viewsets
 router = DefaultRouter()
 router.register(r'auth', AuthViewSet, basename='auth')
 router.register(r'jobs', JobView, basename='jobs')
+router.register(r'cache-metrics', CacheMetricsView, basename='cache-metrics')
 
 urlpatterns = [
     path('', include(router.urls)),
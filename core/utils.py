@@ -1,10 +1,12 @@
 import boto3
+import hashlib
 from django.conf import settings
 from django.core.mail import send_mail
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 import logging
-import os
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+
+from .mailer import SendGridMailer
 
 
 logger = logging.getLogger(__name__)
@@ -41,37 +43,48 @@ def generate_resume_url(key, expires=3600):
 
 def send_email(email_address, subject, body, html=True):
     """
-    Sends an email to the specified address.
+    Sends an email to the specified address. Returns whether it was sent.
     """
-
-    
     try:
         if html:
-            message = Mail(
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to_emails=email_address,
-                subject=subject,
-                html_content=body
-            )
-            sg = SendGridAPIClient(os.getenv('SENDGRID_API_KEY'))
-            response = sg.send(message)
-            logger.info(response.status_code)
-            logger.info(response.body)
-            logger.info(response.headers)
+            SendGridMailer.send(subject, [email_address], html=body)
         else:
-            message = Mail(
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to_emails=[email_address],
-                subject=subject,
-                plain_text_content=body
-            )
-            sg = SendGridAPIClient(os.getenv('SENDGRID_API_KEY'))
-            response = sg.send(message)
-            logger.info(response.status_code)
-            logger.info(response.body)
-            logger.info(response.headers)
-        logger.info(f"Email sent successfully to {email_address}")
+            SendGridMailer.send(subject, [email_address], text=body)
         return True
     except Exception as e:
         logger.error(f"Failed to send email to {email_address}: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+def make_etag(*parts):
+    """
+    Build a strong ETag from the values a representation depends on.
+    """
+    digest = hashlib.sha1(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return quote_etag(digest)
+
+
+def set_validators(response, etag, last_modified=None):
+    """
+    Set the ETag and Last-Modified headers on a response.
+    """
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified_response(request, etag, last_modified=None):
+    """
+    Answer a conditional GET from its validators alone.
+
+    Returns a 304 response when the client's If-None-Match / If-Modified-Since
+    headers still match, or None when the full response has to be built.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
@@ -3,7 +3,7 @@ from rest_framework.viewsets import ModelViewSet, GenericViewSet
 from rest_framework.decorators import action
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from .serializer import (
     LoginSerializer, 
     RegisterSerializer, 
@@ -23,11 +23,25 @@ from .services import (
     ApplicationService, 
     NotificationService,
     ReviewService,
+    JobFacetService,
+    JobCardService,
+    JobDetailService,
 )
 from .models import JobPosting, CandidateProfile, EmployerProfile, Notification, Application
 from rest_framework.parsers import MultiPartParser, FormParser
-from .utils import generate_resume_url
-from django.core.cache import cache
+from .utils import generate_resume_url, make_etag, not_modified_response, set_validators
+from .pagination import JobCursorPagination
+from .filters import JobFilter
+from .search import JobSearch
+from .authentication import TokenDenyList
+from .cache_backends import InstrumentedCache
+from .caching import ComputedCache
+from .responses import PrerenderedResponse
+from .throttling import ApplyRateThrottle, LoginRateThrottle, RegisterRateThrottle
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max
+from rest_framework.exceptions import NotFound
 
 
 class AuthViewSet(GenericViewSet):
@@ -46,19 +60,18 @@ class AuthViewSet(GenericViewSet):
         return LoginSerializer # Default serializer
 
 
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['post'], throttle_classes=[LoginRateThrottle])
     def login(self, request):
         serializer = self.get_serializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
         access_token = serializer.validated_data['access']
         refresh_token = serializer.validated_data['refresh']
-        cache_key = f"user_login_data:{user.id}"
-        user_data = cache.get(cache_key)
-        if not user_data:
-            user_data = UserSerializer(user).data
-            cache.set(cache_key, user_data, timeout=60 * 60)
-        
+        user_data = ComputedCache.get_or_compute(
+            f"user_login_data:{user.id}", lambda: UserSerializer(user).data, timeout=60 * 60,
+            tags=[f'user:{user.id}'],
+        )
+
         return Response({
             'user': user_data,
             'access': access_token,
@@ -68,11 +81,10 @@ class AuthViewSet(GenericViewSet):
     @action(detail=False, methods=['get'])
     def me(self, request):
         user = request.user
-        cache_key = f"user_login_data:{user.id}"
-        user_data = cache.get(cache_key)
-        if not user_data:
-            user_data = UserSerializer(user).data
-            cache.set(cache_key, user_data, timeout=60 * 60)
+        user_data = ComputedCache.get_or_compute(
+            f"user_login_data:{user.id}", lambda: UserSerializer(user).data, timeout=60 * 60,
+            tags=[f'user:{user.id}'],
+        )
         return Response({
             'user': user_data,
         }, status=status.HTTP_200_OK)
@@ -82,61 +94,66 @@ class AuthViewSet(GenericViewSet):
     def profile(self, request):
         """Get current user's profile"""
         user = request.user
-        cache_key = f"user_profile:{user.id}"
-
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-
-        if user.is_candidate:
-            try:
-                profile = (
-                    CandidateProfile.objects
-                    .select_related('user')
-                    .prefetch_related(
-                        'candidate_skills__skill',
-                        'education',
-                        'certifications',
-                        'addresses'
-                    )
-                    .get(user=user)
-                )
-                serializer = CandidateProfileSerializer(profile)
+        if not (user.is_candidate or user.is_employer):
+            return Response(
+                {'error': 'User role not recognized'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-            except CandidateProfile.DoesNotExist:
-                return Response(
-                    {'error': 'Candidate profile not found'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
+        # Profile edits save the profile row, so its updated_at validates the
+        # response; the user fields shown alongside are already loaded
+        profile_model = CandidateProfile if user.is_candidate else EmployerProfile
+        profile_id, updated_at = profile_model.objects.filter(user=user).values_list(
+            'id', 'updated_at'
+        ).first() or (None, None)
+        etag = make_etag('profile', user.id, user.role, user.email, user.get_full_name(), updated_at)
+        not_modified = not_modified_response(request, etag, updated_at)
+        if not_modified is not None:
+            return not_modified
+
+        profile_tag = f"{'candidate' if user.is_candidate else 'employer'}:{profile_id}"
+        body = ComputedCache.get_or_compute(
+            f"user_profile:{user.id}:body",
+            lambda: PrerenderedResponse.encode(self._profile_data(user)),
+            timeout=60 * 60,  # 1 hour
+            tags=[f'user:{user.id}', profile_tag],
+        )
+        if body is None:
+            role = 'Candidate' if user.is_candidate else 'Employer'
+            return Response(
+                {'error': f'{role} profile not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
 
-        elif user.is_employer:
-            try:
-                profile = user.employer_profile
-                serializer = EmployerProfileSerializer(profile)
+        response = PrerenderedResponse(body, status=status.HTTP_200_OK)
+        return set_validators(response, etag, updated_at)
 
-            except EmployerProfile.DoesNotExist:
-                return Response(
-                    {'error': 'Employer profile not found'},
-                    status=status.HTTP_404_NOT_FOUND
+    @staticmethod
+    def _profile_data(user):
+        """Serialized profile of the user, or None if it does not exist"""
+        if user.is_candidate:
+            profile = (
+                CandidateProfile.objects
+                .select_related('user')
+                .prefetch_related(
+                    'candidate_skills__skill',
+                    'education',
+                    'certifications',
                 )
-
-        else:
-            return Response(
-                {'error': 'User role not recognized'},
-                status=status.HTTP_400_BAD_REQUEST
+                .filter(user=user)
+                .first()
             )
+            return CandidateProfileSerializer(profile).data if profile else None
 
-        cache.set(cache_key, serializer.data, timeout=60 * 60)  # 1 hour
-        return Response(serializer.data, status=status.HTTP_200_OK)    
-                
-        
+        # request.user only carries the profile id, load the whole row
+        profile = EmployerProfile.objects.filter(user=user).first()
+        return EmployerProfileSerializer(profile).data if profile else None
 
     @action(detail=False, methods=['patch', 'put'], parser_classes=[MultiPartParser, FormParser])
     def update_profile(self, request):
         """Update current user's profile"""
         user = request.user
         partial = request.method == 'PATCH'
-        cache_key = f"user_profile:{user.id}"
 
         if user.is_candidate:
             model = CandidateProfile
@@ -170,9 +187,6 @@ class AuthViewSet(GenericViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
-        # Invalidate cache after successful update
-        cache.delete(cache_key)
-
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['get'])
@@ -199,7 +213,7 @@ class AuthViewSet(GenericViewSet):
         data = SavedJobsService.get_saved_jobs(user, limit=None)
         return Response(data, status=status.HTTP_200_OK)
 
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['post'], throttle_classes=[RegisterRateThrottle])
     def register(self, request):
         serializer = self.get_serializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
@@ -208,6 +222,12 @@ class AuthViewSet(GenericViewSet):
             'user': UserSerializer(user).data,
         }, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['post'])
+    def logout(self, request):
+        """Revoke the access token the request was made with"""
+        TokenDenyList.revoke(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     @action(detail=False, methods=['post'])
     def refresh(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -217,6 +237,7 @@ class AuthViewSet(GenericViewSet):
 class JobView(ModelViewSet):
     queryset = JobPosting.objects.all()
     serializer_class = JobPostingSerializer
+    pagination_class = JobCursorPagination
 
     def get_serializer_class(self):
         if self.action in ['retrieve']:
@@ -225,15 +246,17 @@ class JobView(ModelViewSet):
 
     def get_permissions(self):
         # Public read access, authenticated write access
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'facets']:
             return [AllowAny()]
         return [IsAuthenticated()]
 
     def get_queryset(self):
         """Filter queryset based on user role"""
-        if self.action in ['list']:
+        if self.action in ['list', 'facets']:
             # Public: only show active jobs
             return self.queryset.filter(status=JobPosting.Status.ACTIVE, is_active=True)
+        elif self.action == 'retrieve':
+            return GetJobSerializer.setup_eager_loading(self.queryset)
         elif self.action in ['update', 'partial_update', 'destroy']:
             # Employer: only their own jobs
             if self.request.user.is_authenticated and self.request.user.is_employer:
@@ -241,10 +264,93 @@ class JobView(ModelViewSet):
         return self.queryset
 
     def list(self, request, *args, **kwargs):
-        """List all active jobs"""
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        """
+        List active jobs, newest first, one cursor page at a time.
+        With ``q`` the matches are ranked by relevance and recency instead.
+        ``view=card`` returns a lightweight projection for result cards.
+        """
+        queryset = JobFilter(request.query_params).apply(self.get_queryset())
+
+        # Every change a listed job can show moves its updated_at, and
+        # removals change the count, so these validate the whole page
+        validators = queryset.aggregate(last_modified=Max('updated_at'), count=Count('id'))
+        last_modified = validators['last_modified']
+        etag = make_etag(request.get_full_path(), validators['count'], last_modified)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        card_view = request.query_params.get('view') == 'card'
+        if card_view:
+            queryset = queryset.values(*JobCardService.FIELDS)
+        else:
+            queryset = JobPostingSerializer.setup_eager_loading(queryset)
+
+        query = request.query_params.get('q', '').strip()
+        if query:
+            ranked_ids = JobSearch.ranked_ids(queryset, query)
+            page_ids = self.paginator.paginate_ranked_ids(ranked_ids, request)
+            jobs = {
+                job['id'] if card_view else job.id: job
+                for job in queryset.filter(id__in=page_ids)
+            }
+            page = [jobs[job_id] for job_id in page_ids if job_id in jobs]
+        else:
+            page = self.paginate_queryset(queryset)
+
+        if card_view:
+            response = self.get_paginated_response(JobCardService.get_cards(page))
+        else:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        return set_validators(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Get job details, read through the job_{id} cache"""
+        try:
+            job_id = int(kwargs[self.lookup_field])
+        except ValueError:
+            raise NotFound()
+
+        cached, fresh = JobDetailService.lookup(job_id) or (None, False)
+        if cached is not None:
+            updated_at = cached['updated_at']
+        else:
+            updated_at = self.get_queryset().filter(pk=job_id).values_list('updated_at', flat=True).first()
+            if updated_at is None:
+                raise NotFound()
+
+        etag = make_etag('job', job_id, updated_at)
+        not_modified = not_modified_response(request, etag, updated_at)
+        if not_modified is not None:
+            return not_modified
+
+        if not fresh:
+            # Build or refresh the entry. It keeps the validator read with the
+            # data, not the earlier one, so a concurrent edit cannot pair new
+            # data with an old ETag
+            cached = JobDetailService.get(job_id)
+            if cached is None:
+                raise NotFound()
+            etag = make_etag('job', job_id, cached['updated_at'])
+
+        response = PrerenderedResponse(cached['body'], status=status.HTTP_200_OK)
+        return set_validators(response, etag, cached['updated_at'])
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Counts per facet for the active jobs matching the current filters"""
+        job_filter = JobFilter(request.query_params)
+        queryset = job_filter.apply(self.get_queryset())
+
+        query = request.query_params.get('q', '').strip()
+        terms = JobSearch.terms(query)
+        if terms:
+            # Every match counts, not just the ranked ones a search returns
+            queryset = JobSearch.filter(queryset, query)
+
+        data = JobFacetService.get_facets(queryset, job_filter.signature(*terms))
+        return Response(data, status=status.HTTP_200_OK)
 
     def create(self, request, *args, **kwargs):
         """Create a new job posting (employer only)"""
@@ -275,8 +381,6 @@ class JobView(ModelViewSet):
         serializer = self.get_serializer(job, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-
-        cache.delete(f'job_{job.id}')
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def destroy(self, request, *args, **kwargs):
@@ -295,17 +399,15 @@ class JobView(ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        job_id = job.id
         job.delete()
-
-        cache.delete(f'job_{job_id}')
         return Response(
             {'message': 'Job deleted successfully'},
             status=status.HTTP_204_NO_CONTENT
         )
 
 
-    @action(detail=True, methods=['post'], url_path='apply', parser_classes=[MultiPartParser, FormParser])
+    @action(detail=True, methods=['post'], url_path='apply', parser_classes=[MultiPartParser, FormParser],
+            throttle_classes=[ApplyRateThrottle])
     def apply(self, request, pk=None):
         """Apply for a job (candidate only)"""
         if not request.user.is_candidate:
@@ -359,18 +461,21 @@ class ApplicationView(ModelViewSet):
     def applications(self, request):
         """Get user's applications (candidate's or employer's)"""
         user = request.user
-        cache_key = f"user_applications:{user.id}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-        if user.is_candidate:
-            data = ApplicationService.get_candidate_applications(user)
-        elif user.is_employer:
-            data = ApplicationService.get_employer_applications(user)
-        else:
-            data = []
-        cache.set(cache_key, data, timeout=60 * 60)
-        return Response(data, status=status.HTTP_200_OK)
+
+        def build():
+            if user.is_candidate:
+                return ApplicationService.get_candidate_applications(user)
+            if user.is_employer:
+                return ApplicationService.get_employer_applications(user)
+            return []
+
+        body = ComputedCache.get_or_compute(
+            f'user_applications:{user.id}:body',
+            lambda: PrerenderedResponse.encode(build()),
+            timeout=60 * 60,
+            tags=lambda body: ApplicationService.get_application_tags(user),
+        )
+        return PrerenderedResponse(body, status=status.HTTP_200_OK)
 
 
     @action(detail=True, methods=['get'])
@@ -407,17 +512,13 @@ class ApplicationView(ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Cache key
-        cache_key = f"application:{application.id}:user:{user.id}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-
-        # Serialize and cache
-        data = self.get_serializer(application).data
-        cache.set(cache_key, data, timeout=60 * 60)
-
-        return Response(data, status=status.HTTP_200_OK)
+        body = ComputedCache.get_or_compute(
+            f'application:{application.id}:user:{user.id}:body',
+            lambda: PrerenderedResponse.encode(self.get_serializer(application).data),
+            timeout=60 * 60,
+            tags=[f'application:{application.id}'],
+        )
+        return PrerenderedResponse(body, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['post'])
     def withdraw_application(self, request, pk=None):
@@ -532,13 +633,13 @@ class NotificationView(ModelViewSet):
     def notifications(self, request):
         """Get user's notifications"""
         user = request.user
-        cache_key = f"user_notifications:{user.id}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-        data = NotificationService.get_notifications(user, limit=None)
-        cache.set(cache_key, data, timeout=60 * 60)
-        return Response(data, status=status.HTTP_200_OK)
+        body = ComputedCache.get_or_compute(
+            f'user_notifications:{user.id}:body',
+            lambda: PrerenderedResponse.encode(NotificationService.get_notifications(user, limit=None)),
+            timeout=60 * 60,
+            tags=[f'notifications:{user.id}'],
+        )
+        return PrerenderedResponse(body, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'], url_path='mark-read')
     def mark_read(self, request, pk=None):
@@ -569,4 +670,20 @@ class ReviewView(ModelViewSet):
 
     def perform_create(self, serializer):
         """Set the reviewer to current user when creating a review"""
-        serializer.save(reviewer=self.request.user)
\ No newline at end of file
+        serializer.save(reviewer=self.request.user)
+
+
+class CacheMetricsView(GenericViewSet):
+    """Cache usage per key pattern across all workers, for tuning timeouts"""
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        cache = caches['default']
+        if not isinstance(cache, InstrumentedCache):
+            return Response(
+                {'error': 'Cache metrics are not enabled'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({
+            'patterns': InstrumentedCache.summarize(cache.metrics()),
+        }, status=status.HTTP_200_OK)
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from django.conf.global_settings import EMAIL_BACKEND
 from pathlib import Path
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -31,6 +32,9 @@ DEBUG = False
 
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost').split(',')
 
+# Where the web app lives, for links in emails
+FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
+
 
 # Application definition
 
@@ -82,13 +86,49 @@ WSGI_APPLICATION = 'jobboard.wsgi.application'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication without the user query, see core.authentication
+        'core.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    # Same output as DRF's JSON renderer and parser, through orjson when installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Token buckets for the expensive endpoints, see core.throttling
+    'DEFAULT_THROTTLE_RATES': {
+        'login': os.getenv('THROTTLE_RATE_LOGIN', '10/min'),
+        'register': os.getenv('THROTTLE_RATE_REGISTER', '5/hour'),
+        'apply': os.getenv('THROTTLE_RATE_APPLY', '30/hour'),
+    },
 }
 
+# Job list pagination
+JOB_LIST_PAGE_SIZE = int(os.getenv('JOB_LIST_PAGE_SIZE', 20))
+JOB_LIST_MAX_PAGE_SIZE = int(os.getenv('JOB_LIST_MAX_PAGE_SIZE', 100))
+
+# Job search ranking: relevance blended with an exponential recency decay
+JOB_SEARCH_MAX_RESULTS = int(os.getenv('JOB_SEARCH_MAX_RESULTS', 500))
+JOB_SEARCH_RECENCY_WEIGHT = float(os.getenv('JOB_SEARCH_RECENCY_WEIGHT', 0.3))
+JOB_SEARCH_RECENCY_HALF_LIFE_DAYS = float(os.getenv('JOB_SEARCH_RECENCY_HALF_LIFE_DAYS', 14))
+
+# Job detail read-through cache
+JOB_DETAIL_CACHE_TIMEOUT = int(os.getenv('JOB_DETAIL_CACHE_TIMEOUT', 60 * 15))
+
+# Salaries are normalized to this currency for range filters and job alerts
+SALARY_BASE_CURRENCY = os.getenv('SALARY_BASE_CURRENCY', 'USD').upper()
+
+# Radius search on the job list (?near=lat,lon&radius_km=)
+JOB_GEO_DEFAULT_RADIUS_KM = float(os.getenv('JOB_GEO_DEFAULT_RADIUS_KM', 25))
+JOB_GEO_MAX_RADIUS_KM = float(os.getenv('JOB_GEO_MAX_RADIUS_KM', 500))
+
 
 # JWT Settings
 from datetime import timedelta
@@ -113,6 +153,10 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# How long CachedJWTAuthentication keeps a user's identity (id, role, flags,
+# profile ids); saving the user drops it sooner
+AUTH_IDENTITY_CACHE_TIMEOUT = int(os.getenv('AUTH_IDENTITY_CACHE_TIMEOUT', 60))
+
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
@@ -192,11 +236,45 @@ AWS_S3_OBJECT_PARAMETERS = {
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-# Redis Cache Settings
+# Cache Settings
+# "default" records hit ratio, value sizes and latency per key pattern (see the
+# cache_stats command) for "two_tier", which keeps a small per-process LRU copy
+# of hot keys in front of the "shared" cache that all workers use, and
+# broadcasts invalidations through it so a delete in one gunicorn worker
+# clears every worker's copy.
+REDIS_URL = os.getenv('REDIS_URL')
+
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-    }
+        "BACKEND": "core.cache_backends.InstrumentedCache",
+        "LOCATION": "two_tier",
+        "OPTIONS": {
+            "METRICS_LOCATION": "shared",
+            "FLUSH_INTERVAL": float(os.getenv('CACHE_METRICS_FLUSH_INTERVAL', 10)),
+        },
+    },
+    "two_tier": {
+        "BACKEND": "core.cache_backends.TwoTierCache",
+        "LOCATION": "shared",
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv('CACHE_LOCAL_MAX_ENTRIES', 1000)),
+            "LOCAL_TIMEOUT": int(os.getenv('CACHE_LOCAL_TIMEOUT', 60)),
+            "SYNC_INTERVAL": float(os.getenv('CACHE_SYNC_INTERVAL', 1)),
+        },
+    },
+    # Redis in production; without REDIS_URL a file-based cache stands in so
+    # local runs and tests still share one L2 between processes (its incr is
+    # not atomic, which only matters under concurrent writers)
+    "shared": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    } if REDIS_URL else {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'jobboard-cache')),
+        # The default of 300 would cull sequence numbers, tag stamps and
+        # revoked tokens along with cached values
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv('CACHE_MAX_ENTRIES', 100000))},
+    },
 }
 
 # Email Configuration
@@ -207,3 +285,10 @@ EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', 'apikey')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', os.getenv('API'))
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'support@jobboard.com')
+
+# SendGrid's v3 API, used by core.mailer for transactional email. The URL can
+# point at `manage.py sendgrid_standin` for benchmarks
+SENDGRID_API_KEY = os.getenv('SENDGRID_API_KEY')
+SENDGRID_API_URL = os.getenv('SENDGRID_API_URL', 'https://api.sendgrid.com/v3/mail/send')
+# Recipients per minute across all workers; 0 disables the limit
+EMAIL_RATE_LIMIT = int(os.getenv('EMAIL_RATE_LIMIT', 6000))